@@ -149,18 +149,27 @@ if subdir not in sys.path: sys.path.append(subdir)
     
 ### Import submodules
 from build_data import *       # Contains build data access functions
+from build_store import *      # Contains binary build data store
 from builder import *          # Contains constraints builder function
 from builder_fm import *       # Contains constraints builder function for Fracture Modifier (custom Blender version required)
 from builder_prep import *     # Contains preparation steps functions called by the builder
 from builder_setc import *     # Contains constraints settings functions called by the builder
+from const_table import *      # Contains columnar in-memory constraint table
+from contact_area import *     # Contains NumPy contact area engine for parallel processing
 from file_io import *          # Contains file input & output functions
 from formula import *          # Contains formula assistant functions
 from formula_props import *    # Contains formula assistant properties classes
+from geo_cache import *        # Contains per-object geometry cache used by the builder
 from global_props import *     # Contains global properties
 from global_vars import *      # Contains global variables
 from gui import *              # Contains graphical user interface layout class
 from gui_buttons import *      # Contains graphical user interface button classes
+from mohr_coulomb import *     # Contains array based Mohr-Coulomb breaking threshold update
 from monitor import *          # Contains baking monitor event handler
+from monitor_log import *      # Contains per-frame monitor log
+from monitor_state import *    # Contains array based monitor state
+from obj_resolver import *     # Contains cached name to object resolution
+from profiler import *         # Contains build phase profiler
 from tools import *            # Contains smaller independently working tools
 
 ########################################
@@ -258,6 +267,7 @@ def register():
     bpy.types.WindowManager.bcb = bpy.props.PointerProperty(type=bcb_props)
     bpy.types.WindowManager.bcb_asst_con_rei_beam = bpy.props.PointerProperty(type=bcb_asst_con_rei_beam_props)
     bpy.types.WindowManager.bcb_asst_con_rei_wall = bpy.props.PointerProperty(type=bcb_asst_con_rei_wall_props)
+    objResolverRegister()
     
            
 def unregister():
@@ -267,6 +277,7 @@ def unregister():
     del bpy.types.WindowManager.bcb
     del bpy.types.WindowManager.bcb_asst_con_rei_beam
     del bpy.types.WindowManager.bcb_asst_con_rei_wall
+    objResolverUnregister()
 
  
 if __name__ == "__main__":
@@ -30,12 +30,15 @@
 
 ################################################################################
 
-import bpy, time
+import bpy, time, hashlib
+import numpy as np
 import global_vars
 
 ### Import submodules
 from global_vars import *      # Contains global variables
 from file_io import *          # Contains file input & output functions
+from build_store import *      # Contains binary build data store
+from obj_resolver import *     # Contains cached name to object resolution
 
 ################################################################################
 
@@ -489,6 +492,10 @@ def storeBuildDataInScene(scene, objs, objsEGrp, emptyObjs, childObjs, objsID, c
         scene["bcb_objs"] = [obj.name for obj in objs]
     if objsEGrp != None:
         scene["bcb_objsEGrp"] = objsEGrp
+    if objs != None or objsEGrp != None:
+        # Element group object lists cached for the monitor are outdated now
+        try: del bpy.app.driver_namespace["bcb_grpsObjs"]
+        except: pass
     if emptyObjs != None:
         data = []
         for obj in emptyObjs:
@@ -501,35 +508,130 @@ def storeBuildDataInScene(scene, objs, objsEGrp, emptyObjs, childObjs, objsID, c
         scene["bcb_childObjs"] = [obj.name for obj in childObjs]
     if objsID != None:
         scene["bcb_objsID"] = [ID for ID in objsID]
-    if connectsPair != None:
-        scene["bcb_connectsPair"] = connectsPair
-    if connectsPairParent != None:
-        scene["bcb_connectsPairParent"] = connectsPairParent
-    if connectsLoc != None:
-        scene["bcb_connectsLoc"] = connectsLoc
-    if connectsGeo != None:
-        scene["bcb_connectsGeo"] = connectsGeo
-    if connectsConsts != None:
-        scene["bcb_connectsConsts"] = connectsConsts
-    if connectsTol != None:
-        scene["bcb_connectsTol"] = connectsTol
-    if constsConnect != None:
-        scene["bcb_constsConnect"] = constsConnect    
+
+    ### Connection data is stored as typed arrays in one binary blob instead of ID property lists (optimization)
+    fieldsNew = {}
+    if connectsPair != None:       fieldsNew["connectsPair"] = connectsPair
+    if connectsPairParent != None: fieldsNew["connectsPairParent"] = connectsPairParent
+    if connectsLoc != None:        fieldsNew["connectsLoc"] = connectsLoc
+    if connectsGeo != None:        fieldsNew["connectsGeo"] = connectsGeo
+    if connectsConsts != None:     fieldsNew["connectsConsts"] = connectsConsts
+    if connectsTol != None:        fieldsNew["connectsTol"] = connectsTol
+    if constsConnect != None:      fieldsNew["constsConnect"] = constsConnect
+    if len(fieldsNew):
+        fields = getBinaryBuildDataFromScene(scene)
+        fields.update(fieldsNew)
+        scene["bcb_buildData"] = buildStoreEncode(fields)
+        ### Remove ID property lists from older versions
+        for name in buildStoreFields.keys():
+            try: del scene["bcb_" +name]
+            except: pass
+
+########################################
+
+def getBinaryBuildDataFromScene(scene):
+
+    ### Get connection data fields from binary build data in scene (dictionary of lazily materialized lists, see build_store.py)
+    # Build data from older versions stored as ID property lists is still supported
+    fields = None
+    if "bcb_buildData" in scene.keys():
+        fields = buildStoreDecode(scene["bcb_buildData"])
+    if fields == None:
+        fields = {}
+        for name in buildStoreFields.keys():
+            try: fields[name] = scene["bcb_" +name]
+            except: pass
+    return fields
                     
 ################################################################################   
 
+def createElementGroupObjectLists(objs, objsEGrp):
+
+    ### Create group index with their respective objects (dictionary of element group names with lists of member objects)
+    ### Objects are sorted into the lists of their element group in a single pass (optimization)
+    elemGrps = global_vars.elemGrps
+    grpsObjs = {}
+    for elemGrp in elemGrps:
+        grpsObjs[elemGrp[EGSidxName]] = []
+    grpsObjsByIdx = [grpsObjs[elemGrp[EGSidxName]] for elemGrp in elemGrps]
+    elemGrpCnt = len(elemGrps)
+    for obj, elemGrpIdx in zip(objs, objsEGrp):
+        if elemGrpIdx != -1 and elemGrpIdx < elemGrpCnt:
+            grpsObjsByIdx[elemGrpIdx].append(obj)
+    return grpsObjs
+
+########################################
+
+def getElementGroupObjectListsFromScene(scene):
+
+    ### Get group index with their respective object names from build data in scene
+    ### The index is cached so the monitor can reuse it for every frame until build data changes or the simulation ends
+    try: return bpy.app.driver_namespace["bcb_grpsObjs"]
+    except: pass
+    try: objs = scene["bcb_objs"]
+    except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
+    try: objsEGrp = scene["bcb_objsEGrp"]
+    except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
+    grpsObjs = bpy.app.driver_namespace["bcb_grpsObjs"] = createElementGroupObjectLists(objs, objsEGrp)
+    return grpsObjs
+
+################################################################################   
+
+def createElementFingerprint(obj):
+
+    ### Create geometry fingerprint of an element (vertex count, local boundary box, vertex coordinate sum and basis matrix)
+    # Any change of mesh data or object transform properties leads to a different fingerprint string
+    # The world matrix is not used because the simulation moves elements without changing the build
+    me = obj.data
+    vertCnt = len(me.vertices)
+    data = [vertCnt]
+    if vertCnt > 0:
+        cos = np.empty(vertCnt *3, dtype=np.float32)
+        me.vertices.foreach_get("co", cos)
+        cos = cos.reshape((vertCnt, 3)).astype(np.float64)
+        data.extend(cos.min(axis=0).tolist())
+        data.extend(cos.max(axis=0).tolist())
+        data.extend(cos.sum(axis=0).tolist())
+    for row in obj.matrix_basis:
+        data.extend(row)
+    return hashlib.md5(("%d" %vertCnt +",".join(["%0.5f" %v for v in data[1:]])).encode()).hexdigest()
+
+########################################
+
+def storeElementFingerprintsInScene(scene, objs):
+
+    ### Store geometry fingerprints of all elements in scene (used to detect modified elements for incremental rebuilding)
+    scene["bcb_objsFingerprint"] = [createElementFingerprint(obj) if obj != None else "" for obj in objs]
+
+########################################
+
+def getChangedElementsFromScene(scene, objs):
+
+    ### Compare geometry fingerprints of all elements with the ones stored in scene and return indices of modified elements
+    # Returns None if no fingerprints are available or objects are missing (incremental rebuilding not possible)
+    try: fingerprints = scene["bcb_objsFingerprint"]
+    except:
+        print("Warning: Incremental rebuilding not possible because no element fingerprints are stored, clear and build again to enable it.")
+        return None
+    if len(fingerprints) != len(objs):
+        print("Warning: Incremental rebuilding not possible because elements have been added or removed, clear and build again to apply the changes.")
+        return None
+    changed = []
+    for k in range(len(objs)):
+        obj = objs[k]
+        if obj == None:
+            print("Warning: Incremental rebuilding not possible because elements are missing, clear and build again to apply the changes.")
+            return None
+        if createElementFingerprint(obj) != fingerprints[k]: changed.append(k)
+    return changed
+
+################################################################################   
+
 def getBuildDataFromScene(scene):
     
     ### Get build data from scene
     print("Getting build data from scene...")
 
-    ### Prepare scene object dictionaries by type to be used for faster item search (optimization)
-    scnObjs = {}
-    scnEmptyObjs = {}
-    for obj in scene.objects:
-        if obj.type == 'MESH':    scnObjs[obj.name] = obj
-        elif obj.type == 'EMPTY': scnEmptyObjs[obj.name] = obj
-
     ###### Get data from scene
 
     #try: objsEGrp = scene["bcb_objsEGrp"]    # Not required for building only for clearAllDataFromScene(), index will be renewed on update
@@ -537,54 +639,44 @@ def getBuildDataFromScene(scene):
 
     try: names = scene["bcb_objs"]
     except: names = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-    objs = []
-    for name in names:
-        if len(name):
-            try: objs.append(scnObjs[name])
-            except: objs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
-        else: objs.append(None)
+    objs, namesMissing = resolveObjectNames(scene, names, 'MESH')
+    for name in namesMissing: print("Error: Object %s missing, rebuilding constraints is required." %name)
         
     try: names = scene["bcb_emptyObjs"]
     except: names = []; print("Error: bcb_emptyObjs property not found, rebuilding constraints is required.")
-    emptyObjs = []
-    for name in names:
-        if len(name):
-            try: emptyObjs.append(scnEmptyObjs[name])
-            except: emptyObjs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
-        else: emptyObjs.append(None)
+    emptyObjs, namesMissing = resolveObjectNames(scene, names, 'EMPTY')
+    for name in namesMissing: print("Error: Object %s missing, rebuilding constraints is required." %name)
         
     try: names = scene["bcb_childObjs"]
     except: names = []; print("Error: bcb_childObjs property not found, rebuilding constraints is required.")
-    childObjs = []
-    for name in names:
-        if len(name):
-            try: childObjs.append(scnObjs[name])
-            except: childObjs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
-        else: childObjs.append(None)
+    childObjs, namesMissing = resolveObjectNames(scene, names, 'MESH')
+    for name in namesMissing: print("Error: Object %s missing, rebuilding constraints is required." %name)
         
     try: objsID = scene["bcb_objsID"]
     except: objsID = []; print("Error: bcb_objsID property not found, rebuilding constraints is required.")
 
-    try: connectsPair = scene["bcb_connectsPair"]
+    fields = getBinaryBuildDataFromScene(scene)
+
+    try: connectsPair = fields["connectsPair"]
     except: connectsPair = []; print("Error: bcb_connectsPair property not found, rebuilding constraints is required.")
 
-    try: connectsPairParent = scene["bcb_connectsPairParent"]
+    try: connectsPairParent = fields["connectsPairParent"]
     except: connectsPairParent = []; print("Error: bcb_connectsPairParent property not found, rebuilding constraints is required.")
 
-    try: connectsLoc = scene["bcb_connectsLoc"]
+    try: connectsLoc = fields["connectsLoc"]
     except: connectsLoc = []; print("Error: bcb_connectsLoc property not found, rebuilding constraints is required.")
 
-    try: connectsGeo = scene["bcb_connectsGeo"]
+    try: connectsGeo = fields["connectsGeo"]
     except: connectsGeo = []; print("Error: bcb_connectsGeo property not found, rebuilding constraints is required.")
 
-    try: connectsConsts = scene["bcb_connectsConsts"]
+    try: connectsConsts = fields["connectsConsts"]
     except: connectsConsts = []; print("Error: bcb_connectsConsts property not found, rebuilding constraints is required.")
 
-    try: connectsTol = scene["bcb_connectsTol"]
+    try: connectsTol = fields["connectsTol"]
     except: connectsTol = []; #print("Error: bcb_connectsTol property not found, rebuilding constraints is required.")
     # Silenced this error since we needed to postpone storage of connectsTol and this function is called once before the data becomes available 
 
-    try: constsConnect = scene["bcb_constsConnect"]
+    try: constsConnect = fields["constsConnect"]
     except: constsConnect = []; print("Error: bcb_constsConnect property not found, rebuilding constraints is required.")
     
     ### Debug: Log all data to ASCII file
@@ -624,13 +716,6 @@ def clearAllDataFromScene(scene, qKeepBuildData=0):
 
     props = bpy.context.window_manager.bcb
     
-    ### Prepare scene object dictionaries by type to be used for faster item search (optimization)
-    scnObjs = {}
-    scnEmptyObjs = {}
-    for obj in scene.objects:
-        if obj.type == 'MESH':    scnObjs[obj.name] = obj
-        elif obj.type == 'EMPTY': scnEmptyObjs[obj.name] = obj
-
     ###### Get data from scene
     print("Getting data from scene...")
 
@@ -639,32 +724,21 @@ def clearAllDataFromScene(scene, qKeepBuildData=0):
 
     try: names = scene["bcb_objs"]
     except: names = []; print("Warning: bcb_objs property not found, cleanup may be incomplete.")
-    objs = []
-    for name in names:
-        if len(name):
-            try: objs.append(scnObjs[name])
-            except: objs.append(None); print("Warning: Object %s missing, cleanup may be incomplete." %name)
-        else: objs.append(None)
+    objs, namesMissing = resolveObjectNames(scene, names, 'MESH')
+    for name in namesMissing: print("Warning: Object %s missing, cleanup may be incomplete." %name)
         
     try: names = scene["bcb_emptyObjs"]
     except: names = []; print("Warning: bcb_emptyObjs property not found, cleanup may be incomplete.")
-    emptyObjs = []
-    for name in names:
-        if len(name):
-            try: emptyObjs.append(scnEmptyObjs[name])
-            except: emptyObjs.append(None); print("Warning: Object %s missing, cleanup may be incomplete." %name)
-        else: emptyObjs.append(None)
+    emptyObjs, namesMissing = resolveObjectNames(scene, names, 'EMPTY')
+    for name in namesMissing: print("Warning: Object %s missing, cleanup may be incomplete." %name)
         
     try: names = scene["bcb_childObjs"]
     except: names = []; print("Warning: bcb_childObjs property not found, cleanup may be incomplete.")
-    childObjs = []
-    for name in names:
-        if len(name):
-            try: childObjs.append(scnObjs[name])
-            except: childObjs.append(None); print("Warning: Object %s missing, cleanup may be incomplete." %name)
-        else: childObjs.append(None)
+    childObjs, namesMissing = resolveObjectNames(scene, names, 'MESH')
+    for name in namesMissing: print("Warning: Object %s missing, cleanup may be incomplete." %name)
         
-    try: connectsPairParent = scene["bcb_connectsPairParent"]
+    fields = getBinaryBuildDataFromScene(scene)
+    try: connectsPairParent = fields["connectsPairParent"]
     except: connectsPairParent = []; print("Warning: bcb_connectsPairParent property not found, cleanup may be incomplete.")
 
     ### Backup layer settings and activate all layers
@@ -720,33 +794,19 @@ def clearAllDataFromScene(scene, qKeepBuildData=0):
             parentObj.select = 0
             childObj.select = 0
             
-    ### Prepare scene object dictionaries again after we changed obj names (optimization)
-    scnObjs = {}
-    scnEmptyObjs = {}
-    for obj in scene.objects:
-        if obj.type == 'MESH':    scnObjs[obj.name] = obj
-        elif obj.type == 'EMPTY': scnEmptyObjs[obj.name] = obj
+    # Cached name to object maps are outdated after we changed obj names
+    objResolverInvalidate()
 
     ###### Get data again from scene after we changed obj names
     print("Getting updated data from scene...")
         
     try: names = scene["bcb_objs"]
     except: names = []; print("Warning: bcb_objs property not found, cleanup may be incomplete.")
-    objs = []
-    for name in names:
-        if len(name):
-            try: objs.append(scnObjs[name])
-            except: objs.append(None) #; print("Warning: Object %s missing, cleanup may be incomplete." %name)
-        else: objs.append(None)
+    objs = resolveObjectNames(scene, names, 'MESH')[0]
 
     try: names = scene["bcb_emptyObjs"]
     except: names = []; print("Warning: bcb_emptyObjs property not found, cleanup may be incomplete.")
-    emptyObjs = []
-    for name in names:
-        if len(name):
-            try: emptyObjs.append(scnEmptyObjs[name])
-            except: emptyObjs.append(None) #; print("Warning: Object %s missing, cleanup may be incomplete." %name)
-        else: emptyObjs.append(None)
+    emptyObjs = resolveObjectNames(scene, names, 'EMPTY')[0]
         
     ### Revert element scaling
     for k in range(len(objs)):
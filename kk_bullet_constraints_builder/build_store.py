@@ -0,0 +1,212 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import struct
+import numpy as np
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+### Binary build data store layout (little endian):
+# Header: magic "BCBD", format version (uint32), entry count (uint32)
+# Entry:  name length (uint16), name, kind ('A' = array, 'R' = ragged list, 'M' = mixed type table),
+#         dtype ('i' = int32, 'd' = float64, 'm' = mixed), row count (uint32),
+#         column count for arrays and tables (0 = 1D) or value count for ragged lists (uint32), payload
+# Ragged lists are stored as row offsets (int64, row count +1) followed by the flat values
+# Mixed type tables are stored as one dtype character per column followed by the columns one after another
+buildStoreMagic = b"BCBD"
+buildStoreVersion = 1
+
+### Build data fields stored in binary form: name, kind, dtype (one per column for tables), column count (arrays and tables only)
+buildStoreFields = {
+    "connectsPair":       ['A', 'i', 2],
+    "connectsPairParent": ['A', 'i', 2],
+    "connectsLoc":        ['A', 'd', 3],
+    "connectsGeo":        ['M', 'dddiiii', 7],  # Contact area, height, width, axes (3x), qVolCorrect
+    "connectsConsts":     ['R', 'i', 0],
+    "connectsTol":        ['A', 'd', 4],
+    "constsConnect":      ['A', 'i', 0]
+    }
+
+buildStoreDtypes = {'i': np.int32, 'd': np.float64}
+
+################################################################################
+
+class buildDataList():
+
+    ### Binary field which behaves like the list it was created from
+    # The Python list is only materialized on first item access, len() and getArray() work on the raw data
+    # Writes through the field are tracked so unmodified fields can be stored again without conversion,
+    # therefore rows must be reassigned (e.g. field[i] = row) and never be modified in place (e.g. field[i][0] = value)
+
+    def __init__(self, name, kind, values, offsets=None):
+        self.name = name
+        self.kind = kind
+        self.values = values    # Array, or list of column arrays for mixed type tables
+        self.offsets = offsets
+        self.items = None
+        self.qModified = 0
+
+    def __len__(self):
+        if self.items != None: return len(self.items)
+        if self.kind == 'R': return len(self.offsets) -1
+        if self.kind == 'M': return len(self.values[0])
+        return len(self.values)
+
+    def getList(self):
+        if self.items == None:
+            if self.kind == 'R':
+                flat = self.values.tolist(); offsets = self.offsets.tolist()
+                self.items = [flat[offsets[i]:offsets[i+1]] for i in range(len(offsets) -1)]
+            elif self.kind == 'M':
+                self.items = [list(row) for row in zip(*[col.tolist() for col in self.values])]
+            else: self.items = self.values.tolist()
+        return self.items
+
+    def getArray(self):
+        ### Return raw NumPy data (values, offsets for ragged lists), valid only as long as the list wasn't modified
+        return self.values, self.offsets
+
+    def isModified(self):
+        return self.qModified
+
+    def __getitem__(self, idx):
+        return self.getList()[idx]
+
+    def __setitem__(self, idx, value):
+        self.getList()[idx] = value
+        self.qModified = 1
+
+    def __iter__(self):
+        return iter(self.getList())
+
+    def append(self, value):
+        self.getList().append(value)
+        self.qModified = 1
+
+################################################################################
+
+def buildStoreEncodeField(name, data):
+
+    ### Convert build data list (or buildDataList) into binary entry
+    kind, dtype, colCnt = buildStoreFields[name]
+    if kind != 'M': npDtype = buildStoreDtypes[dtype]
+    # Unmodified binary fields can be reused without conversion
+    if isinstance(data, buildDataList) and not data.isModified():
+        values, offsets = data.getArray()
+    elif kind == 'M':
+        offsets = None
+        rows = [tuple(item) for item in data]
+        if len(rows): cols = list(zip(*rows))
+        else:         cols = [[] for i in range(colCnt)]
+        values = [np.array(cols[i], dtype=buildStoreDtypes[dtype[i]]) for i in range(colCnt)]
+    elif kind == 'R':
+        lens = np.array([len(item) for item in data], dtype=np.int64)
+        offsets = np.zeros(len(lens) +1, dtype=np.int64)
+        np.cumsum(lens, out=offsets[1:])
+        values = np.array([v for item in data for v in item], dtype=npDtype)
+    else:
+        offsets = None
+        if len(data) == 0:
+            if colCnt: values = np.zeros((0, colCnt), dtype=npDtype)
+            else:      values = np.zeros(0, dtype=npDtype)
+        else: values = np.array([tuple(item) for item in data] if colCnt else list(data), dtype=npDtype)
+    if kind != 'M': values = np.ascontiguousarray(values, dtype=npDtype)
+
+    nameBytes = name.encode()
+    if kind == 'M':
+        rowCnt = len(values[0]); extCnt = colCnt
+        payload = dtype.encode() +b"".join([values[i].astype(np.dtype(buildStoreDtypes[dtype[i]]).newbyteorder('<')).tobytes() for i in range(colCnt)])
+        dtype = 'm'
+    elif kind == 'R':
+        rowCnt = len(offsets) -1; extCnt = len(values)
+        payload = offsets.astype('<i8').tobytes() +values.astype(np.dtype(npDtype).newbyteorder('<')).tobytes()
+    else:
+        rowCnt = values.shape[0]
+        if values.ndim > 1: extCnt = values.shape[1]
+        else:               extCnt = 0
+        payload = values.astype(np.dtype(npDtype).newbyteorder('<')).tobytes()
+    return struct.pack('<H', len(nameBytes)) +nameBytes +kind.encode() +dtype.encode() +struct.pack('<II', rowCnt, extCnt) +payload
+
+########################################
+
+def buildStoreDecode(blob):
+
+    ### Parse binary build data blob into dictionary of buildDataList objects (no data is copied)
+    # Returns None if blob is invalid or of an incompatible version
+    blob = bytes(blob)
+    if len(blob) < 12 or blob[:4] != buildStoreMagic: return None
+    version, entryCnt = struct.unpack_from('<II', blob, 4)
+    if version != buildStoreVersion:
+        print("Error: Build data format version %d is not supported, rebuilding constraints is required." %version)
+        return None
+    fields = {}
+    pos = 12
+    for i in range(entryCnt):
+        nameLen, = struct.unpack_from('<H', blob, pos); pos += 2
+        name = blob[pos:pos +nameLen].decode(); pos += nameLen
+        kind = chr(blob[pos]); dtype = chr(blob[pos +1]); pos += 2
+        rowCnt, extCnt = struct.unpack_from('<II', blob, pos); pos += 8
+        if kind == 'M':
+            offsets = None
+            colDtypes = blob[pos:pos +extCnt].decode(); pos += extCnt
+            values = []
+            for colDtype in colDtypes:
+                col = np.frombuffer(blob, dtype=np.dtype(buildStoreDtypes[colDtype]).newbyteorder('<'), count=rowCnt, offset=pos); pos += col.nbytes
+                values.append(col)
+            fields[name] = buildDataList(name, kind, values, offsets)
+            continue
+        npDtype = np.dtype(buildStoreDtypes[dtype]).newbyteorder('<')
+        if kind == 'R':
+            offsets = np.frombuffer(blob, dtype='<i8', count=rowCnt +1, offset=pos); pos += offsets.nbytes
+            values = np.frombuffer(blob, dtype=npDtype, count=extCnt, offset=pos); pos += values.nbytes
+        else:
+            offsets = None
+            if extCnt: values = np.frombuffer(blob, dtype=npDtype, count=rowCnt *extCnt, offset=pos).reshape((rowCnt, extCnt))
+            else:      values = np.frombuffer(blob, dtype=npDtype, count=rowCnt, offset=pos)
+            pos += values.nbytes
+        fields[name] = buildDataList(name, kind, values, offsets)
+    return fields
+
+########################################
+
+def buildStoreEncode(fields):
+
+    ### Pack dictionary of build data lists into one binary blob with version header
+    names = [name for name in sorted(fields.keys()) if name in buildStoreFields]
+    parts = [buildStoreMagic, struct.pack('<II', buildStoreVersion, len(names))]
+    for name in names:
+        parts.append(buildStoreEncodeField(name, fields[name]))
+    return b"".join(parts)
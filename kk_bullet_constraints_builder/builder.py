@@ -37,10 +37,12 @@ from global_vars import *      # Contains global variables
 from build_data import *       # Contains build data access functions
 from builder_prep import *     # Contains preparation steps functions called by the builder
 from builder_setc import *     # Contains constraints settings functions called by the builder
+from geo_cache import *        # Contains per-object geometry cache used by the builder
+from profiler import *         # Contains build phase profiler
 
 ################################################################################
 
-def build():
+def build(qIncremental=1):
     
     print("\nStarting...\n")
     time_start = time.time()
@@ -54,163 +56,212 @@ def build():
     if grpRBWorld != None:
     
         bpy.context.tool_settings.mesh_select_mode = True, False, False
-        props = bpy.context.window_manager.bcb
         scene = bpy.context.scene
         
         # Leave edit mode
         try: bpy.ops.object.mode_set(mode='OBJECT') 
         except: pass
+        # Start with empty geometry cache
+        geoCacheInit()
+        # Start per-stage profiling (if enabled for developers)
+        profilerStart("build")
+        try: return buildElementsAndConstraints(scene, time_start, qIncremental)
+        finally:
+            # Free cached geometry data (also if an error occurred)
+            geoCacheClear()
+            # Write profiling report and restore patched operator calls (also if an error occurred)
+            profilerStop()
+
+    ###### No RigidBodyWorld group found   
+    else:
+        print('No "RigidBodyWorld" group found in scene. Please create rigid bodies first.')       
+        print('Nothing done.')       
+        return 1
+
+################################################################################
+
+def buildElementsAndConstraints(scene, time_start, qIncremental):
+
+    props = bpy.context.window_manager.bcb
+
+    #########################
+    ###### Create new empties
+    if not "bcb_valid" in scene.keys():
+            
+        ###### Create object lists of selected objects
+        childObjs = []
+        objs, emptyObjs, objsID = gatherObjects(scene)
+        objsEGrp, objCntInEGrps = createElementGroupIndex(objs)
+        profilerLap("gatherObjects", len(objs))
         
-        #########################
-        ###### Create new empties
-        if not "bcb_valid" in scene.keys():
+        #############################
+        ###### Prepare connection map
+        if len(objs) > 1:
+            if objCntInEGrps > 1:
+                time_start_connections = time.time()
                 
-            ###### Create object lists of selected objects
-            childObjs = []
-            objs, emptyObjs, objsID = gatherObjects(scene)
-            objsEGrp, objCntInEGrps = createElementGroupIndex(objs)
+                ###### Prepare objects (make unique, apply transforms etc.)
+                prepareObjects(objs)
+                profilerLap("prepareObjects", len(objs))
+                ###### Prepare materials for element groups
+                prepareMaterials(objs, objsEGrp)
+                profilerLap("prepareMaterials", len(objs))
+                ###### Find connections by vertex pairs
+                #connectsPair, connectsPairDist, connectsLoc = findConnectionsByVertexPairs(objs, objsEGrp)
+                ###### Find connections by boundary box intersection and skip connections whose elements are too small and store them for later parenting
+                connectsPair, connectsPairDist = findConnectionsByBoundaryBoxIntersection(objs)
+                profilerLap("findConnectionsByBoundaryBoxIntersection", len(connectsPair))
+                ###### Delete connections whose elements are too small and make them parents instead
+                if props.minimumElementSize: connectsPair, connectsPairParent = deleteConnectionsWithTooSmallElementsAndParentThemInstead(objs, connectsPair, connectsPairDist)
+                else: connectsPairParent = []
+                profilerLap("deleteConnectionsWithTooSmallElementsAndParentThemInstead", len(connectsPair))
+                ###### Calculate contact area for all connections
+                connectsGeo, connectsLoc = calculateContactAreaBasedOnBoundaryBoxesForAll(objs, objsEGrp, connectsPair, qAccurate=props.useAccurateArea)
+                profilerLap("calculateContactAreaBasedOnBoundaryBoxesForAll", len(connectsPair))
+                ###### Delete connections with zero contact area
+                connectsPair, connectsGeo, connectsLoc = deleteConnectionsWithZeroContactArea(objs, objsEGrp, connectsPair, connectsGeo, connectsLoc)
+                profilerLap("deleteConnectionsWithZeroContactArea", len(connectsPair))
+                ###### Delete connections with references from predefined constraints
+                connectsPair, connectsGeo, connectsLoc = deleteConnectionsWithReferences(objs, emptyObjs, connectsPair, connectsGeo, connectsLoc)
+                profilerLap("deleteConnectionsWithReferences", len(connectsPair))
+                ###### Create connection data
+                connectsConsts, constsConnect = createConnectionData(objs, objsEGrp, connectsPair, connectsLoc, connectsGeo)
+                profilerLap("createConnectionData", len(constsConnect))
             
-            #############################
-            ###### Prepare connection map
-            if len(objs) > 1:
-                if objCntInEGrps > 1:
-                    time_start_connections = time.time()
-                    
-                    ###### Prepare objects (make unique, apply transforms etc.)
-                    prepareObjects(objs)
-                    ###### Prepare materials for element groups
-                    prepareMaterials(objs, objsEGrp)
-                    ###### Find connections by vertex pairs
-                    #connectsPair, connectsPairDist, connectsLoc = findConnectionsByVertexPairs(objs, objsEGrp)
-                    ###### Find connections by boundary box intersection and skip connections whose elements are too small and store them for later parenting
-                    connectsPair, connectsPairDist = findConnectionsByBoundaryBoxIntersection(objs)
-                    ###### Delete connections whose elements are too small and make them parents instead
-                    if props.minimumElementSize: connectsPair, connectsPairParent = deleteConnectionsWithTooSmallElementsAndParentThemInstead(objs, connectsPair, connectsPairDist)
-                    else: connectsPairParent = []
-                    ###### Calculate contact area for all connections
-                    connectsGeo, connectsLoc = calculateContactAreaBasedOnBoundaryBoxesForAll(objs, objsEGrp, connectsPair, qAccurate=props.useAccurateArea)
-                    ###### Delete connections with zero contact area
-                    connectsPair, connectsGeo, connectsLoc = deleteConnectionsWithZeroContactArea(objs, objsEGrp, connectsPair, connectsGeo, connectsLoc)
-                    ###### Delete connections with references from predefined constraints
-                    connectsPair, connectsGeo, connectsLoc = deleteConnectionsWithReferences(objs, emptyObjs, connectsPair, connectsGeo, connectsLoc)
-                    ###### Create connection data
-                    connectsConsts, constsConnect = createConnectionData(objs, objsEGrp, connectsPair, connectsLoc, connectsGeo)
+                print('-- Time: %0.2f s\n' %(time.time()-time_start_connections))
                 
-                    print('-- Time: %0.2f s\n' %(time.time()-time_start_connections))
+                #########################                        
+                ###### Main building part
+                if len(constsConnect) > 0:
+                    time_start_building = time.time()
                     
-                    #########################                        
-                    ###### Main building part
-                    if len(constsConnect) > 0:
-                        time_start_building = time.time()
-                        
-                        ###### Apply displacement correction to meshes and connection locations
-                        connectsLoc = applyDisplacementCorrection(objs, objsEGrp, connectsPair, connectsLoc)
-                        ###### Scale elements by custom scale factor and make separate collision object for that
-                        applyScale(scene, objs, objsEGrp, childObjs)
-                        ###### Bevel elements and make separate collision object for that
-                        applyBevel(scene, objs, objsEGrp, childObjs)
-                        ###### Create actual parents for too small elements
-                        if props.minimumElementSize: makeParentsForTooSmallElementsReal(objs, connectsPairParent)
-                        ###### Find and activate first empty layer
-                        layersBak = backupLayerSettingsAndActivateNextEmptyLayer(scene)
-                        ###### Create empty objects (without any data)
-                        if not props.asciiExport and not props.rebarMesh:
-                            emptyObjs = createEmptyObjs(scene, len(constsConnect))
-                        else:  # If FM is used the emptyObjs list is filled with just the names later
-                            emptyObjs = ["" for i in range(len(constsConnect))]
-                        ###### Bundling close empties into clusters, merge locations and count connections per cluster
-                        if props.clusterRadius > 0: bundlingEmptyObjsToClusters(connectsLoc, connectsConsts)
-                        # Restore old layers state
-                        scene.update()  # Required to update empty locations before layer switching
-                        scene.layers = [bool(q) for q in layersBak]  # Convert array into boolean (required by layers)
-                        ###### Store build data in scene
-                        #if not props.asciiExport:  # Commented out b/c: Postprocessing Tools need some data so we keep it also for FM export, object references are converted to names
-                        storeBuildDataInScene(scene, objs, objsEGrp, emptyObjs, childObjs, objsID, connectsPair, connectsPairParent, connectsLoc, connectsGeo, connectsConsts, None, constsConnect)
-                        
-                        scene["bcb_valid"] = 1
-                        
-                        print('-- Time: %0.2f s\n' %(time.time()-time_start_building))
+                    ###### Apply displacement correction to meshes and connection locations
+                    connectsLoc = applyDisplacementCorrection(objs, objsEGrp, connectsPair, connectsLoc)
+                    profilerLap("applyDisplacementCorrection", len(connectsLoc))
+                    ###### Scale elements by custom scale factor and make separate collision object for that
+                    applyScale(scene, objs, objsEGrp, childObjs)
+                    profilerLap("applyScale", len(childObjs))
+                    ###### Bevel elements and make separate collision object for that
+                    applyBevel(scene, objs, objsEGrp, childObjs)
+                    profilerLap("applyBevel", len(childObjs))
+                    ###### Create actual parents for too small elements
+                    if props.minimumElementSize: makeParentsForTooSmallElementsReal(objs, connectsPairParent)
+                    profilerLap("makeParentsForTooSmallElementsReal", len(connectsPairParent))
+                    ###### Find and activate first empty layer
+                    layersBak = backupLayerSettingsAndActivateNextEmptyLayer(scene)
+                    ###### Create empty objects (without any data)
+                    if not props.asciiExport and not props.rebarMesh:
+                        emptyObjs = createEmptyObjs(scene, len(constsConnect))
+                    else:  # If FM is used the emptyObjs list is filled with just the names later
+                        emptyObjs = ["" for i in range(len(constsConnect))]
+                    profilerLap("createEmptyObjs", len(emptyObjs))
+                    ###### Bundling close empties into clusters, merge locations and count connections per cluster
+                    if props.clusterRadius > 0: bundlingEmptyObjsToClusters(connectsLoc, connectsConsts)
+                    profilerLap("bundlingEmptyObjsToClusters", len(connectsLoc))
+                    # Restore old layers state
+                    scene.update()  # Required to update empty locations before layer switching
+                    scene.layers = [bool(q) for q in layersBak]  # Convert array into boolean (required by layers)
+                    ###### Store build data in scene
+                    #if not props.asciiExport:  # Commented out b/c: Postprocessing Tools need some data so we keep it also for FM export, object references are converted to names
+                    storeBuildDataInScene(scene, objs, objsEGrp, emptyObjs, childObjs, objsID, connectsPair, connectsPairParent, connectsLoc, connectsGeo, connectsConsts, None, constsConnect)
+                    ###### Store geometry fingerprints of elements to detect modifications for incremental rebuilding
+                    storeElementFingerprintsInScene(scene, objs)
+                    profilerLap("storeBuildDataInScene", len(constsConnect))
+                    
+                    scene["bcb_valid"] = 1
                     
-                    ###### No connections found   
-                    else:
-                        print('No connections found. Probably the search distance is too small.')
-                        return 1 
+                    print('-- Time: %0.2f s\n' %(time.time()-time_start_building))
                 
-                ###### No element assigned to element group found
+                ###### No connections found   
                 else:
-                    print('Please make sure that at least two mesh objects are assigned to element groups.')       
-                    print('Nothing done.')
-                    return 1
-
-            ###### No selected input found   
+                    print('No connections found. Probably the search distance is too small.')
+                    return 1 
+            
+            ###### No element assigned to element group found
             else:
-                print('Please select at least two mesh objects to connect. Note that these objects')
-                print('also need rigid body set enabled, preprocessing tools can be used to do this.')       
+                print('Please make sure that at least two mesh objects are assigned to element groups.')       
                 print('Nothing done.')
-                return 1     
-       
-        ##########################################     
-        ###### Update already existing constraints
-        if "bcb_valid" in scene.keys() or props.asciiExport:
-            
-            ###### Store menu config data in scene
-            storeConfigDataInScene(scene)
-            ###### Get temp data from scene
+                return 1
+
+        ###### No selected input found   
+        else:
+            print('Please select at least two mesh objects to connect. Note that these objects')
+            print('also need rigid body set enabled, preprocessing tools can be used to do this.')       
+            print('Nothing done.')
+            return 1     
+   
+    ##########################################     
+    ###### Update already existing constraints
+    if "bcb_valid" in scene.keys() or props.asciiExport:
+        
+        ###### Store menu config data in scene
+        storeConfigDataInScene(scene)
+        ###### Get temp data from scene
+        if not props.asciiExport:
+            objs, emptyObjs, childObjs, objsID, connectsPair, connectsPairParent, connectsLoc, connectsGeo, connectsConsts, connectsTol, constsConnect = getBuildDataFromScene(scene)
+            profilerLap("getBuildDataFromScene", len(emptyObjs))
+        ###### Create fresh element group index to make sure the data is still valid (reordering in menu invalidates it for instance)
+        objsEGrp, objCntInEGrps = createElementGroupIndex(objs)
+        ###### Rebuild connections and constraints of elements modified since the last build
+        # Only on the start frame because elements are moved by the simulation on other frames (e.g. updates by the monitor)
+        if incrementalBuild and qIncremental and not props.asciiExport and scene.frame_current == scene.frame_start:
+            rebuildData = rebuildChangedConnections(scene, objs, objsEGrp, emptyObjs, childObjs, connectsPair, connectsPairParent, connectsLoc, connectsGeo, connectsConsts, constsConnect)
+            if rebuildData != None:
+                emptyObjs, connectsPair, connectsLoc, connectsGeo, connectsConsts, constsConnect = rebuildData
+                storeBuildDataInScene(scene, None, None, emptyObjs, None, None, connectsPair, None, connectsLoc, connectsGeo, connectsConsts, None, constsConnect)
+            profilerLap("rebuildChangedConnections", len(connectsPair))
+        ###### Store updated build data in scene
+        storeBuildDataInScene(scene, None, objsEGrp, None, None, None, None, None, None, None, None, None, None)
+                        
+        if len(emptyObjs) > 0 and objCntInEGrps > 1:
+            ###### Set general rigid body world settings
+            initGeneralRigidBodyWorldSettings(scene)
+            profilerLap("initGeneralRigidBodyWorldSettings", None)
+            ###### Calculate mass for all mesh objects
+            calculateMass(scene, objs, objsEGrp, childObjs)
+            profilerLap("calculateMass", len(objs))
+            ###### Correct bbox based contact area by volume
+            correctContactAreaByVolume(objs, objsEGrp, connectsPair, connectsGeo)
+            profilerLap("correctContactAreaByVolume", len(connectsPair))
+            ###### Create detonator force fields and data
+            connectsBtMul = generateDetonator(objs, connectsPair, objsEGrp)
+            profilerLap("generateDetonator", len(connectsPair))
+            ###### Find and activate first layer with constraint empty object (required to set constraint locations in setConstraintSettings())
+            if not props.asciiExport: layersBak = backupLayerSettingsAndActivateNextLayerWithObj(scene, emptyObjs[0])
+            ###### Set constraint settings
+            connectsTol, exData = setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, connectsLoc, connectsGeo, connectsConsts, constsConnect, connectsBtMul)
+            profilerLap("setConstraintSettings", len(emptyObjs))
+            ###### Store new build data in scene
+            storeBuildDataInScene(scene, None, None, emptyObjs, None, None, None, None, None, None, None, connectsTol, None)
+            ### Restore old layers state
             if not props.asciiExport:
-                objs, emptyObjs, childObjs, objsID, connectsPair, connectsPairParent, connectsLoc, connectsGeo, connectsConsts, connectsTol, constsConnect = getBuildDataFromScene(scene)
-            ###### Create fresh element group index to make sure the data is still valid (reordering in menu invalidates it for instance)
-            objsEGrp, objCntInEGrps = createElementGroupIndex(objs)
-            ###### Store updated build data in scene
-            storeBuildDataInScene(scene, None, objsEGrp, None, None, None, None, None, None, None, None, None, None)
-                            
-            if len(emptyObjs) > 0 and objCntInEGrps > 1:
-                ###### Set general rigid body world settings
-                initGeneralRigidBodyWorldSettings(scene)
-                ###### Calculate mass for all mesh objects
-                calculateMass(scene, objs, objsEGrp, childObjs)
-                ###### Correct bbox based contact area by volume
-                correctContactAreaByVolume(objs, objsEGrp, connectsPair, connectsGeo)
-                ###### Create detonator force fields and data
-                connectsBtMul = generateDetonator(objs, connectsPair, objsEGrp)
-                ###### Find and activate first layer with constraint empty object (required to set constraint locations in setConstraintSettings())
-                if not props.asciiExport: layersBak = backupLayerSettingsAndActivateNextLayerWithObj(scene, emptyObjs[0])
-                ###### Set constraint settings
-                connectsTol, exData = setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, connectsLoc, connectsGeo, connectsConsts, constsConnect, connectsBtMul)
-                ###### Store new build data in scene
-                storeBuildDataInScene(scene, None, None, emptyObjs, None, None, None, None, None, None, None, connectsTol, None)
-                ### Restore old layers state
-                if not props.asciiExport:
-                    scene.update()  # Required to update empty locations before layer switching
-                    scene.layers = [bool(q) for q in layersBak]  # Convert array into boolean (required by layers)
-                ###### Exporting data into internal ASCII text file
-                if props.asciiExport and exData != None: exportDataToText(exData)
-            
-                if props.asciiExport:
-                    # Removing flag for valid data for asciiExport & FM export
-                    try: del scene["bcb_valid"]
+                scene.update()  # Required to update empty locations before layer switching
+                scene.layers = [bool(q) for q in layersBak]  # Convert array into boolean (required by layers)
+            ###### Exporting data into internal ASCII text file
+            if props.asciiExport and exData != None: exportDataToText(exData)
+            profilerLap("exportDataToText", len(emptyObjs))
+        
+            if props.asciiExport:
+                # Removing flag for valid data for asciiExport & FM export
+                try: del scene["bcb_valid"]
+                except: pass
+            else:
+                # Deselect all objects
+                bpy.ops.object.select_all(action='DESELECT')
+                # Select all new constraint empties
+                for emptyObj in emptyObjs:
+                    try: emptyObj.select = 1
                     except: pass
-                else:
-                    # Deselect all objects
-                    bpy.ops.object.select_all(action='DESELECT')
-                    # Select all new constraint empties
-                    for emptyObj in emptyObjs:
-                        try: emptyObj.select = 1
-                        except: pass
-                
-                print('-- Time total: %0.2f s\n' %(time.time()-time_start))
-                print('Constraints:', len(emptyObjs), '| Elements:', len(objs), '| Children:', len(childObjs))
-                print('Done.')
-                return 0
+            
+            
+            print('-- Time total: %0.2f s\n' %(time.time()-time_start))
+            print('Constraints:', len(emptyObjs), '| Elements:', len(objs), '| Children:', len(childObjs))
+            print('Done.')
+            return 0
+
+        ###### No input found   
+        else:
+            print('Neither mesh objects to connect nor constraint empties for updating selected.')       
+            print('Nothing done.')
+            return 1
 
-            ###### No input found   
-            else:
-                print('Neither mesh objects to connect nor constraint empties for updating selected.')       
-                print('Nothing done.')
-                return 1
-                     
-    ###### No RigidBodyWorld group found   
-    else:
-        print('No "RigidBodyWorld" group found in scene. Please create rigid bodies first.')       
-        print('Nothing done.')       
-        return 1
-        
\ No newline at end of file
@@ -37,6 +37,8 @@ from bpy.app.handlers import persistent
 ### Import submodules
 from global_vars import *      # Contains global variables
 from file_io import *          # Contains file input & output functions
+from obj_resolver import *     # Contains cached name to object resolution
+from profiler import *         # Contains build phase profiler
 
 ################################################################################
 
@@ -45,8 +47,19 @@ def build_fm(use_handler=0):
     ### Exports all constraint data to the Fracture Modifier (special Blender version required).
     time_start = time.time()
 
-    props = bpy.context.window_manager.bcb
     scene = bpy.context.scene
+    # Start per-stage profiling (if enabled for developers)
+    profilerStart("build_fm")
+    try: buildFractureModifier(scene, use_handler, time_start)
+    finally:
+        # Write profiling report and restore patched operator calls (also if an error occurred)
+        profilerStop()
+
+########################################
+
+def buildFractureModifier(scene, use_handler, time_start):
+
+    props = bpy.context.window_manager.bcb
 
     ### Purge orphaned data-blocks in database
     for obj in bpy.data.objects:
@@ -125,6 +138,8 @@ def build_fm(use_handler=0):
         # Alternative: bpy.ops.graph.clean(channels=True)
         #bpy.context.area.type = areaType_bak
 
+    profilerLap("animationCurves")
+
     ### Create object to use the Fracture Modifier on
     bpy.ops.mesh.primitive_ico_sphere_add(size=1, view_align=False, enter_editmode=False, location=(0, 0, 0), rotation=(0, 0, 0), layers=scene.layers)
     ob = bpy.context.scene.objects.active
@@ -150,13 +165,8 @@ def build_fm(use_handler=0):
             return
         cDef, exData, exPairs, objNames = pickle.loads(zlib.decompress(base64.decodestring(s.encode())))
 
-        ### Prepare objects list (using dictionaries for faster item search)
-        scnObjs = {}
-        for obj in scene.objects: scnObjs[obj.name] = obj
-        objs = []
-        for name in objNames:
-            try: objs.append(scnObjs[name])
-            except: objs.append(None)
+        ### Prepare objects list (using cached name to object map)
+        objs = resolveObjectNames(scene, objNames)[0]
 
         for obj in objs:
             if obj.parent: objParent = obj.parent; break
@@ -213,9 +223,11 @@ def build_fm(use_handler=0):
     
     ###### Add vertex group to passive objects to mark them for later use (as for rediscretization of a debris heap)
     markPassiveVerts(scene)
+    profilerLap("markPassiveVerts")
 
     ###### Preparing air drag simulation
     air(scene)
+    profilerLap("air")
 
     ### Building FM object
 
@@ -223,8 +235,10 @@ def build_fm(use_handler=0):
         md.fracture_mode = 'EXTERNAL'
         ###### Shards
         objParent = FM_shards(ob)
+        profilerLap("FM_shards", len(md.mesh_islands))
         ###### Constraints
         FM_constraints(ob)
+        profilerLap("FM_constraints", len(md.mesh_constraints))
 
     elif use_handler:
         md.fracture_mode = 'DYNAMIC'
@@ -280,6 +294,7 @@ def build_fm(use_handler=0):
         bpy.context.scene.objects.active = ob
 
     scene.layers = [bool(q) for q in layersBak]  # Revert scene layer settings from backup
+    profilerLap("cleanup")
 
     print()
     print('-- Time total: %0.2f s' %(time.time()-time_start))
@@ -297,13 +312,8 @@ def markPassiveVerts(scene):
         return
     cDef, exData, exPairs, objNames = pickle.loads(zlib.decompress(base64.decodestring(s.encode())))
     
-    ### Prepare objects list (using dictionaries for faster item search)
-    scnObjs = {}
-    for obj in scene.objects: scnObjs[obj.name] = obj
-    objs = []
-    for name in objNames:
-        try: objs.append(scnObjs[name])
-        except: objs.append(None)
+    ### Prepare objects list (using cached name to object map)
+    objs = resolveObjectNames(scene, objNames)[0]
 
     ### Add vertex group to passive objects to mark them for later use (as for rediscretization of a debris heap)
     passiveGrpName = "Passive"
@@ -432,13 +442,8 @@ def FM_shards(ob):
         return
     cDef, exData, exPairs, objNames = pickle.loads(zlib.decompress(base64.decodestring(s.encode())))
 
-    ### Prepare objects list (using dictionaries for faster item search)
-    scnObjs = {}
-    for obj in scene.objects: scnObjs[obj.name] = obj
-    objs = []
-    for name in objNames:
-        try: objs.append(scnObjs[name])
-        except: objs.append(None)
+    ### Prepare objects list (using cached name to object map)
+    objs = resolveObjectNames(scene, objNames)[0]
 
     ### Sort mesh objects by database order
     objsSource = objs
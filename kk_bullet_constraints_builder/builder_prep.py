@@ -30,14 +30,18 @@
 
 ################################################################################
 
-import bpy, mathutils, sys, math, bmesh, array, random
+import bpy, mathutils, sys, os, math, bmesh, array, random, hashlib
+import numpy as np
 from mathutils import Vector
 from math import *
 import global_vars
 
 ### Import submodules
 from global_vars import *      # Contains global variables
-from file_io import *       # Contains build data access functions
+from build_data import *    # Contains build data access functions
+from file_io import *       # Contains file input & output functions
+from geo_cache import *     # Contains per-object geometry cache used by the builder
+import contact_area         # Contains NumPy contact area engine (single and multi process)
 
 ################################################################################
 
@@ -83,18 +87,30 @@ def createElementGroupIndex(objs):
 
     ### Create a list about which object belongs to which element group
     elemGrps = global_vars.elemGrps
+    
+    ### Create inverted index by walking every group's object list only once: object pointer -> element group indices (optimization)
+    objsGrps = {}
+    for k in range(len(elemGrps)):
+        elemGrpName = elemGrps[k][EGSidxName]
+        if elemGrpName in bpy.data.groups:
+            for obj in bpy.data.groups[elemGrpName].objects:
+                key = obj.as_pointer()
+                try: objsGrps[key].append(k)
+                except: objsGrps[key] = [k]
+    
+    ### Element groups with empty name (default group)
+    grpsDefault = [k for k in range(len(elemGrps)) if elemGrps[k][EGSidxName] == '']
+
     objsEGrps = []
     errorsShown = 1
+    conflictCnt = 0
     for obj in objs:
         objGrpsTmp = []
-        for elemGrp in elemGrps:
-            elemGrpName = elemGrp[EGSidxName]
-            if elemGrpName in bpy.data.groups:
-                if obj != None:
-                    try: bpy.data.groups[elemGrpName].objects[obj.name]
-                    except: pass
-                    else: objGrpsTmp.append(elemGrps.index(elemGrp))
+        if obj != None:
+            try: objGrpsTmp = list(objsGrps[obj.as_pointer()])
+            except: pass
         if len(objGrpsTmp) > 1:
+            conflictCnt += 1
             if errorsShown < 2:
                 sys.stdout.write("Warning: Object %s belongs to more than one element group, only first group is used. Element groups:" %obj.name)
                 for idx in objGrpsTmp: sys.stdout.write(" #%d %s" %(idx, elemGrps[idx][EGSidxName]))
@@ -106,10 +122,7 @@ def createElementGroupIndex(objs):
                 errorsShown += 1
         # If selected object is not part of any scene group try to find an element group with empty name to use (default group)
         elif len(objGrpsTmp) == 0:
-            for k in range(len(elemGrps)):
-                elemGrpName = elemGrps[k][EGSidxName]
-                if elemGrpName == '':
-                    objGrpsTmp.append(k)
+            objGrpsTmp = list(grpsDefault)
         # Assign all found groups to object
         if len(objGrpsTmp) > 0:
             objsEGrps.append(objGrpsTmp)
@@ -117,6 +130,10 @@ def createElementGroupIndex(objs):
         # (Todo: flag the group as -1 and deal with it later, but that's also complex)
         else: objsEGrps.append([-1])
         
+    if conflictCnt > 0:
+        print("Warning: Objects belonging to more than one element group:", conflictCnt)
+        print()
+
     ### Taking only first item of the element group lists per object into account (the BCB can only manage one element group per object)
     ### Earlier idea was to expand objs array for objects being member of multiple element groups (item duplication allowed)
     ### but this is not feasible since all the other functions within the BCB would need to respect these.
@@ -171,21 +188,12 @@ def gatherObjects(scene):
     except: pass
     else: objGnd.select = 0
     
-    ### Prepare scene object dictionary for empties to be used for faster item search (optimization)
-    scnObjs = {}
-    scnEmptyObjs = {}
-    for obj in scene.objects:
-        if obj.type == 'EMPTY': scnEmptyObjs[obj.name] = obj
     ### Get previous constraint objects list from BCB data
     try: names = scene["bcb_emptyObjs"]
     except: pass
     else:
-        emptyObjs = []
-        for name in names:
-            if len(name):
-                try: emptyObjs.append(scnEmptyObjs[name])
-                except: emptyObjs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
-            else: emptyObjs.append(None)
+        emptyObjs, namesMissing = resolveObjectNames(scene, names, 'EMPTY')
+        for name in namesMissing: print("Error: Object %s missing, rebuilding constraints is required." %name)
         # Select constraint (empty) objects that might exist from earlier simulations
         for obj in emptyObjs:
             if obj != None: obj.select = 1
@@ -263,6 +271,9 @@ def prepareObjects(objs):
             bpy.ops.object.mode_set(mode='OBJECT')
     ### Converting mesh scale to 1
     bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+
+    # Cached geometry is outdated now
+    geoCacheInvalidate(objs)
     
 ################################################################################   
 
@@ -272,21 +283,8 @@ def prepareMaterials(objs, objsEGrp):
 
     elemGrps = global_vars.elemGrps
             
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
-    
     ### Create group index with their respective objects
-    grpsObjs = {}
-    for elemGrp in elemGrps:
-        grpName = elemGrp[EGSidxName]
-        grpObjs = []
-        for obj in objs:
-            elemGrpIdx = objsEGrp[objsDict[obj]]
-            if elemGrpIdx != -1 and elemGrp == elemGrps[elemGrpIdx]:
-                grpObjs.append(obj)
-        grpsObjs[grpName] = grpObjs
+    grpsObjs = createElementGroupObjectLists(objs, objsEGrp)
     
     ### Create and add individual materials to objects based on element groups if not already present
     # Deselect all objects.
@@ -324,16 +322,14 @@ def boundaryBox(obj, qGlobalSpace):
     me = obj.data
     verts = me.vertices
     if qGlobalSpace:
-        # Multiply local coordinates by world matrix to get global coordinates
-        mat = obj.matrix_world
-        bbMin = mat *verts[0].co
-        bbMax = mat *verts[0].co
+        # Use cached global space boundary box (optimization)
+        geo = geoCacheGet(obj)
+        return geo["bbMin"].copy(), geo["bbMax"].copy(), geo["bbCenter"].copy()
     else:
         bbMin = verts[0].co.copy()
         bbMax = verts[0].co.copy()
     for vert in verts:
-        if qGlobalSpace: loc = mat *vert.co
-        else:            loc = vert.co.copy()
+        loc = vert.co
         if bbMax[0] < loc[0]: bbMax[0] = loc[0]
         if bbMin[0] > loc[0]: bbMin[0] = loc[0]
         if bbMax[1] < loc[1]: bbMax[1] = loc[1]
@@ -346,6 +342,45 @@ def boundaryBox(obj, qGlobalSpace):
 
 ################################################################################   
 
+class connectsRegistry():
+
+    ### Ordered connection list with a hash index keyed by the sorted object index pair (optimization)
+    # Keeps the list semantics of connectsPair but replaces "pair not in connectsPair" and
+    # connectsPair.index(pair) by dictionary lookups and counts connections per object on the fly
+    def __init__(self, objCnt):
+        self.pairs = []                   # Stores both connected objects indices per connection (sorted)
+        self.pairsIdx = {}                # Stores list index per (a, b) tuple of connectsPair
+        self.hitCnts = []                 # Stores how often a connection was found (e.g. vertex pairs)
+        self.objsConnectCnt = [0]*objCnt  # Stores the connection count per object
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def __contains__(self, pair):
+        return self.index(pair[0], pair[1]) != -1
+
+    def index(self, k, l):
+        if k < l: return self.pairsIdx.get((k, l), -1)
+        else:     return self.pairsIdx.get((l, k), -1)
+
+    def add(self, k, l):
+        ### Store connection if not already existing, returns list index and 1 if it is new
+        if k < l: key = (k, l)
+        else:     key = (l, k)
+        idx = self.pairsIdx.get(key)
+        if idx != None:
+            self.hitCnts[idx] += 1
+            return idx, 0
+        idx = len(self.pairs)
+        self.pairsIdx[key] = idx
+        self.pairs.append([key[0], key[1]])
+        self.hitCnts.append(1)
+        self.objsConnectCnt[key[0]] += 1
+        self.objsConnectCnt[key[1]] += 1
+        return idx, 1
+
+################################################################################   
+
 def findConnectionsByVertexPairs(objs, objsEGrp):
     
     ### Find connections by vertex pairs
@@ -374,11 +409,9 @@ def findConnectionsByVertexPairs(objs, objsEGrp):
         kdsMeComp.append(kd)
                         
     ### Find connections by vertex pairs
-    connectsPair = []          # Stores both connected objects indices per connection
+    connects = connectsRegistry(len(objs))
     connectsPairDist = []      # Stores distance between both elements
-    connectsVpairCnt = []      # Stores vertex pair count per connection
     connectsLoc = []           # Stores connection locations
-    objsConnectCnt = [0]*len(objs)   # Stores the connection count per object
     for k in range(len(objs)):
         sys.stdout.write('\r' +"%d" %k)
         # Update progress bar
@@ -414,24 +447,20 @@ def findConnectionsByVertexPairs(objs, objsEGrp):
                         coComp = kdMeComp.find(co_find)[0]    # Find coordinates of the closest vertex
                         co = (co_find +coComp) /2             # Calculate center of both vertices
                         
-                        ### Store connection if not already existing
-                        pair = [k, l]
-                        pair.sort()
-                        if pair not in connectsPair:
-                            connectsPair.append(pair)
+                        ### Store connection if not already existing, otherwise count vertex pair
+                        idx, qNew = connects.add(k, l)
+                        if qNew:
                             connectsPairDist.append(aDist[j])
-                            objsConnectCnt[k] += 1
-                            objsConnectCnt[l] += 1
-                            connectsVpairCnt.append(1)
                             connectsLoc.append(co)
                         else:
-                            idx = connectsPair.index(pair)
-                            connectsVpairCnt[idx] += 1
-                            connectsLoc[idx] = connectsLoc[idx] *(1 -(1 /connectsVpairCnt[idx])) +co *(1 /connectsVpairCnt[idx])  # Average all locs
+                            vPairCnt = connects.hitCnts[idx]
+                            connectsLoc[idx] = connectsLoc[idx] *(1 -(1 /vPairCnt)) +co *(1 /vPairCnt)  # Average all locs
     print()
                             
+    connectsPair = connects.pairs
+    objsConnectCnt = connects.objsConnectCnt
     # Vertex pair count correction because we counted every pair twice 
-    connectsVpairCnt = [int(cnt /2) for cnt in connectsVpairCnt]
+    connectsVpairCnt = [int(cnt /2) for cnt in connects.hitCnts]
     
     ### Filter for vertex pair count condition
     connectsPairNew = []
@@ -446,8 +475,8 @@ def findConnectionsByVertexPairs(objs, objsEGrp):
         vPairCnt = next(connectsVpairCnt_iter)
         pairDist = next(connectsPairDist_iter)   
         loc = next(connectsLoc_iter)
-        elemGrpA = objsEGrp[objs.index(objs[pair[0]])]
-        elemGrpB = objsEGrp[objs.index(objs[pair[1]])]
+        elemGrpA = objsEGrp[pair[0]]
+        elemGrpB = objsEGrp[pair[1]]
         
         qSkip = 0
         if elemGrpA != -1 and elemGrpB != -1:
@@ -455,9 +484,9 @@ def findConnectionsByVertexPairs(objs, objsEGrp):
             Prio_B = elemGrps[elemGrpB][EGSidxPrio]
             reqVertexPairsObjA = elemGrps[elemGrpA][EGSidxRqVP]
             reqVertexPairsObjB = elemGrps[elemGrpB][EGSidxRqVP]
-            if vertPairCnt >= reqVertexPairsObjA and vertPairCnt >= reqVertexPairsObjB and Prio_A == Prio_B \
-            or vertPairCnt >= reqVertexPairsObjA and Prio_A > Prio_B \
-            or vertPairCnt >= reqVertexPairsObjB and Prio_A < Prio_B:
+            if vPairCnt >= reqVertexPairsObjA and vPairCnt >= reqVertexPairsObjB and Prio_A == Prio_B \
+            or vPairCnt >= reqVertexPairsObjA and Prio_A > Prio_B \
+            or vPairCnt >= reqVertexPairsObjB and Prio_A < Prio_B:
                 connectsPairNew.append(pair)
                 connectsPairDistNew.append(pairDist)
                 connectsLocNew.append(loc)
@@ -498,6 +527,25 @@ def findConnectionsByVertexPairs(objs, objsEGrp):
 
 ################################################################################   
 
+def boundaryBoxesArray(objs):
+
+    ### Calculate global boundary box corners for all given objects as NumPy arrays (optimization)
+    objCnt = len(objs)
+    bbMins = np.empty((objCnt, 3))
+    bbMaxs = np.empty((objCnt, 3))
+    for i in range(objCnt):
+        geo = geoCacheGet(objs[i])
+        if geo["bbMin"] == None:
+            # Objects without vertices get an inverted box so they can't overlap with anything
+            bbMins[i] = np.inf; bbMaxs[i] = -np.inf
+            continue
+        bbMins[i] = geo["bbMin"]
+        bbMaxs[i] = geo["bbMax"]
+    
+    return bbMins, bbMaxs
+
+################################################################################   
+
 def findConnectionsByBoundaryBoxIntersection(objs):
     
     ### Find connections by boundary box intersection
@@ -505,25 +553,130 @@ def findConnectionsByBoundaryBoxIntersection(objs):
     
     props = bpy.context.window_manager.bcb
     
+    ### Precalculate boundary boxes for all objects
+    bbMins, bbMaxs = boundaryBoxesArray(objs)
+    # Extend boundary box dimensions by searchDistance
+    searchDistanceHalf = props.searchDistance /2
+    bbMins -= searchDistanceHalf
+    bbMaxs += searchDistanceHalf
+    
+    if props.connectionCountLimit:
+        connectsPair, connectsPairDist = findConnectionsByBoundaryBoxIntersectionLimited(objs, bbMins, bbMaxs)
+    else:
+        connectsPair, connectsPairDist = findConnectionsByBoundaryBoxIntersectionSweep(objs, bbMins, bbMaxs)
+    
+    print("\nPossible connections found:", len(connectsPair))
+    return connectsPair, connectsPairDist
+
+########################################
+
+def findConnectionsByBoundaryBoxIntersectionSweep(objs, bbMins, bbMaxs):
+    
+    ### Find all intersecting boundary boxes by sort and sweep along the X axis (broadphase without connection count limit)
+    objCnt = len(objs)
+    locs = np.array([obj.location for obj in objs]).reshape((objCnt, 3))
+    
+    # Sort boxes by their lower X bound so only a contiguous range of candidates has to be compared
+    order = np.argsort(bbMins[:, 0], kind='mergesort')
+    sMins = bbMins[order]
+    sMaxs = bbMaxs[order]
+    # For each box find the end of the range of boxes starting before its upper X bound
+    rangeEnds = np.searchsorted(sMins[:, 0], sMaxs[:, 0], side='left')
+    
+    pairsA = []; pairsB = []
+    for i in range(objCnt):
+        if i %1000 == 0:
+            sys.stdout.write('\r' +"%d" %i)
+            # Update progress bar
+            bpy.context.window_manager.progress_update(i /objCnt)
+        
+        rangeEnd = rangeEnds[i]
+        if rangeEnd <= i +1: continue
+        bbAMin = sMins[i]; bbAMax = sMaxs[i]
+        bbBMin = sMins[i +1:rangeEnd]; bbBMax = sMaxs[i +1:rangeEnd]
+        ### Calculate overlap per axis of both intersecting boundary boxes
+        overlap = np.minimum(bbAMax, bbBMax) -np.maximum(bbAMin, bbBMin)
+        np.maximum(overlap, 0, out=overlap)
+        # Calculate volume
+        volume = overlap[:, 0] *overlap[:, 1] *overlap[:, 2]
+        hits = np.nonzero(volume > 0)[0]
+        if len(hits):
+            pairsA.append(np.full(len(hits), order[i], dtype=np.int64))
+            pairsB.append(order[i +1 +hits])
+    sys.stdout.write('\r' +"%d" %objCnt)
+    
+    if len(pairsA) == 0: return [], []
+    pairsA = np.concatenate(pairsA); pairsB = np.concatenate(pairsB)
+    
+    return sortConnectionPairs(locs, pairsA, pairsB)
+
+########################################
+
+def sortConnectionPairs(locs, pairsA, pairsB):
+    
+    ### Convert found pairs into connection lists with the lower element index first and calculate their distances
+    pairsMin = np.minimum(pairsA, pairsB)
+    pairsMax = np.maximum(pairsA, pairsB)
+    dists = np.sqrt(((locs[pairsMin] -locs[pairsMax]) **2).sum(axis=1))
+    
+    # Sort connections into the same order as the former kd-tree search did (by first element, then by distance)
+    order = np.lexsort((dists, pairsMin))
+    connectsPair = np.column_stack((pairsMin[order], pairsMax[order])).tolist()  # Stores both connected objects indices per connection
+    connectsPairDist = dists[order].tolist()                                    # Stores distance between both elements
+    
+    return connectsPair, connectsPairDist
+
+########################################
+
+def findConnectionsByBoundaryBoxIntersectionForElements(objs, idxs):
+    
+    ### Find connections by boundary box intersection only for the given elements (used for incremental rebuilding)
+    print("Searching connections of modified elements by boundary box intersection... (%d)" %len(idxs))
+    
+    props = bpy.context.window_manager.bcb
+    objCnt = len(objs)
+    locs = np.array([obj.location for obj in objs]).reshape((objCnt, 3))
+    
+    ### Precalculate boundary boxes for all objects
+    bbMins, bbMaxs = boundaryBoxesArray(objs)
+    # Extend boundary box dimensions by searchDistance
+    searchDistanceHalf = props.searchDistance /2
+    bbMins -= searchDistanceHalf
+    bbMaxs += searchDistanceHalf
+    
+    ### Compare only the boundary boxes of the given elements with all others
+    pairs = set()
+    for k in idxs:
+        ### Calculate overlap per axis of both intersecting boundary boxes
+        overlap = np.minimum(bbMaxs[k], bbMaxs) -np.maximum(bbMins[k], bbMins)
+        np.maximum(overlap, 0, out=overlap)
+        # Calculate volume
+        volume = overlap[:, 0] *overlap[:, 1] *overlap[:, 2]
+        for l in np.nonzero(volume > 0)[0].tolist():
+            if l != k: pairs.add((min(k, l), max(k, l)))
+    
+    if len(pairs) == 0: return [], []
+    pairs = np.array(sorted(pairs), dtype=np.int64).reshape((len(pairs), 2))
+    connectsPair, connectsPairDist = sortConnectionPairs(locs, pairs[:, 0], pairs[:, 1])
+    
+    print("Possible connections found:", len(connectsPair))
+    return connectsPair, connectsPairDist
+
+########################################
+
+def findConnectionsByBoundaryBoxIntersectionLimited(objs, bbMins, bbMaxs):
+    
+    ### Find intersecting boundary boxes only for the n closest neighbors (connection count limit)
+    props = bpy.context.window_manager.bcb
+    
     ### Build kd-tree for object locations
     kdObjs = mathutils.kdtree.KDTree(len(objs))
     for i, obj in enumerate(objs):
         kdObjs.insert(obj.location, i)
     kdObjs.balance()
     
-    ### Precalculate boundary boxes for all objects
-    bboxes = []
-    for obj in objs:
-        # Calculate boundary box corners
-        bbMin, bbMax, bbCenter = boundaryBox(obj, 1)
-        # Extend boundary box dimensions by searchDistance
-        searchDistanceHalf = props.searchDistance /2
-        bbMin -= Vector((searchDistanceHalf, searchDistanceHalf, searchDistanceHalf))
-        bbMax += Vector((searchDistanceHalf, searchDistanceHalf, searchDistanceHalf))
-        bboxes.append([bbMin, bbMax])
-    
     ### Find connections by intersecting boundary boxes
-    connectsPair = []          # Stores both connected objects indices per connection
+    connects = connectsRegistry(len(objs))
     connectsPairDist = []      # Stores distance between both elements
     for k in range(len(objs)):
         sys.stdout.write('\r' +"%d" %k)
@@ -531,18 +684,12 @@ def findConnectionsByBoundaryBoxIntersection(objs):
         bpy.context.window_manager.progress_update(k /len(objs))
         
         obj = objs[k]
-        mat = obj.matrix_world
-        me = obj.data
                 
         ### Find closest objects via kd-tree
         co_find = obj.location
         aIndex = []; aDist = []  #; aCo = [] 
-        if props.connectionCountLimit:
-            for (co, index, dist) in kdObjs.find_n(co_find, props.connectionCountLimit +1):  # +1 because the first item will be removed
-                aIndex.append(index); aDist.append(dist)  #; aCo.append(co)
-        else:
-            for (co, index, dist) in kdObjs.find_range(co_find, 999999):
-                aIndex.append(index); aDist.append(dist)  #; aCo.append(co) 
+        for (co, index, dist) in kdObjs.find_n(co_find, props.connectionCountLimit +1):  # +1 because the first item will be removed
+            aIndex.append(index); aDist.append(dist)  #; aCo.append(co)
         aIndex = aIndex[1:]; aDist = aDist[1:]  # Remove first item because it's the same as co_find (zero distance)
     
         # Loop through comparison objects found
@@ -552,26 +699,18 @@ def findConnectionsByBoundaryBoxIntersection(objs):
             
             # Skip same object index
             if k != l:
-                bbAMin, bbAMax = bboxes[k]
-                bbBMin, bbBMax = bboxes[l]
                 ### Calculate overlap per axis of both intersecting boundary boxes
-                overlapX = max(0, min(bbAMax[0],bbBMax[0]) -max(bbAMin[0],bbBMin[0]))
-                overlapY = max(0, min(bbAMax[1],bbBMax[1]) -max(bbAMin[1],bbBMin[1]))
-                overlapZ = max(0, min(bbAMax[2],bbBMax[2]) -max(bbAMin[2],bbBMin[2]))
+                overlap = np.minimum(bbMaxs[k], bbMaxs[l]) -np.maximum(bbMins[k], bbMins[l])
                 # Calculate volume
-                volume = overlapX *overlapY *overlapZ
-                if volume > 0:                
+                if overlap[0] > 0 and overlap[1] > 0 and overlap[2] > 0:
                     ### Store connection if not already existing
-                    pair = [k, l]
-                    pair.sort()
-                    if pair not in connectsPair:
-                        connectsPair.append(pair)
+                    idx, qNew = connects.add(k, l)
+                    if qNew:
                         connectsPairDist.append(aDist[j])
                         connectCnt += 1
                         if connectCnt == props.connectionCountLimit: break
     
-    print("\nPossible connections found:", len(connectsPair))
-    return connectsPair, connectsPairDist
+    return connects.pairs, connectsPairDist
 
 ################################################################################   
 
@@ -615,12 +754,12 @@ def deleteConnectionsWithTooSmallElementsAndParentThemInstead(objs, connectsPair
         connectsPairParentDist, connectsPairParent = zip(*sorted(zip(connectsPairParentDist, connectsPairParent)))
     
     ### Filter out children doubles because each children can only have one parent, other connections are discarded
-    checkList = []
+    checkList = set()
     connectsPairParentTmp = []
     for item in connectsPairParent:
         if item[0] not in checkList:
             connectsPairParentTmp.append(item)
-            checkList.append(item[0])
+            checkList.add(item[0])
     connectsPairParent = connectsPairParentTmp
     
     print("Connections converted and removed:", len(connectsPairParent))
@@ -633,68 +772,43 @@ def makeParentsForTooSmallElementsReal(objs, connectsPairParent):
     ### Create actual parents for too small elements
     print("Creating actual parents for too small elements... (%d)" %len(connectsPairParent))
     
-    ### Create a second scene to temporarily move objects to, to avoid depsgraph update overhead (optimization)
-    scene = bpy.context.scene
-    sceneTemp = bpy.data.scenes.new("BCB Temp Scene")
-    # Switch to original scene (shouldn't be necessary but is required for error free Bullet simulation on later scene switching for some strange reason)
-    bpy.context.screen.scene = scene
-    # Link cameras because in second scene is none and when coming back camera view will losing focus
-    objCameras = []
-    for objTemp in scene.objects:
-        if objTemp.type == 'CAMERA':
-            sceneTemp.objects.link(objTemp)
-            objCameras.append(objTemp)
-    # Switch to new scene
-    bpy.context.screen.scene = sceneTemp
+    ### Get parent inverse matrices first, parenting keeps world transforms so they stay valid during the batch
+    # (Setting parent and inverse matrix directly avoids the operator and depsgraph update overhead per object)
+    parentsInv = {}
+    for pair in connectsPairParent:
+        objParent = objs[pair[1]]
+        if objParent.name not in parentsInv:
+            parentsInv[objParent.name] = objParent.matrix_world.inverted()
 
     # Deselect all objects
     bpy.ops.object.select_all(action='DESELECT')
     
     ### Make parents
+    cntLoops = 0
     for k in range(len(connectsPairParent)):
-        sys.stdout.write('\r' +"%d" %k)
+        if k %1000 == 0: sys.stdout.write('\r' +"%d" %k)
         
         objChild = objs[connectsPairParent[k][0]]
         objParent = objs[connectsPairParent[k][1]]
 
-        # Link objects we're working on to second scene (we try because of the object unlink workaround)
-        try: sceneTemp.objects.link(objChild)
-        except: pass
-        try: sceneTemp.objects.link(objParent)
-        except: pass
+        ### Skip if parenting would result in a dependency loop (operator would refuse that as well)
+        obj = objParent; qLoop = 0
+        while obj != None:
+            if obj == objChild: qLoop = 1; break
+            obj = obj.parent
+        if qLoop: cntLoops += 1; continue
 
         ### Make parent
-        objParent.select = 1
+        objChild.parent = objParent
+        objChild.matrix_parent_inverse = parentsInv[objParent.name]
         objChild.select = 1
-        bpy.context.scene.objects.active = objParent   # Parent
-        bpy.ops.object.parent_set(type='OBJECT', keep_transform=False)
-        objParent.select = 0
-        objChild.select = 0
-
-#        # Unlink objects from second scene (leads to loss of rigid body settings, bug in Blender)
-#        sceneTemp.objects.unlink(objChild)
-#        sceneTemp.objects.unlink(objParent)
-        # Workaround: Delete second scene and recreate it (deleting objects indirectly without the loss of rigid body settings)
-        if k %200 == 0:   # Only delete scene every now and then so we have lower overhead from the relatively slow process
-            try:    bpy.data.scenes.remove(sceneTemp, do_unlink=1)
-            except: bpy.data.scenes.remove(sceneTemp)
-            sceneTemp = bpy.data.scenes.new("BCB Temp Scene")
-            # Link cameras because in second scene is none and when coming back camera view will losing focus
-            for obj in objCameras:
-                sceneTemp.objects.link(obj)
-            # Switch to new scene
-            bpy.context.screen.scene = sceneTemp
-    
-    # Switch back to original scene
-    bpy.context.screen.scene = scene
-    # Delete second scene
-    try:    bpy.data.scenes.remove(sceneTemp, do_unlink=1)
-    except: bpy.data.scenes.remove(sceneTemp)
-
-    ### Remove child object from rigid body world (should not be simulated anymore)
-    for k in range(len(connectsPairParent)):
-        objChild = objs[connectsPairParent[k][0]].select = 1
+
+    if cntLoops: print("\nWarning: Parenting skipped for %d elements to avoid dependency loops." %cntLoops)
+
+    ### Remove child objects from rigid body world in one go (should not be simulated anymore)
     bpy.ops.rigidbody.objects_remove()
+    # Deselect all objects
+    bpy.ops.object.select_all(action='DESELECT')
         
     print()
     
@@ -709,15 +823,13 @@ def boundaryBoxFaces(obj, qGlobalSpace, selMin=None, selMax=None):
     
     ### Only consider faces within a user defined boundary box
     if selMin != None and selMax != None:
+        # Use vectorized version for global space (optimization)
+        if qGlobalSpace:
+            return boundaryBoxFacesMulti(obj, [selMin], [selMax])[0]
         selVerts = []
         selArea = 0
         for face in faces:
-            if qGlobalSpace:
-                # Multiply local coordinates by world matrix to get global coordinates
-                mat = obj.matrix_world
-                loc = mat *face.center
-            else:
-                loc = face.center.copy()
+            loc = face.center.copy()
             if  selMax[0] > loc[0] and selMin[0] < loc[0] \
             and selMax[1] > loc[1] and selMin[1] < loc[1] \
             and selMax[2] > loc[2] and selMin[2] < loc[2]:
@@ -762,204 +874,60 @@ def boundaryBoxFaces(obj, qGlobalSpace, selMin=None, selMax=None):
     else: 
         return None, None, None, 0
 
+########################################
+
+def boundaryBoxFacesMulti(obj, selMins, selMaxs):
+
+    ### Calculate global boundary boxes of faces within several user defined boundary boxes at once (vectorized)
+    # Returns a list with one [bbMin, bbMax, bbCenter, selArea] entry per given boundary box
+    geo = geoCacheGet(obj)
+    centers = geo["faceCenters"]
+    selMins = np.array([tuple(v) for v in selMins])
+    selMaxs = np.array([tuple(v) for v in selMaxs])
+    # Face selection masks for all boundary boxes (face count x box count)
+    masks = np.all((centers[:, None, :] > selMins[None, :, :]) & (centers[:, None, :] < selMaxs[None, :, :]), axis=2)
+    loopMasks = masks[geo["loopFaces"]]
+    results = []
+    for j in range(len(selMins)):
+        mask = masks[:, j]
+        if not mask.any():
+            results.append([None, None, None, 0])
+            continue
+        selArea = float(geo["faceAreas"][mask].sum())
+        # Vertices of all selected faces
+        cos = geo["cos"][geo["loopVerts"][loopMasks[:, j]]]
+        bbMin = Vector(cos.min(axis=0))
+        bbMax = Vector(cos.max(axis=0))
+        bbCenter = (bbMin +bbMax) /2
+        results.append([bbMin, bbMax, bbCenter, selArea])
+    
+    return results
+
 ################################################################################
 
-def calculateContactAreaBasedOnBoundaryBoxesForPair(objA, objB, sDistFallb, qNonManifold=0, qAccurate=0):
+def getSearchDistanceFallback(elemGrpA, elemGrpB):
 
-    ###### Calculate contact area for a single pair of objects
+    ### Get Search Distance Fallback setting for a connection between two element groups
     props = bpy.context.window_manager.bcb
-    searchDist = props.searchDistance
-    searchDistMesh = props.searchDistanceMesh
-
-    ### Calculate boundary box corners
-    bbAMin, bbAMax, bbACenter = boundaryBox(objA, 1)
-    bbBMin, bbBMax, bbBCenter = boundaryBox(objB, 1)
-    halfSize = ((bbAMax-bbAMin) +(bbBMax-bbBMin)) /4
-    bbAMinOrig, bbAMaxOrig, bbACenterOrig = bbAMin, bbAMax, bbACenter
-    bbBMinOrig, bbBMaxOrig, bbBCenterOrig = bbBMin, bbBMax, bbBCenter
-
-    ### Determine faces within search range of both objects and return their surface area
-    geoContactAreaF = 0
-    qSkipConnect = 0
-    if qAccurate:
-        # Create new faces bbox for A for faces within searchDistMesh range of bbox B
-        bbBMinSDM = Vector((bbBMin[0]-searchDistMesh, bbBMin[1]-searchDistMesh, bbBMin[2]-searchDistMesh))
-        bbBMaxSDM = Vector((bbBMax[0]+searchDistMesh, bbBMax[1]+searchDistMesh, bbBMax[2]+searchDistMesh))
-        bbAMinF, bbAMaxF, bbACenterF, areaA = boundaryBoxFaces(objA, 1, selMin=bbBMinSDM, selMax=bbBMaxSDM)
-        # Create new faces bbox for B for faces within searchDistMesh range of bbox A
-        bbAMinSDM = Vector((bbAMin[0]-searchDistMesh, bbAMin[1]-searchDistMesh, bbAMin[2]-searchDistMesh))
-        bbAMaxSDM = Vector((bbAMax[0]+searchDistMesh, bbAMax[1]+searchDistMesh, bbAMax[2]+searchDistMesh))
-        bbBMinF, bbBMaxF, bbBCenterF, areaB = boundaryBoxFaces(objB, 1, selMin=bbAMinSDM, selMax=bbAMaxSDM)
-        # Create new faces bbox for A for faces within searchDist range of bbox B
-        bbBMinSD = Vector((bbBMin[0]-searchDist, bbBMin[1]-searchDist, bbBMin[2]-searchDist))
-        bbBMaxSD = Vector((bbBMax[0]+searchDist, bbBMax[1]+searchDist, bbBMax[2]+searchDist))
-        bbAMinF2, bbAMaxF2, bbACenterF2, areaA2 = boundaryBoxFaces(objA, 1, selMin=bbBMinSD, selMax=bbBMaxSD)
-        # Create new faces bbox for B for faces within searchDist range of bbox A
-        bbAMinSD = Vector((bbAMin[0]-searchDist, bbAMin[1]-searchDist, bbAMin[2]-searchDist))
-        bbAMaxSD = Vector((bbAMax[0]+searchDist, bbAMax[1]+searchDist, bbAMax[2]+searchDist))
-        bbBMinF2, bbBMaxF2, bbBCenterF2, areaB2 = boundaryBoxFaces(objB, 1, selMin=bbAMinSD, selMax=bbAMaxSD)
-
-        ### Check if detected contact area is implausible high compared to the total surface area of the objects
-        areaAtot = 0; areaBtot = 0
-        for face in objA.data.polygons: areaAtot += face.area
-        for face in objB.data.polygons: areaBtot += face.area
-        if areaA >= areaAtot /2 or areaB >= areaBtot /2: 
-            if areaA > 0:
-                if areaA < areaAtot /2: geoContactAreaF = areaA
-                bbAMin, bbAMax, bbACenter = bbAMinF, bbAMaxF, bbACenterF
-            if areaB > 0:
-                if areaB < areaBtot /2: geoContactAreaF = areaB
-                bbBMin, bbBMax, bbBCenter = bbBMinF, bbBMaxF, bbBCenterF
-        # Use the smallest detected area of both objects as contact area
-        elif areaA > 0 and areaB > 0:
-            geoContactAreaF = min(areaA, areaB)
-            bbAMin, bbAMax, bbACenter = bbAMinF, bbAMaxF, bbACenterF
-            bbBMin, bbBMax, bbBCenter = bbBMinF, bbBMaxF, bbBCenterF
-        # Or if only one area is greater zero then use that one
-        elif areaA > 0:
-            geoContactAreaF = areaA
-            bbAMin, bbAMax, bbACenter = bbAMinF, bbAMaxF, bbACenterF
-        elif areaB > 0:
-            geoContactAreaF = areaB
-            bbBMin, bbBMax, bbBCenter = bbBMinF, bbBMaxF, bbBCenterF
-        ### Alternatively use regular search distance face areas to derive locations from (but not for contact area as it may be too inaccurate)
-        # Use the smallest detected area of both objects as contact area
-        elif sDistFallb and areaA2 > 0 and areaB2 > 0:
-            bbAMin, bbAMax, bbACenter = bbAMinF2, bbAMaxF2, bbACenterF2
-            bbBMin, bbBMax, bbBCenter = bbBMinF2, bbBMaxF2, bbBCenterF2
-        # Or if only one area is greater zero then use that one
-        elif sDistFallb and areaA2 > 0:
-            bbAMin, bbAMax, bbACenter = bbAMinF2, bbAMaxF2, bbACenterF2
-        elif sDistFallb and areaB2 > 0:
-            bbBMin, bbBMax, bbBCenter = bbBMinF2, bbBMaxF2, bbBCenterF2
-        elif not sDistFallb: qSkipConnect = 1
-
-        ### Calculate overlap of face based boundary boxes rather than simple boundary box overlap
-        if areaA > 0 and areaB > 0:
-            overlapXF = min(bbAMaxF[0],bbBMaxF[0]) -max(bbAMinF[0],bbBMinF[0])
-            overlapYF = min(bbAMaxF[1],bbBMaxF[1]) -max(bbAMinF[1],bbBMinF[1])
-            overlapZF = min(bbAMaxF[2],bbBMaxF[2]) -max(bbAMinF[2],bbBMinF[2])
-            # If one axis is out of search distance range then fall back to simple boundary box based overlap
-            if overlapXF < -searchDistMesh or overlapYF < -searchDistMesh or overlapZF < -searchDistMesh:
-                  qSkipConnect = 1
-            else: overlapX, overlapY, overlapZ = max(0,overlapXF), max(0,overlapYF), max(0,overlapZF)
-        if areaA > 0:
-            overlapXF = min(bbAMaxF[0],bbBMax[0]) -max(bbAMinF[0],bbBMin[0])
-            overlapYF = min(bbAMaxF[1],bbBMax[1]) -max(bbAMinF[1],bbBMin[1])
-            overlapZF = min(bbAMaxF[2],bbBMax[2]) -max(bbAMinF[2],bbBMin[2])
-            # If one axis is out of search distance range then fall back to simple boundary box based overlap
-            if overlapXF < -searchDistMesh or overlapYF < -searchDistMesh or overlapZF < -searchDistMesh:
-                  qSkipConnect = 1
-            else: overlapX, overlapY, overlapZ = max(0,overlapXF), max(0,overlapYF), max(0,overlapZF)
-        if areaB > 0:
-            overlapXF = min(bbAMax[0],bbBMaxF[0]) -max(bbAMin[0],bbBMinF[0])
-            overlapYF = min(bbAMax[1],bbBMaxF[1]) -max(bbAMin[1],bbBMinF[1])
-            overlapZF = min(bbAMax[2],bbBMaxF[2]) -max(bbAMin[2],bbBMinF[2])
-            # If one axis is out of search distance range then fall back to simple boundary box based overlap
-            if overlapXF < -searchDistMesh or overlapYF < -searchDistMesh or overlapZF < -searchDistMesh:
-                  qSkipConnect = 1
-            else: overlapX, overlapY, overlapZ = max(0,overlapXF), max(0,overlapYF), max(0,overlapZF)
-        ### Alternatively use overlap of face based boundary boxes based on regular search distance
-        elif sDistFallb and areaA2 > 0 and areaB2 > 0:
-            overlapXF = min(bbAMaxF2[0],bbBMaxF2[0]) -max(bbAMinF2[0],bbBMinF2[0])
-            overlapYF = min(bbAMaxF2[1],bbBMaxF2[1]) -max(bbAMinF2[1],bbBMinF2[1])
-            overlapZF = min(bbAMaxF2[2],bbBMaxF2[2]) -max(bbAMinF2[2],bbBMinF2[2])
-            # If one axis is out of search distance range then fall back to simple boundary box based overlap
-            if overlapXF < -searchDist or overlapYF < -searchDist or overlapZF < -searchDist:
-                  qSkipConnect = 1
-            else: overlapX, overlapY, overlapZ = max(0,overlapXF), max(0,overlapYF), max(0,overlapZF)
-        elif sDistFallb and areaA2 > 0:
-            overlapXF = min(bbAMaxF2[0],bbBMax[0]) -max(bbAMinF2[0],bbBMin[0])
-            overlapYF = min(bbAMaxF2[1],bbBMax[1]) -max(bbAMinF2[1],bbBMin[1])
-            overlapZF = min(bbAMaxF2[2],bbBMax[2]) -max(bbAMinF2[2],bbBMin[2])
-            # If one axis is out of search distance range then fall back to simple boundary box based overlap
-            if overlapXF < -searchDist or overlapYF < -searchDist or overlapZF < -searchDist:
-                  qSkipConnect = 1
-            else: overlapX, overlapY, overlapZ = max(0,overlapXF), max(0,overlapYF), max(0,overlapZF)
-        elif sDistFallb and areaB2 > 0:
-            overlapXF = min(bbAMax[0],bbBMaxF2[0]) -max(bbAMin[0],bbBMinF2[0])
-            overlapYF = min(bbAMax[1],bbBMaxF2[1]) -max(bbAMin[1],bbBMinF2[1])
-            overlapZF = min(bbAMax[2],bbBMaxF2[2]) -max(bbAMin[2],bbBMinF2[2])
-            # If one axis is out of search distance range then fall back to simple boundary box based overlap
-            if overlapXF < -searchDist or overlapYF < -searchDist or overlapZF < -searchDist:
-                  qSkipConnect = 1
-            else: overlapX, overlapY, overlapZ = max(0,overlapXF), max(0,overlapYF), max(0,overlapZF)
-        elif not sDistFallb: qSkipConnect = 1
-                
-    if not qAccurate or qSkipConnect or sDistFallb:
-        ### Calculate simple overlap of boundary boxes for contact area calculation (project along all axis')
-        # Include minimumContactArea for rare cases of edge-to-edge contact where we don't want to get zero as result
-        bbAMin_ = Vector((bbAMin[0]-minimumContactArea, bbAMin[1]-minimumContactArea, bbAMin[2]-minimumContactArea))
-        bbAMax_ = Vector((bbAMax[0]+minimumContactArea, bbAMax[1]+minimumContactArea, bbAMax[2]+minimumContactArea))
-        bbBMin_ = Vector((bbBMin[0]-minimumContactArea, bbBMin[1]-minimumContactArea, bbBMin[2]-minimumContactArea))
-        bbBMax_ = Vector((bbBMax[0]+minimumContactArea, bbBMax[1]+minimumContactArea, bbBMax[2]+minimumContactArea))
-        overlapX = max(0, min(bbAMax_[0],bbBMax_[0]) -max(bbAMin_[0],bbBMin_[0]))
-        overlapY = max(0, min(bbAMax_[1],bbBMax_[1]) -max(bbAMin_[1],bbBMin_[1]))
-        overlapZ = max(0, min(bbAMax_[2],bbBMax_[2]) -max(bbAMin_[2],bbBMin_[2]))
-
-    if not qSkipConnect or props.surfaceForced:
-
-        ### Calculate area based on either the sum of all axis surfaces...
-        if not qNonManifold or sDistFallb:
-            overlapAreaX = overlapY *overlapZ
-            overlapAreaY = overlapX *overlapZ
-            overlapAreaZ = overlapX *overlapY
-            # Add up all contact areas
-            geoContactAreaB = overlapAreaX +overlapAreaY +overlapAreaZ
-                
-        ### Or calculate contact area based on predefined custom thickness
-        if qNonManifold:
-            if props.surfaceForced:
-                geoContactAreaB = (overlapX +overlapY +overlapZ) *props.surfaceThickness
-            elif not sDistFallb:
-                geoContactAreaB = 0
-
-        ### Calculate alternative contact area from object dimensions
-        dimA = objA.dimensions
-        dimB = objB.dimensions
-        # We use the surface area of the smallest side since we don't want to artificially strengthen the structure in case later sanity check fails
-        areaA = min(min(dimA[0]*dimA[1], dimA[0]*dimA[2]), dimA[1]*dimA[2])
-        areaB = min(min(dimB[0]*dimB[1], dimB[0]*dimB[2]), dimB[1]*dimB[2])
-        geoContactAreaD = min(areaA, areaB)
-
-        ### Sanity check: in case no boundary box intersection is found use element dimensions based contact area as fallback 
-        if geoContactAreaB > 0: geoContactArea = geoContactAreaB
-        else:                   geoContactArea = geoContactAreaD
-
-        # Sanity check: contact area based on faces is expected to be smaller than boundary box and dimensions contact area, only then use face based contact area
-        qVolCorrect = 0
-        if geoContactAreaF < geoContactArea and geoContactAreaF > 0:
-            geoContactArea = geoContactAreaF
-        elif not qNonManifold:
-            qVolCorrect = 1
-        
-        ### Find out element thickness to be used for bending threshold calculation 
-        if geoContactAreaB > 0:
-            geo = [overlapX, overlapY, overlapZ]
-            geoAxis = [1, 2, 3]
-            geo, geoAxis = zip(*sorted(zip(geo, geoAxis)))
-            geoHeight = geo[1]  # First item = mostly 0, second item = thickness/height, third item = width 
-            geoWidth = geo[2]
-        else:
-            geoAxis = [0, 0, 0]
-            geoHeight = geoContactArea**0.5
-            geoWidth = geoHeight
-        
-        # Add custom thickness to contact area (only for manifolds as it is already included in non-manifolds)
-        if not qNonManifold:
-            geoContactArea += geoWidth *props.surfaceThickness
-        
-        ### Use center of contact area boundary box as constraints location
-        centerX = (max(bbAMin[0],bbBMin[0]) + min(bbAMax[0],bbBMax[0])) /2
-        centerY = (max(bbAMin[1],bbBMin[1]) + min(bbAMax[1],bbBMax[1])) /2
-        centerZ = (max(bbAMin[2],bbBMin[2]) + min(bbAMax[2],bbBMax[2])) /2
-        
-        center = Vector((centerX, centerY, centerZ))
-        #center = (bbACenter +bbBCenter) /2     # Debug: Place constraints at the center of both elements like in bashi's addon
+    elemGrps = global_vars.elemGrps
 
-        return geoContactArea, geoHeight, geoWidth, center, geoAxis, qVolCorrect
+    if not props.searchDistanceFallback:
+        elemGrps_elemGrpA = elemGrps[elemGrpA]
+        elemGrps_elemGrpB = elemGrps[elemGrpB]
+        Prio_A = elemGrps_elemGrpA[EGSidxPrio]
+        Prio_B = elemGrps_elemGrpB[EGSidxPrio]
+        if Prio_A == Prio_B:  # Priority is the same for both element groups
+            sDistFallb_A = elemGrps_elemGrpA[EGSidxSDFl]
+            sDistFallb_B = elemGrps_elemGrpB[EGSidxSDFl]
+            sDistFallb = sDistFallb_A or sDistFallb_B
+        if Prio_A > Prio_B:  # Priority is higher for A
+            sDistFallb = elemGrps_elemGrpA[EGSidxSDFl]
+        elif Prio_A < Prio_B:  # Priority is higher for B
+            sDistFallb = elemGrps_elemGrpB[EGSidxSDFl]
+    else:
+        sDistFallb = 1
 
-    return 0, 0, 0, Vector((0,0,0)), [1,2,3], 0  # Dummy data, connection will be remove later because of zero area anyway
+    return sDistFallb
 
 ########################################
 
@@ -967,169 +935,208 @@ def calculateContactAreaBasedOnBoundaryBoxesForAll(objs, objsEGrp, connectsPair,
     
     ### Calculate contact area for all connections
     print("Calculating contact area for connections...")
-    
     props = bpy.context.window_manager.bcb
-    elemGrps = global_vars.elemGrps
-
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
     
+    ### Export geometry buffers (used in-process as well as shared with worker processes)
+    geoBufs = exportGeometryBuffers(objs, qAccurate)
+    pairs = np.array(connectsPair, dtype=np.int64).reshape((len(connectsPair), 2))
+    sDistFallbs = np.zeros(len(connectsPair), dtype=np.int8)
+    for k in range(len(connectsPair)):
+        elemGrpA = objsEGrp[pairs[k, 0]]
+        elemGrpB = objsEGrp[pairs[k, 1]]
+        if elemGrpA != -1 and elemGrpB != -1:
+            sDistFallbs[k] = getSearchDistanceFallback(elemGrpA, elemGrpB)
+        else: pairs[k] = -1  # Mark connection to be skipped
+    geoBufs["pairs"] = pairs
+    geoBufs["sDistFallbs"] = sDistFallbs
+    settings = {"searchDistance": props.searchDistance,
+                "searchDistanceMesh": props.searchDistanceMesh,
+                "surfaceForced": props.surfaceForced,
+                "surfaceThickness": props.surfaceThickness,
+                "minimumContactArea": minimumContactArea,
+                "qAccurate": qAccurate}
+
+    ### Use worker processes for large connection counts if enabled
+    connectsGeoArr = None
+    if contactAreaProcesses != 0 and len(connectsPair) >= contactAreaProcessesMinConnections:
+        try: connectsGeoArr, connectsLocArr = calculateContactAreaBasedOnBoundaryBoxesForAllParallel(geoBufs, settings, len(connectsPair))
+        except Exception as e:
+            print("Warning: Parallel contact area calculation failed, continuing with single process...", e)
+    if connectsGeoArr is None:
+        contact_area.setBuffers(geoBufs, settings)
+        try: connectsGeoArr, connectsLocArr = contact_area.calculateContactAreaChunk((0, len(connectsPair)))
+        finally: contact_area.setBuffers({}, {})
+
+    ### Convert back into the list formats used by the builder
     connectsGeo = []
     connectsLoc = []
-    connectsPair_iter = iter(connectsPair)
-    for i in range(len(connectsPair)):
-        pair = next(connectsPair_iter)   
-        objA = objs[pair[0]]
-        objB = objs[pair[1]]
-        elemGrpA = objsEGrp[objsDict[objA]] 
-        elemGrpB = objsEGrp[objsDict[objB]]
-        if elemGrpA != -1 and elemGrpB != -1:
-                        
-            ### Get Search Distance Fallback setting
-            if not props.searchDistanceFallback:
-                elemGrps_elemGrpA = elemGrps[elemGrpA]
-                elemGrps_elemGrpB = elemGrps[elemGrpB]
-                Prio_A = elemGrps_elemGrpA[EGSidxPrio]
-                Prio_B = elemGrps_elemGrpB[EGSidxPrio]
-                if Prio_A == Prio_B:  # Priority is the same for both element groups
-                    sDistFallb_A = elemGrps_elemGrpA[EGSidxSDFl]
-                    sDistFallb_B = elemGrps_elemGrpB[EGSidxSDFl]
-                    sDistFallb = sDistFallb_A or sDistFallb_B
-                if Prio_A > Prio_B:  # Priority is higher for A
-                    sDistFallb = elemGrps_elemGrpA[EGSidxSDFl]
-                elif Prio_A < Prio_B:  # Priority is higher for B
-                    sDistFallb = elemGrps_elemGrpB[EGSidxSDFl]
-            else:
-                sDistFallb = 1
-            
-            ### Check if meshes are water tight (non-manifold)
-            nonManifolds = []
-            for obj in [objA, objB]:
-                bpy.context.scene.objects.active = obj
-                me = obj.data
-                # Find non-manifold elements
-                bm = bmesh.new()
-                bm.from_mesh(me)
-                nonManifolds.extend([i for i, ele in enumerate(bm.edges) if not ele.is_manifold])
-                bm.free()
-
-            ###### Calculate contact area for a single pair of objects
-            geoContactArea, geoHeight, geoWidth, center, geoAxis, qVolCorrect = calculateContactAreaBasedOnBoundaryBoxesForPair(objA, objB, sDistFallb, qAccurate=qAccurate, qNonManifold=len(nonManifolds))
-                        
-            # Geometry array: [area, height, width, axisNormal, axisHeight, axisWidth, qVolCorrect]
-            connectsGeo.append([geoContactArea, geoHeight, geoWidth, geoAxis[0], geoAxis[1], geoAxis[2], qVolCorrect])
-            connectsLoc.append(center)
-
+    for k in range(len(connectsPair)):
+        if pairs[k, 0] != -1:
+            geo = connectsGeoArr[k].tolist()
+            # Geometry array: [area, height, width, axisNormal, axisHeight, axisWidth, qVolCorrect], axis indices are integers
+            connectsGeo.append([geo[0], geo[1], geo[2], int(geo[3]), int(geo[4]), int(geo[5]), int(geo[6])])
+            connectsLoc.append(Vector(connectsLocArr[k]))
         else:
             connectsGeo.append([0, 0, 0, 1,2,3, 0])  # Dummy data, connection will be remove later
             connectsLoc.append(Vector((0,0,0)))
         
     return connectsGeo, connectsLoc
 
+########################################
+
+def exportGeometryBuffers(objs, qAccurate):
+
+    ### Gather geometry of all objects into flat NumPy arrays to be shared with worker processes
+    objCnt = len(objs)
+    geoBufs = {}
+    bbs = np.zeros((objCnt, 6))
+    dims = np.zeros((objCnt, 3))
+    areaTots = np.zeros(objCnt)
+    nonManifolds = np.zeros(objCnt, dtype=np.int8)
+    cosList = []; faceCentersList = []; faceAreasList = []; loopVertsList = []; loopFacesList = []
+    vertCnts = np.zeros(objCnt, dtype=np.int64)
+    faceCnts = np.zeros(objCnt, dtype=np.int64)
+    loopCnts = np.zeros(objCnt, dtype=np.int64)
+    for i in range(objCnt):
+        obj = objs[i]
+        geo = geoCacheGet(obj)
+        if geo["bbMin"] != None:
+            bbs[i, :3] = geo["bbMin"]; bbs[i, 3:] = geo["bbMax"]
+        dims[i] = obj.dimensions
+        areaTots[i] = geo["areaTot"]
+        nonManifolds[i] = geo["qNonManifold"]
+        if qAccurate:
+            cosList.append(geo["cos"])
+            faceCentersList.append(geo["faceCenters"])
+            faceAreasList.append(geo["faceAreas"])
+            loopVertsList.append(geo["loopVerts"])
+            loopFacesList.append(geo["loopFaces"])
+            vertCnts[i] = len(geo["cos"])
+            faceCnts[i] = len(geo["faceAreas"])
+            loopCnts[i] = len(geo["loopVerts"])
+    geoBufs["bbs"] = bbs
+    geoBufs["dims"] = dims
+    geoBufs["areaTots"] = areaTots
+    geoBufs["nonManifolds"] = nonManifolds
+    if qAccurate:
+        geoBufs["cos"] = np.concatenate(cosList)
+        geoBufs["faceCenters"] = np.concatenate(faceCentersList)
+        geoBufs["faceAreas"] = np.concatenate(faceAreasList)
+        geoBufs["loopVerts"] = np.concatenate(loopVertsList)
+        geoBufs["loopFaces"] = np.concatenate(loopFacesList)
+        # Offsets into the flat arrays per object
+        geoBufs["vertOffs"] = np.concatenate(([0], np.cumsum(vertCnts)))
+        geoBufs["faceOffs"] = np.concatenate(([0], np.cumsum(faceCnts)))
+        geoBufs["loopOffs"] = np.concatenate(([0], np.cumsum(loopCnts)))
+    
+    return geoBufs
+
+########################################
+
+def calculateContactAreaBasedOnBoundaryBoxesForAllParallel(geoBufs, settings, connectCnt):
+    
+    ### Calculate contact area for all connections by a pool of worker processes
+    if contactAreaProcesses < 0: processCnt = os.cpu_count()
+    else:                        processCnt = contactAreaProcesses
+    print("Using worker processes:", processCnt)
+
+    ### Copy geometry buffers into shared memory (only once for all workers)
+    sharedBufs = {}
+    for name, arr in geoBufs.items():
+        sharedBufs[name] = contact_area.toShared(arr)
+
+    return contact_area.calculateContactAreaParallel(sharedBufs, settings, connectCnt, processCnt, pythonPath=bpy.app.binary_path_python)
+
 ################################################################################   
 
 def applyDisplacementCorrection(objs, objsEGrp, connectsPair, connectsLoc):
 
     elemGrps = global_vars.elemGrps
 
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
-    
     ### Create group index with their respective objects
-    grpsObjs = {}
-    for elemGrp in elemGrps:
-        grpName = elemGrp[EGSidxName]
-        grpObjs = []
-        for obj in objs:
-            elemGrpIdx = objsEGrp[objsDict[obj]]
-            if elemGrpIdx != -1 and elemGrp == elemGrps[elemGrpIdx]:
-                grpObjs.append(obj)
-        grpsObjs[grpName] = grpObjs
-    
-    vLocDataCnt = 0
+    grpsObjs = createElementGroupObjectLists(objs, objsEGrp)
+    
+    ### Gather elements to correct in the same order as on export
+    objsDCor = []
     for elemGrp in elemGrps:
         grpDCor = elemGrp[EGSidxDCor]
         if grpDCor:
             grpName = elemGrp[EGSidxName]
-            for obj in grpsObjs[grpName]:
-                for vert in obj.data.vertices:
-                    vLocDataCnt += 1
+            objsDCor.extend(grpsObjs[grpName])
+    vertCnts = [len(obj.data.vertices) for obj in objsDCor]
+    vLocDataCnt = sum(vertCnts)
 
     # Import data from file
     if vLocDataCnt:
-        filePath = os.path.join(logPath, "bcb-diff-%d.cfg" %vLocDataCnt)
+        filePath = getDisplCorrectionFilePath([obj.name for obj in objsDCor], vertCnts)
         if os.path.exists(filePath):
             print("Displacement correction vertices: %d" %vLocDataCnt)
             print("Importing displacement correction data from:", filePath)
-            vLocData = dataFromFile(filePath, qPickle=True, qCompressed=True)
+            vLocData = arrayFromFile(filePath)  # Memory-mapped, only slices in use are loaded
             
-            if vLocData != 1 and len(vLocData):
+            if vLocData is not None and len(vLocData) == vLocDataCnt:
 
-                ### Build kd-trees for every object's vertices
-                objsKd = []
-                for obj in objs:
-                    me = obj.data
-                    mat = obj.matrix_world
-                    
-                    kd = mathutils.kdtree.KDTree(len(me.vertices))
-                    for i, v in enumerate(me.vertices):
-                        loc = mat *v.co    # Multiply matrix by vertex coordinates to get global coordinates
-                        kd.insert(loc, i)
-                    kd.balance()
-                    objsKd.append(kd)
-                                    
                 ### Apply differences to the vertices of the input meshes
+                # World space differences are transformed into local space by the inverse rotation & scale of each object
+                objsIdx = {}
+                for k in range(len(objs)): objsIdx[objs[k].name] = k
+                objsCos = {}    # Element index: world coordinates of vertices before correction
+                objsDiffs = {}  # Element index: world differences of vertices
                 vIdx = 0
-                for elemGrp in elemGrps:
-                    grpDCor = elemGrp[EGSidxDCor]
-                    if grpDCor:
-                        grpName = elemGrp[EGSidxName]
-                        for obj in grpsObjs[grpName]:
-                            inv_matrix = obj.matrix_world.inverted()
-                            vIdxLast = vIdx
-                            for vert in obj.data.vertices:
-                                current_world_loc = obj.matrix_world *vert.co
-                                corrected_world_loc = current_world_loc -Vector(vLocData[vIdx])
-                                local_corrected_loc = inv_matrix * corrected_world_loc
-                                vert.co = local_corrected_loc
-                                vIdx += 1
-                            if vIdxLast != vIdx:
-                                obj.select = 1
+                for obj, vertCnt in zip(objsDCor, vertCnts):
+                    if vertCnt == 0: continue
+                    me = obj.data
+                    mat = np.array(obj.matrix_world)
+                    cos = np.empty(vertCnt *3, dtype=np.float32)
+                    me.vertices.foreach_get("co", cos)
+                    cos = cos.reshape((vertCnt, 3)).astype(np.float64)
+                    diffs = np.array(vLocData[vIdx:vIdx +vertCnt], dtype=np.float64)
+                    k = objsIdx[obj.name]
+                    objsCos[k] = np.dot(cos, mat[:3, :3].T) +mat[:3, 3]
+                    objsDiffs[k] = diffs
+                    cos -= np.dot(diffs, np.linalg.inv(mat[:3, :3]).T)
+                    me.vertices.foreach_set("co", cos.astype(np.float32).ravel())
+                    me.update()
+                    obj.select = 1
+                    vIdx += vertCnt
                                 
                 # If changes have been made
                 if vIdx > 0:
                     # Set object centers to geometry origin (again after prepareObjects())
                     bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
+                    # Cached geometry is outdated now
+                    geoCacheInvalidate(objs)
                    
                     ### Apply corrections also on connection locations
-                    connectsPair_iter = iter(connectsPair)
-                    connectsLoc_iter = iter(connectsLoc)
-                    for k in range(len(connectsPair)):
-                        pair = next(connectsPair_iter)   
-                        loc = next(connectsLoc_iter)
-                        objA = objs[pair[0]]
-                        objB = objs[pair[1]]
-                        objKdA = objsKd[pair[0]]
-                        objKdB = objsKd[pair[1]]
-                        
-                        # Find closest vertices via kd-tree in comparison objects A and B
-                        vertAco, vertAidx = objKdA.find(loc)[:2]
-                        vertBco, vertBidx = objKdB.find(loc)[:2]
-                        coClosestAidx = objKdA.find(loc)[0]
-                        coClosestB = objKdB.find(loc)[0]
-                        center = (vertAco +vertBco) /2   # Calculate center of both original vertices
-                        
-                        vertAcoNew = objA.matrix_world *objA.data.vertices[vertAidx].co
-                        vertBcoNew = objB.matrix_world *objB.data.vertices[vertBidx].co
-                        centerNew = (vertAcoNew +vertBcoNew) /2   # Calculate center of both corrected vertices
-                        
-                        # Apply the difference of the closest vertices of both objects to the location of the connection
-                        diff = center -centerNew
-                        connectsLoc[k] = loc -diff
+                    # Locations are shifted by the mean difference of the closest original vertices of both elements
+                    # (elements without correction contribute a zero difference)
+                    connectCnt = len(connectsPair)
+                    locs = np.array([tuple(loc) for loc in connectsLoc], dtype=np.float64).reshape((connectCnt, 3))
+                    locsDiff = np.zeros((connectCnt, 3), dtype=np.float64)
+                    ### Gather connections per corrected element to find all closest vertices at once
+                    objsConnects = {}
+                    for i in range(connectCnt):
+                        pair = connectsPair[i]
+                        for k in pair[:2]:
+                            if k in objsDiffs:
+                                try: objsConnects[k].append(i)
+                                except: objsConnects[k] = [i]
+                    ### Build kd-tree only for corrected elements with connections and query closest vertices
+                    locsList = locs.tolist()
+                    for k, conIdxs in objsConnects.items():
+                        cos = objsCos[k]; diffs = objsDiffs[k]
+                        kd = mathutils.kdtree.KDTree(len(cos))
+                        for idx, co in enumerate(cos.tolist()):
+                            kd.insert(co, idx)
+                        kd.balance()
+                        vertIdxs = [kd.find(locsList[i])[1] for i in conIdxs]
+                        np.add.at(locsDiff, conIdxs, diffs[vertIdxs] /2)
+                    locsNew = (locs -locsDiff).tolist()
+                    for i in range(connectCnt):
+                        connectsLoc[i] = Vector(locsNew[i])
+
+            elif vLocData is not None:
+                print("Error: Displacement correction data doesn't match the model, vertex count:", len(vLocData), vLocDataCnt)
        
     return connectsLoc
        
@@ -1451,147 +1458,34 @@ def createEmptyObjs(scene, constCnt):
     ### Create empty objects
     print("Creating empty objects... (%d)" %constCnt)
 
-    # Use second scene optimization (enabling this is not recommended, as there are limitations in Blender related to RBs on multiple scenes)
-    useSecondScene = 0
-    
-    ### Create first object
+    ### Create first object (rigid body constraint data can only be added by operator)
     objConst = bpy.data.objects.new('Constraint', None)
-    bpy.context.scene.objects.link(objConst)
+    scene.objects.link(objConst)
     objConst.empty_draw_type = 'CUBE'
-    bpy.context.scene.objects.active = objConst
+    scene.objects.active = objConst
     bpy.ops.rigidbody.constraint_add()
-
-    if useSecondScene:
-        constCntPerScene = 1024
-        scenesTemp = []
-    else:
-        constCntPerScene = 0
-    emptyObjsGlobal = [objConst]
-    # Repeat until desired object count is reached
-    while len(emptyObjsGlobal) < constCnt:
-        
-        if useSecondScene:
-            ### Create a second scene to temporarily move objects to, to avoid depsgraph update overhead (optimization)
-            sceneTemp = bpy.data.scenes.new("BCB Temp Scene")
-            scenesTemp.append(sceneTemp)
-            # Set layers to same state as original scene
-            sceneTemp.layers = scene.layers
-            # Switch to original scene (shouldn't be necessary but is required for error free Bullet simulation on later scene switching for some strange reason)
-            bpy.context.screen.scene = scene
-            # Link cameras because in second scene is none and when coming back camera view will losing focus
-            objCameras = []
-            for objTemp in scene.objects:
-                if objTemp.type == 'CAMERA':
-                    sceneTemp.objects.link(objTemp)
-                    objCameras.append(objTemp)
-            # Switch to new scene
-            bpy.context.screen.scene = sceneTemp
-            # If using two scenes make sure both are using the same RigidBodyWorld and RigidBodyConstraints groups
-            if sceneTemp.rigidbody_world == None:
-                bpy.ops.rigidbody.world_add()
-            for grp in bpy.data.groups:
-                if "RigidBodyWorld" == grp.name and not grp.is_library_indirect:
-                    bpy.context.scene.rigidbody_world.group = grp; break
-            for grp in bpy.data.groups:
-                if "RigidBodyConstraints" == grp.name and not grp.is_library_indirect:
-                    bpy.context.scene.rigidbody_world.constraints = grp; break
-            # Link first empty into new scene
-            bpy.context.scene.objects.link(objConst)
-            
-        ### Duplicate empties as long as we got the desired count   
-        emptyObjs = [objConst]
-        while len(emptyObjs) < (constCnt -(len(emptyObjsGlobal) -1)) and (constCntPerScene == 0 or len(emptyObjs) <= constCntPerScene):
-            if constCntPerScene != 0:
-                sys.stdout.write("%d " %len(emptyObjs))
-            else:
-                if len(emptyObjs) <= 1024: sys.stdout.write("%d " %len(emptyObjs))
-                else:                      sys.stdout.write("\r%d - " %len(emptyObjs))
+    # Get constraints group from rigid body world (operator creates it if not existing)
+    grpConsts = scene.rigidbody_world.constraints
+    if grpConsts == None: grpConsts = bpy.data.groups["RigidBodyConstraints"]
+
+    ### Create all other objects as copies of the first one in one batch, the constraint data is copied along (optimization)
+    # This avoids selection based duplication and thereby scene walks and depsgraph updates per operator call
+    emptyObjs = [objConst]
+    sceneObjsLink = scene.objects.link
+    grpConstsLink = grpConsts.objects.link
+    for i in range(1, constCnt):
+        if i %10000 == 0:
+            sys.stdout.write("\r%d - " %i)
             # Update progress bar
-            bpy.context.window_manager.progress_update(len(emptyObjsGlobal) /constCnt)
-            
-            # Deselect all objects
-            bpy.ops.object.select_all(action='DESELECT')
-            # Select empties already in list
-            c = 0
-            for obj in emptyObjs:
-                if c < (constCnt -(len(emptyObjsGlobal) -1)) -len(emptyObjs):
-                    obj.select = 1
-                    c += 1
-                else: break
-            # Duplicate them
-            bpy.ops.object.duplicate(linked=False)
-            # Add duplicates to list again
-            for obj in scene.objects:
-                if obj.select and obj.is_visible(scene):
-                    if obj.type == 'EMPTY':
-                        emptyObjs.append(obj)
-         
-        emptyObjsGlobal.extend(emptyObjs[1:])
-        sys.stdout.write("\r%d - " %len(emptyObjsGlobal))
-        
-    emptyObjs = emptyObjsGlobal
-
-    if useSecondScene:
-        ### Link new object back into original scene
-        for scn in scenesTemp:
-            # Switch through temp scenes
-            bpy.context.screen.scene = scn
-            # Select all objects
-            bpy.ops.object.select_all(action='SELECT')
-            # Link objects to original scene
-            bpy.ops.object.make_links_scene(scene=scene.name)
-            # Remove constraint data (otherwise it would cause undesired side effects later in the simulation)
-            bpy.ops.rigidbody.constraints_remove()
-            # Delete objects from temp scene (required to get rid of the duplicate rigid body world data, which later would have influence on the simulation)
-            bpy.ops.object.delete(use_global=False)
-
-        # Switch back to original scene
-        bpy.context.screen.scene = scene
-        # Delete second scene
-        for scn in scenesTemp:
-            try:    bpy.data.scenes.remove(scn, do_unlink=1)
-            except: bpy.data.scenes.remove(scn)
-        print()
-
-        # Turn empties into constraints (extremely slow but there is no faster way when using temp scenes)
-        print("Turning empties into constraints...")
-        for i in range(len(emptyObjs)):
-            sys.stdout.write("\r%d" %i)
-            obj = emptyObjs[i]
-            bpy.context.scene.objects.active = obj
-            bpy.ops.rigidbody.constraint_add()
+            bpy.context.window_manager.progress_update(i /constCnt)
+        obj = objConst.copy()
+        sceneObjsLink(obj)
+        grpConstsLink(obj)  # Copies are not automatically added to groups
+        emptyObjs.append(obj)
+    sys.stdout.write("\r%d - " %len(emptyObjs))
     print()
     
-#    ### Sort empty objects by database order (old slower code)
-#    objsSorted = []
-#    #for objDB in bpy.data.objects:  # Sort by bpy.data order
-#    for objDB in bpy.data.groups["RigidBodyConstraints"].objects:  # Sort by RigidBodyConstraints group order
-#        for obj in emptyObjs:
-#            if obj.name == objDB.name:
-#                objsSorted.append(obj)
-#                del emptyObjs[emptyObjs.index(obj)]
-#                break
-    ### Sort empty objects by database order
-    objsSource = emptyObjs
-    objsDB = bpy.data.groups["RigidBodyConstraints"].objects
-    # Generate dictionary index by DB order
-    objsIndex = {}
-    for i in range(len(objsDB)): objsIndex[objsDB[i].name] = i
-    # Sort objects by index
-    objsSorted = [None for i in range(len(objsDB))]
-    for obj in objsSource:
-        objsSorted[objsIndex[obj.name]] = obj
-    # Filter unused objects
-    objsSortedFiltered = []
-    for obj in objsSorted:
-        if obj != None: objsSortedFiltered.append(obj)
-#    print("EMPTIES (original, DB):")
-#    for i in range(len(objsSource)):
-#        obj = objsSource[i]
-#        objSorted = objsSortedFiltered[i]
-#        print(obj.name, objSorted.name)
-    emptyObjs = objsSortedFiltered
-    
+    ### Empties are linked to the RigidBodyConstraints group in creation order, so the list is already in DB order
     return emptyObjs        
 
 ################################################################################   
@@ -1602,130 +1496,225 @@ def bundlingEmptyObjsToClusters(connectsLoc, connectsConsts):
     print("Bundling close empties into clusters...")
     
     props = bpy.context.window_manager.bcb
+    radius = props.clusterRadius
+    connectCnt = len(connectsLoc)
+    if connectCnt == 0: return
+    
+    locs = np.array([tuple(loc) for loc in connectsLoc]).reshape((connectCnt, 3))
+    ### Union-find data, every constraint starts as its own cluster
+    clustersParent = np.arange(connectCnt)  # Stores parent cluster index per cluster (root if it references itself)
+    clustersSum = locs.copy()               # Stores sum of all member locations per root cluster for incremental centroid
+    clustersCnt = np.ones(connectCnt)       # Stores member count per root cluster
+    roots = np.arange(connectCnt)           # Stores indices of all root clusters
+    # Neighbor cell offsets for the voxel hash (cell size equals cluster radius, so all candidates are within adjacent cells)
+    cellOffsets = [(x, y, z) for x in (-1,0,1) for y in (-1,0,1) for z in (-1,0,1)]
+    
     m = 1
-    qChanged = 1
-    while qChanged:   # Repeat until no more constraints are moved
-        qChanged = 0
+    while len(roots) > 1:   # Repeat until no more clusters are merged
         
+        if m > clusterPassesMax:
+            print("\nWarning: Maximum number of clustering passes reached (%d), clusters may be incomplete." %clusterPassesMax)
+            break
         sys.stdout.write('\r' +"Pass %d" %m)
         # Update progress bar
-        bpy.context.window_manager.progress_update(1 -(1 /m))
+        bpy.context.window_manager.progress_update(m /clusterPassesMax)
         m += 1
         
-        ### Build kd-tree for constraint locations
-        kdObjs = mathutils.kdtree.KDTree(len(connectsLoc))
-        for i, loc in enumerate(connectsLoc):
-            kdObjs.insert(loc, i)
-        kdObjs.balance()
+        ### Build voxel hash for cluster centroids
+        centroids = clustersSum[roots] /clustersCnt[roots, None]
+        cells = np.floor(centroids /radius).astype(np.int64).tolist()
+        grid = {}
+        for i, cell in enumerate(cells):
+            cell = tuple(cell)
+            if cell in grid: grid[cell].append(i)
+            else:            grid[cell] = [i]
         
-        clustersConnects = []  # Stores all constraints indices per cluster
-        clustersLoc = []       # Stores the location of each cluster
-        for i in range(len(connectsLoc)):
-            
-            ### Find closest connection location via kd-tree (zero distance start item included)
-            co_find = connectsLoc[i]
-            aIndex = []; aCo = []  #; aDist = [];
-            j = 0
-            for (co, index, dist) in kdObjs.find_range(co_find, props.clusterRadius):   # Find constraint object within search range
-                if j == 0 or co != lastCo:   # Skip constraints that already share the same location (caused by earlier loops)
-                    aIndex.append(index); aCo.append(co)#; aDist.append(dist)
-                    lastCo = co
-                    # Stop after second different constraint is found
-                    j += 1
-                    if j == 2: qChanged = 1; break
-                        
-            ### Calculate average location of the two constraints found within cluster radius
-            ### We merge them pairwise instead of all at once for improved and more even distribution
-            if len(aCo) == 2:
-                loc = (aCo[0] +aCo[1]) /2
-                clustersLoc.append(loc)
-                clustersConnects.append([aIndex[0], aIndex[1]])
-                ### Also move all other constraints with the same locations because we can assume they already have been merged earlier
-                for i in range(len(connectsLoc)):
-                    if aCo[0] == connectsLoc[i] or aCo[1] == connectsLoc[i]:
-                        clustersConnects[-1:][0].append(i)
-                  
-        ### Apply cluster locations to constraints
-        for l in range(len(clustersConnects)):
-            for k in clustersConnects[l]:
-                connectsLoc[k] = clustersLoc[l]
+        ### Find closest other cluster within cluster radius for every cluster
+        nearest = np.full(len(roots), -1, dtype=np.int64)
+        nearestDist = np.full(len(roots), np.inf)
+        for cell, idxsCell in grid.items():
+            cand = []
+            for offset in cellOffsets:
+                try: cand.extend(grid[(cell[0] +offset[0], cell[1] +offset[1], cell[2] +offset[2])])
+                except: pass
+            idxsCell = np.array(idxsCell); cand = np.array(cand)
+            # Compare in chunks of rows to keep the size of the distance matrix bounded
+            chunkSize = max(1, clusterChunkSize //len(cand))
+            for start in range(0, len(idxsCell), chunkSize):
+                idxs = idxsCell[start:start +chunkSize]
+                dists = np.sqrt(((centroids[idxs, None, :] -centroids[None, cand, :]) **2).sum(axis=2))
+                dists[idxs[:, None] == cand[None, :]] = np.inf  # Skip same cluster
+                j = np.argmin(dists, axis=1)
+                dist = dists[np.arange(len(idxs)), j]
+                qWithin = dist <= radius
+                nearest[idxs[qWithin]] = cand[j[qWithin]]
+                nearestDist[idxs[qWithin]] = dist[qWithin]
+        
+        ### Merge all closest cluster pairs which don't share a cluster within this pass, closest first
+        # Pairwise merging instead of all at once leads to an improved and more even distribution
+        idxs = np.nonzero(nearest >= 0)[0]
+        if len(idxs) == 0: break
+        idxs = idxs[np.argsort(nearestDist[idxs], kind='mergesort')]
+        qUsed = np.zeros(len(roots), dtype=bool)
+        mergeA = []; mergeB = []
+        for i, j in zip(idxs.tolist(), nearest[idxs].tolist()):
+            if not qUsed[i] and not qUsed[j]:
+                qUsed[i] = qUsed[j] = 1
+                mergeA.append(i); mergeB.append(j)
+        mergeA = np.array(mergeA, dtype=np.int64); mergeB = np.array(mergeB, dtype=np.int64)
+        rootsA = roots[mergeA]; rootsB = roots[mergeB]
+        clustersParent[rootsB] = rootsA
+        clustersSum[rootsA] += clustersSum[rootsB]
+        clustersCnt[rootsA] += clustersCnt[rootsB]
+        roots = roots[clustersParent[roots] == roots]
     
     print()
     
-    ### Count clusters (only for status print)
-    clusters = set()
-    for loc in connectsLoc:
-        clusters.add(tuple(loc))
-    print("Cluster count:", len(clusters))
+    ### Resolve cluster membership for all constraints (path compression)
+    while True:
+        clustersParentNew = clustersParent[clustersParent]
+        if np.array_equal(clustersParentNew, clustersParent): break
+        clustersParent = clustersParentNew
+    
+    ### Apply cluster locations to constraints
+    clustersLoc = clustersSum /clustersCnt[:, None]
+    for k, loc in enumerate(clustersLoc[clustersParent].tolist()):
+        connectsLoc[k] = Vector(loc)
+    
+    print("Cluster count:", len(roots))
 
 ################################################################################
 
-def createParentsIfRequired(scene, objs, objsEGrp, childObjs):
+def rebuildChangedConnections(scene, objs, objsEGrp, emptyObjs, childObjs, connectsPair, connectsPairParent, connectsLoc, connectsGeo, connectsConsts, constsConnect):
+
+    ### Incremental rebuilding of connections and constraints only for elements modified since the last build
+    # Returns None if nothing has to be done, otherwise the updated build data
+    props = bpy.context.window_manager.bcb
+    elemGrps = global_vars.elemGrps
+
+    changed = getChangedElementsFromScene(scene, objs)
+    if changed == None or len(changed) == 0: return None
+    print("Modified elements found:", len(changed))
+
+    ### Check for features which modify elements or connections globally, these require a full rebuild
+    qDCor = 0
+    for elemGrp in elemGrps:
+        if elemGrp[EGSidxDCor]: qDCor = 1
+    if props.rebarMesh or len(childObjs) or len(connectsPairParent) or props.minimumElementSize \
+    or props.clusterRadius > 0 or props.connectionCountLimit or qDCor or None in emptyObjs:
+        print("Warning: Incremental rebuilding not possible with current settings, clear and build again to apply the geometry changes.")
+        return None
+    
+    print("Rebuilding connections of modified elements...")
+    changedSet = set(changed)
+
+    ###### Prepare modified elements the same way as on building
+    prepareObjects([objs[k] for k in changed])
+    
+    ###### Keep connections between unmodified elements as they are (their contact geometry can't have changed)
+    keptIdxs = [i for i in range(len(connectsPair)) if connectsPair[i][0] not in changedSet and connectsPair[i][1] not in changedSet]
+
+    ###### Search connections only within the boundary boxes of modified elements (neighbours included)
+    connectsPairNew, connectsPairDist = findConnectionsByBoundaryBoxIntersectionForElements(objs, changed)
+    ### Calculate contact area only with the elements involved in these connections (remapped to a sub list)
+    objsIdxs = sorted(set([k for pair in connectsPairNew for k in pair]))
+    objsIdxsMap = {k: i for i, k in enumerate(objsIdxs)}
+    objsSub = [objs[k] for k in objsIdxs]
+    objsEGrpSub = [objsEGrp[k] for k in objsIdxs]
+    connectsPairSub = [[objsIdxsMap[pair[0]], objsIdxsMap[pair[1]]] for pair in connectsPairNew]
+    connectsGeoNew, connectsLocNew = calculateContactAreaBasedOnBoundaryBoxesForAll(objsSub, objsEGrpSub, connectsPairSub, qAccurate=props.useAccurateArea)
+    connectsPairNew, connectsGeoNew, connectsLocNew = deleteConnectionsWithZeroContactArea(objs, objsEGrp, connectsPairNew, connectsGeoNew, connectsLocNew)
+    ### Delete connections with references from predefined constraints (all constraints in scene which are not part of the BCB data)
+    emptyObjsNames = set([obj.name for obj in emptyObjs])
+    emptyObjsPredef = [obj for obj in scene.objects if obj.type == 'EMPTY' and obj.rigid_body_constraint != None and obj.name not in emptyObjsNames]
+    connectsPairNew, connectsGeoNew, connectsLocNew = deleteConnectionsWithReferences(objs, emptyObjsPredef, connectsPairNew, connectsGeoNew, connectsLocNew)
+
+    ###### Merge kept and new connections and create connection data for all of them
+    connectsPairAll = [[connectsPair[i][0], connectsPair[i][1]] for i in keptIdxs] +[[pair[0], pair[1]] for pair in connectsPairNew]
+    connectsLocAll = [list(connectsLoc[i]) for i in keptIdxs] +[list(loc) for loc in connectsLocNew]
+    connectsGeoAll = [list(connectsGeo[i]) for i in keptIdxs] +[list(geo) for geo in connectsGeoNew]
+    connectsConstsAll, constsConnectAll = createConnectionData(objs, objsEGrp, connectsPairAll, connectsLocAll, connectsGeoAll)
+
+    ### Reuse constraint empties of kept connections (if constraint count is still the same)
+    emptyObjsAll = [None for i in range(len(constsConnectAll))]
+    emptyObjsUsed = set()
+    for i in range(len(keptIdxs)):
+        constsOld = connectsConsts[keptIdxs[i]]
+        constsNew = connectsConstsAll[i]
+        if len(constsOld) == len(constsNew):
+            for cOld, cNew in zip(constsOld, constsNew):
+                emptyObjsAll[cNew] = emptyObjs[cOld]
+                emptyObjsUsed.add(cOld)
+
+    ### Create empties for new constraints
+    idxsNew = [c for c in range(len(emptyObjsAll)) if emptyObjsAll[c] == None]
+    if len(idxsNew):
+        if len(emptyObjs): layersBak = backupLayerSettingsAndActivateNextLayerWithObj(scene, emptyObjs[0])
+        else:              layersBak = backupLayerSettingsAndActivateNextEmptyLayer(scene)
+        emptyObjsNew = createEmptyObjs(scene, len(idxsNew))
+        scene.layers = [bool(q) for q in layersBak]  # Convert array into boolean (required by layers)
+        for c, obj in zip(idxsNew, emptyObjsNew):
+            emptyObjsAll[c] = obj
+
+    ### Delete empties which are not in use anymore
+    emptyObjsUnused = [emptyObjs[c] for c in range(len(emptyObjs)) if c not in emptyObjsUsed]
+    for obj in emptyObjsUnused:
+        try: bpy.data.objects.remove(obj, do_unlink=True)
+        except: scene.objects.unlink(obj)
+    # Removed objects can be replaced by new ones with the same object count, so cached name maps are outdated
+    if len(emptyObjsUnused): objResolverInvalidate()
+
+    print("Connections kept: %d, rebuilt: %d | Constraints reused: %d, created: %d, deleted: %d" \
+          %(len(keptIdxs), len(connectsPairNew), len(emptyObjsUsed), len(idxsNew), len(emptyObjsUnused)))
+
+    ###### Store new fingerprints so that the modified elements count as unmodified from now on
+    storeElementFingerprintsInScene(scene, objs)
+
+    return emptyObjsAll, connectsPairAll, connectsLocAll, connectsGeoAll, connectsConstsAll, constsConnectAll
+
+################################################################################
+
+def createParentsIfRequired(scene, objs, objsEGrp, childObjs, objsIdx):
 
     ### Create parents if required
     print("Creating invisible parent / visible child elements...")
     
     elemGrps = global_vars.elemGrps
 
-    ### Store selection
-    selectionOld = []
-    for k in range(len(objs)):
-        if objs[k].select:
-            selectionOld.append(k)
-                
-    ### Selecting objects without parent
-    q = 0
-    for k in range(len(objs)):
+    ### Create visible children as copies of the given elements which become the invisible parents (collision objects)
+    # Copies are created directly from data instead of duplicating the selection to avoid operator overhead
+    childObjsNew = []
+    for k in objsIdx:
         obj = objs[k]
         elemGrp = objsEGrp[k]
-        if elemGrp != -1:
-            facing = elemGrps[elemGrp][EGSidxFacg]
-            if facing:
-                q = 1
-                if obj.select:
-                    if not "bcb_child" in obj.keys():
-                        obj["bcb_parent"] = obj.name
-                    else: obj.select = 0
-            else: obj.select = 0
-        else: obj.select = 0
-        
-    if q:
-        # Duplicate selected objects            
-        bpy.ops.object.duplicate(linked=False)
-        ### Add newly created objects to parent object list and make them actual parents
-        childObjsNew = []
-        for obj in scene.objects:
-            if obj.select:
-                childObjsNew.append(obj)
-                obj.select = 0
-        childObjs.extend(childObjsNew)
+        if elemGrp != -1 and elemGrps[elemGrp][EGSidxFacg] and not "bcb_child" in obj.keys():
+            childObj = obj.copy()
+            childObj.data = obj.data.copy()
+            scene.objects.link(childObj)
+            for grp in obj.users_group:
+                grp.objects.link(childObj)
+            childObj["bcb_parent"] = obj.name
+            obj["bcb_child"] = childObj.name
+            ### Make parent (same as parent_set without keeping transform)
+            childObj.parent = obj
+            childObj.matrix_parent_inverse = obj.matrix_world.inverted()
+            childObjsNew.append(childObj)
+    childObjs.extend(childObjsNew)
         
-        ### Make parent relationship
-        for k in range(len(childObjsNew)):
-            sys.stdout.write('\r' +"%d" %k)
-            
-            childObj = childObjsNew[k]
-            parentObj = scene.objects[childObj["bcb_parent"]]
-            del parentObj["bcb_parent"]
-            parentObj["bcb_child"] = childObj.name
-            ### Make parent
-            parentObj.select = 1
+    ### Remove child objects from rigid body world (should not be simulated anymore)
+    if len(childObjsNew):
+        ### Store selection
+        selectionOld = [obj for obj in scene.objects if obj.select]
+        # Deselect all objects
+        bpy.ops.object.select_all(action='DESELECT')
+        for childObj in childObjsNew:
             childObj.select = 1
-            bpy.context.scene.objects.active = parentObj
-            bpy.ops.object.parent_set(type='OBJECT', keep_transform=False)
-            parentObj.select = 0
-            childObj.select = 0
-            if len(childObjsNew) > 0: print()
-        ### Remove child object from rigid body world (should not be simulated anymore)
-        for k in range(len(childObjsNew)):
-            childObjsNew[k].select
         bpy.ops.rigidbody.objects_remove()
-        
-    # Deselect all objects
-    bpy.ops.object.select_all(action='DESELECT')
-    ### Revert back to original selection
-    for idx in selectionOld:
-        objs[idx].select = 1       
+        # Deselect all objects
+        bpy.ops.object.select_all(action='DESELECT')
+        ### Revert back to original selection
+        for obj in selectionOld:
+            obj.select = 1       
         
 ################################################################################
 
@@ -1739,28 +1728,29 @@ def applyScale(scene, objs, objsEGrp, childObjs):
     # Deselect all objects
     bpy.ops.object.select_all(action='DESELECT')
     
-    obj = None
     ### Select objects in question
+    objsIdx = []
     for k in range(len(objs)):
         elemGrp = objsEGrp[k]
         if elemGrp != -1:
             scale = elemGrps[elemGrp][EGSidxScal]
             if scale != 0 and scale != 1:
-                obj = objs[k]
-                obj.select = 1
+                objsIdx.append(k)
+                objs[k].select = 1
     
-    if obj != None:
+    if len(objsIdx):
         ###### Create parents if required
-        createParentsIfRequired(scene, objs, objsEGrp, childObjs)
+        createParentsIfRequired(scene, objs, objsEGrp, childObjs, objsIdx)
         ### Apply scale
-        for k in range(len(objs)):
+        for k in objsIdx:
             obj = objs[k]
-            if obj.select:
-                scale = elemGrps[objsEGrp[k]][EGSidxScal]
-                obj.scale *= scale
-                # For children invert scaling to compensate for indirect scaling through parenting
-                if "bcb_child" in obj.keys():
-                    scene.objects[obj["bcb_child"]].scale /= scale
+            scale = elemGrps[objsEGrp[k]][EGSidxScal]
+            obj.scale *= scale
+            # For children invert scaling to compensate for indirect scaling through parenting
+            if "bcb_child" in obj.keys():
+                scene.objects[obj["bcb_child"]].scale /= scale
+        # Cached geometry is outdated now
+        geoCacheInvalidate(objs)
                     
 ################################################################################   
 
@@ -1774,37 +1764,77 @@ def applyBevel(scene, objs, objsEGrp, childObjs):
     # Deselect all objects
     bpy.ops.object.select_all(action='DESELECT')
     
-    obj = None
     ### Select objects in question
+    objsIdx = []
     for k in range(len(objs)):
         elemGrp = objsEGrp[k]
         if elemGrp != -1:
             qBevel = elemGrps[elemGrp][EGSidxBevl]
             if qBevel:
-                obj = objs[k]
-                obj.select = 1
+                objsIdx.append(k)
+                objs[k].select = 1
     
-    ### Add only one bevel modifier and copy that to the other selected objects (Todo: Should be done for each object individually but is slower)
-    if obj != None:
+    if len(objsIdx):
         ###### Create parents if required
-        createParentsIfRequired(scene, objs, objsEGrp, childObjs)
-        ### Apply bevel
-        bpy.context.scene.objects.active = obj
-        if "Bevel_bcb" not in obj.modifiers:
-            bpy.ops.object.modifier_add(type='BEVEL')
-            obj.modifiers["Bevel"].name = "Bevel_bcb"
-            obj.modifiers["Bevel_bcb"].width = 10.0
-            bpy.ops.object.make_links_data(type='MODIFIERS')
-    
-    ### Make modifiers real (required to be taken into account by Bullet physics)
-    for k in range(len(objs)):
-        obj = objs[k]
-        if obj.select:
-            bpy.context.scene.objects.active = obj
-            bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Bevel_bcb")
+        createParentsIfRequired(scene, objs, objsEGrp, childObjs, objsIdx)
+        ### Apply bevel directly on mesh data (same result as an applied bevel modifier with default settings and a width of 10)
+        for i in range(len(objsIdx)):
+            if i %500 == 0: sys.stdout.write('\r' +"%d" %i)
+            me = objs[objsIdx[i]].data
+            bm = bmesh.new()
+            bm.from_mesh(me)
+            bmesh.ops.bevel(bm, geom=bm.verts[:] +bm.edges[:], offset=10.0, segments=1, profile=0.5, clamp_overlap=True, loop_slide=True)
+            bm.to_mesh(me)
+            bm.free()
+            me.update()
+        print()
+        # Cached geometry is outdated now
+        geoCacheInvalidate(objs)
        
 ################################################################################   
 
+### Rigid body settings copied from parents to children and back (same as bpy.ops.rigidbody.object_settings_copy())
+rigidBodySettingsAttribs = ("type", "kinematic", "enabled", "collision_shape", "mass", "friction", "restitution",
+    "use_margin", "collision_margin", "linear_damping", "angular_damping", "use_deactivation", "use_start_deactivated",
+    "deactivate_linear_velocity", "deactivate_angular_velocity", "collision_groups", "mesh_source", "use_deform")
+
+def copyRigidBodySettings(objSrc, objDst):
+
+    ### Copy rigid body settings by attribute (no operator and selection changes needed)
+    rbSrc = objSrc.rigid_body; rbDst = objDst.rigid_body
+    for attr in rigidBodySettingsAttribs:
+        try: setattr(rbDst, attr, getattr(rbSrc, attr))
+        except: pass  # Attribute not available in this Blender version
+
+########################################
+
+def calculateRigidBodyVolume(obj, scale):
+
+    ### Calculate volume the same way Blender does for its mass calculation depending on the collision shape
+    # Element scaling is reverted by dividing through the scale factor
+    dims = obj.dimensions /scale
+    shape = obj.rigid_body.collision_shape
+    if shape == 'CONVEX_HULL' or shape == 'MESH':
+        if obj.type == 'MESH':
+            geo = geoCacheGet(obj)
+            volumeScale = abs(np.linalg.det(np.array(obj.matrix_world)[:3, :3]))
+            return geo["volume"] *volumeScale /scale**3
+        else: return dims[0] *dims[1] *dims[2]
+    elif shape == 'BOX':
+        return dims[0] *dims[1] *dims[2]
+    elif shape == 'SPHERE':
+        radius = max(dims) /2
+        return 4 /3 *math.pi *radius**3
+    elif shape == 'CAPSULE' or shape == 'CYLINDER':
+        radius = max(dims[0], dims[1]) /2
+        return math.pi *radius**2 *dims[2]
+    elif shape == 'CONE':
+        radius = max(dims[0], dims[1]) /2
+        return math.pi /3 *radius**2 *dims[2]
+    return 0
+
+################################################################################   
+
 def calculateMass(scene, objs, objsEGrp, childObjs):
     
     ### Calculate a mass for all mesh objects according to element groups settings
@@ -1813,166 +1843,119 @@ def calculateMass(scene, objs, objsEGrp, childObjs):
     props = bpy.context.window_manager.bcb
     elemGrps = global_vars.elemGrps
 
-    ### Prepare objects index lookup dictionary for faster access
-    objsIndex = {}
-    for k in range(len(objs)):
-        objsIndex[objs[k].name] = k
-
+    ### Create new rigid body settings for children with the data from its parent (so mass can be calculated on children)
+    childParents = []
     # Deselect all objects
     bpy.ops.object.select_all(action='DESELECT')
-
-    ### Find non-manifold meshes (not suited for volume based mass calculation)
-    objsNonMan = []
-    if props.surfaceThickness:
-        objsAll = objs
-        objsAll.extend(childObjs)
-        for obj in objsAll:
-            bpy.context.scene.objects.active = obj
-            me = obj.data
-            # Find non-manifold elements
-            bm = bmesh.new()
-            bm.from_mesh(me)
-            nonManifolds = [i for i, ele in enumerate(bm.edges) if not ele.is_manifold]
-            bm.free()
-            if len(nonManifolds): objsNonMan.append(obj)
-        print("Non-manifold elements found:", len(objsNonMan))
-
-    ### Create new rigid body settings for children with the data from its parent (so mass can be calculated on children)
-    i = 0
     for childObj in childObjs:
         parentObj = scene.objects[childObj["bcb_parent"]]
         if parentObj.rigid_body != None:
-            sys.stdout.write('\r' +"%d  " %i)
-            i += 1
-            
-            bpy.context.scene.objects.active = childObj
-            bpy.ops.rigidbody.object_add()
-            parentObj.select = 1
+            childParents.append([childObj, parentObj])
             childObj.select = 1
-            bpy.context.scene.objects.active = parentObj
-            bpy.ops.rigidbody.object_settings_copy()
-            parentObj.select = 0
-            childObj.select = 0
-    if len(childObjs) > 0: sys.stdout.write('\r        ')
+    if len(childParents):
+        # Add all rigid bodies at once
+        bpy.ops.rigidbody.objects_add()
+        for childObj, parentObj in childParents:
+            copyRigidBodySettings(parentObj, childObj)
+    # Deselect all objects
+    bpy.ops.object.select_all(action='DESELECT')
 
     ### Update masses
-    
-    objsTotal = []; objsScale = []
+    cntNonMan = 0
     for j in range(len(elemGrps)):
         elemGrp = elemGrps[j]
-        
-        # Deselect all objects
-        bpy.ops.object.select_all(action='DESELECT')
-        
+        CT = elemGrp[EGSidxCTyp]
+        try: scale = elemGrp[EGSidxScal]  # Try in case elemGrps is from an old BCB version
+        except: scale = 1
+        if scale == 0: scale = 1
+
+        ### Find out density of the element group
+        materialPreset = elemGrp[EGSidxMatP]
+        materialDensity = elemGrp[EGSidxDens]
+        qDensity = 1
+        if CT != 0 and not materialDensity:
+            if materialPreset != "":
+                try: materialDensity = materialPresets[materialPreset]
+                except:
+                    print("Warning: Density of 0 set and material preset not found for '%s', can't compute mass and leaving it as is." %elemGrp[EGSidxName])
+                    qDensity = 0
+            else:
+                print("Warning: Density of 0 set and no material preset defined for '%s', can't compute mass and leaving it as is." %elemGrp[EGSidxName])
+                qDensity = 0
+
         objsSelected = []
+        objsSurface = []  # Objects qualifying for mass based on surface area * thickness
         for k in range(len(objs)):
             if objsEGrp[k] == j:  # If object is in current element group
                 obj = objs[k]
                 if obj != None and obj.rigid_body != None:
-                    CT = elemGrps[j][EGSidxCTyp]
                     if CT == 0:
                         # The foundation buffer objects need a large mass so they won't pushed away
-                        materialDensity = elemGrp[EGSidxDens]
                         if materialDensity > 1: obj.rigid_body.mass = materialDensity
                         else: obj.rigid_body.mass = 1000  # Backward compatibility for older settings
                     else:
-                        try: scale = elemGrps[j][EGSidxScal]  # Try in case elemGrps is from an old BCB version
-                        except: qScale = 0
-                        else: qScale = 1
-                        if obj != None:
-                            if "bcb_child" in obj.keys():
-                                obj = scene.objects[obj["bcb_child"]]
-                            obj.select = 1
-                            objsSelected.append(obj)
-                            # Temporarily revert element scaling for mass calculation
-                            if qScale:
-                                if scale != 0 and scale != 1:
-                                    obj.scale /= scale
-                                    objsTotal.append(obj)
-                                    objsScale.append(scale)
-
-        ### Calculating and applying material masses based on volume
-        materialPreset = elemGrp[EGSidxMatP]
-        materialDensity = elemGrp[EGSidxDens]
-        if not materialDensity:
-            if materialPreset != "":
-                try: bpy.ops.rigidbody.mass_calculate(material=materialPreset)
-                except: print("Warning: Density of 0 set and material preset not found for '%s', can't compute mass and leaving it as is." %elemGrp[EGSidxName])
-            else: print("Warning: Density of 0 set and no material preset defined for '%s', can't compute mass and leaving it as is." %elemGrp[EGSidxName])
-        else: bpy.ops.rigidbody.mass_calculate(material="Custom", density=materialDensity)
-
-        ### Calculating and applying material masses based on surface area * thickness
-        if (props.surfaceForced and props.surfaceThickness) or (props.surfaceThickness and len(objsNonMan)):
-            if materialDensity:
-                if props.surfaceForced: objsNonMan = objs
-
-                objsNonManSelected = []
-                for n in range(len(objsNonMan)):
-                    obj = objsNonMan[n]
-                    k = objsIndex[obj.name]
-                    if objsEGrp[k] == j:  # If object is in current element group
-                        # Calculate object surface area and volume
-                        me = obj.data
-                        area = sum(f.area for f in me.polygons)
-                        volume = area *props.surfaceThickness
-                        # Calculate mass
-                        obj.rigid_body.mass = volume *materialDensity
-                        objsNonManSelected.append(obj)
+                        # Surface thickness is only used for an explicitly set density and not for elements replaced by children
+                        objsSurface.append(elemGrp[EGSidxDens] and "bcb_child" not in obj.keys())
+                        if "bcb_child" in obj.keys():
+                            obj = scene.objects[obj["bcb_child"]]
+                        objsSelected.append(obj)
+        objsCnt = len(objsSelected)
+        if objsCnt == 0: continue
+
+        ### Calculating material masses based on volume (and surface area * thickness for non-manifold meshes)
+        if qDensity:
+            masses = np.empty(objsCnt, dtype=np.float64)
+            for i in range(objsCnt):
+                obj = objsSelected[i]
+                if props.surfaceThickness and objsSurface[i] and obj.type == 'MESH':
+                    geo = geoCacheGet(obj)
+                    if props.surfaceForced or geo["qNonManifold"]:
+                        if not props.surfaceForced: cntNonMan += 1
+                        masses[i] = geo["areaTot"] *props.surfaceThickness *materialDensity
+                        continue
+                masses[i] = calculateRigidBodyVolume(obj, scale) *materialDensity
+        else:
+            masses = np.array([obj.rigid_body.mass for obj in objsSelected], dtype=np.float64)
                                                 
         ### Adding live load to masses
         liveLoad = elemGrp[EGSidxLoad]
-        for obj in objsSelected:
-            dims = obj.dimensions
-            floorArea = dims[0] *dims[1]  # Simple approximation by assuming rectangular floor area (x *y)
-            if liveLoad > 0: obj.rigid_body.mass += floorArea *liveLoad
-            obj["Floor Area"] = floorArea  # Only needed for the diagnostic prints below
+        floorAreas = np.array([obj.dimensions[0] *obj.dimensions[1] for obj in objsSelected], dtype=np.float64)  # Simple approximation by assuming rectangular floor area (x *y)
+        if liveLoad > 0: masses += floorAreas *liveLoad
 
         ### Balance masses
         balanceFac = elemGrp[EGSidxBlnc]
-        if balanceFac > 0 and len(objsSelected):
-            massGrp = 0
-            for obj in objsSelected:
-                massGrp += obj.rigid_body.mass
-            massGrp /= len(objsSelected)
-            for obj in objsSelected:
-                obj.rigid_body.mass = ((1 -balanceFac) *obj.rigid_body.mass) +(balanceFac *massGrp)
+        if balanceFac > 0:
+            masses = ((1 -balanceFac) *masses) +(balanceFac *masses.mean())
         
-        ### Setting friction if we are at it already (could be separate function but not because of 3 lines)
+        ### Write masses and set friction if we are at it already (could be separate function but not because of 2 lines)
         friction = elemGrp[EGSidxFric]
-        for obj in objsSelected:
+        masses = masses.tolist(); floorAreas = floorAreas.tolist()
+        for i in range(objsCnt):
+            obj = objsSelected[i]
+            obj.rigid_body.mass = masses[i]
             obj.rigid_body.friction = friction
-            
-    # Deselect all objects
-    bpy.ops.object.select_all(action='DESELECT')
-
-    ### Reapply element scaling after mass calculation
-    for k in range(len(objsTotal)):
-        obj = objsTotal[k]
-        scale = objsScale[k]
-        obj.scale *= scale
+            obj["Floor Area"] = floorAreas[i]  # Only needed for the diagnostic prints below
+    if props.surfaceThickness: print("Non-manifold elements found:", cntNonMan)
     
     ### Calculate total and element group masses for diagnostic purposes
     print()
+    objsActive = set([obj.name for obj in objs if obj != None and obj.rigid_body != None and obj.rigid_body.type == 'ACTIVE'])
     groupsMass = {}; groupsArea = {}
-    for obj in objs:
-        if obj != None and obj.rigid_body != None and obj.rigid_body.type == 'ACTIVE':
-            for group in bpy.data.groups:
-                try: obj = group.objects[obj.name]
+    for group in bpy.data.groups:
+        mass = 0; area = 0; qFound = 0
+        for obj in group.objects:
+            if obj.name in objsActive:
+                qFound = 1
+                try: mass += obj.rigid_body.mass
                 except: pass
-                else:
-                    try: groupsMass[group.name] += obj.rigid_body.mass
-                    except:
-                        try: groupsMass[group.name] = obj.rigid_body.mass
-                        except: pass
-                    try: groupsArea[group.name] += obj["Floor Area"]
-                    except:
-                        try: groupsArea[group.name] = obj["Floor Area"]
-                        except: pass
+                try: area += obj["Floor Area"]
+                except: pass
+        if qFound:
+            groupsMass[group.name] = mass
+            groupsArea[group.name] = area
     for groupName in sorted(groupsMass.keys()):
-        try: mass = groupsMass[groupName]
-        except: mass = 0
-        try: area = groupsArea[groupName]
-        except: area = 0
+        mass = groupsMass[groupName]
+        area = groupsArea[groupName]
         #if mass != groupsMass["RigidBodyWorld"]:  # Filter all groups that contain the complete structure
         print("Group '%s' mass: %0.0f t and %0.0f kg / Floor area: %0.2f m^2" %(groupName, floor(mass/1000), floor(mass)%1000, area))
     try: mass = groupsMass["RigidBodyWorld"]
@@ -1983,26 +1966,14 @@ def calculateMass(scene, objs, objsEGrp, childObjs):
     print()
     
     ### Copy rigid body settings (and mass) from children back to their parents and remove children from rigid body world
-    i = 0
-    for childObj in childObjs:
-        parentObj = scene.objects[childObj["bcb_parent"]]
-        if parentObj.rigid_body != None:
-            sys.stdout.write('\r' +"%d  " %i)
-            i += 1
-            
-            parentObj.select = 1
+    if len(childParents):
+        for childObj, parentObj in childParents:
+            copyRigidBodySettings(childObj, parentObj)
             childObj.select = 1
-            bpy.context.scene.objects.active = childObj
-            bpy.ops.rigidbody.object_settings_copy()
-            parentObj.select = 0
-            childObj.select = 0
-
-    ### Remove child objects from rigid body world (should not be simulated anymore)
-    for childObj in childObjs:
-        childObj.select
-    bpy.ops.rigidbody.objects_remove()
-            
-    if len(childObjs) > 0: print()
+        ### Remove child objects from rigid body world (should not be simulated anymore)
+        bpy.ops.rigidbody.objects_remove()
+        # Deselect all objects
+        bpy.ops.object.select_all(action='DESELECT')
 
 ################################################################################   
 
@@ -2073,6 +2044,96 @@ def correctContactAreaByVolume(objs, objsEGrp, connectsPair, connectsGeo):
                 
 ################################################################################   
 
+def detonatorGeometryHash(objs, objsCnt, rayDist, raySamples, objsRatioMerge):
+
+    ### Create a hash from all geometry related inputs of the confined space detection
+    md5 = hashlib.md5()
+    md5.update(("%d %f %d %d" %(objsCnt, rayDist, raySamples, objsRatioMerge)).encode())
+    mtxs = np.zeros((len(objs), 20), dtype=np.float64)
+    for j in range(len(objs)):
+        obj = objs[j]
+        md5.update(obj.name.encode())
+        mtxs[j, :16] = [v for row in obj.matrix_world for v in row]
+        mtxs[j, 16:19] = obj.dimensions
+        if obj.type == 'MESH': mtxs[j, 19] = len(obj.data.vertices)
+    md5.update(mtxs.tobytes())
+    return md5.hexdigest()
+
+########################################
+
+def detonatorConfinedSpacePass(scene, objs, objsCnt, rayDist, raySamples, objsRatioMerge):
+
+    ### Detect the confined/open space ratio at each element using ray casting (independent of the detonator objects)
+    ### Returns: base ratios, neighbor counts, the closest neighbors used for merging, ray directions
+    ratios = np.ones(objsCnt, dtype=np.float64)
+    coLens = np.zeros(objsCnt, dtype=np.int64)
+    coIdxs = np.full((objsCnt, max(1, objsRatioMerge)), -1, dtype=np.int64)
+    rayDirs = np.zeros((objsCnt, 3), dtype=np.float64)
+
+    ### Build kd-tree for object locations only once for all elements (optimization)
+    kdObjs = mathutils.kdtree.KDTree(len(objs))
+    for j, ob in enumerate(objs):
+        kdObjs.insert(ob.location, j)
+    kdObjs.balance()
+
+    ### Find closest objects via kd-tree
+    neighIdxs = []; neighCos = []; neighCnts = np.zeros(objsCnt, dtype=np.int64)
+    for i in range(objsCnt):
+        found = kdObjs.find_range(objs[i].location, rayDist)[1:]  # Remove first item because it's the same as co_find (zero distance)
+        neighCnts[i] = len(found)
+        for (co, index, dist) in found:
+            neighIdxs.append(index); neighCos.append(co)
+        coIdxs[i, :min(len(found), coIdxs.shape[1])] = [index for (co, index, dist) in found[:coIdxs.shape[1]]]
+    coLens[:] = neighCnts
+
+    ### Average all found elements locations in one batch
+    objsLoc = np.array([objs[i].location for i in range(objsCnt)], dtype=np.float64).reshape((objsCnt, 3))
+    mask = neighCnts > 0
+    if len(neighCos):
+        neighCos = np.array(neighCos, dtype=np.float64).reshape((-1, 3))
+        offsets = np.concatenate(([0], np.cumsum(neighCnts)[:-1]))
+        coSums = np.add.reduceat(neighCos, offsets[mask], axis=0)
+        coAvers = coSums /neighCnts[mask][:, None]
+        dirs = objsLoc[mask] -coAvers
+        lens = np.linalg.norm(dirs, axis=1)
+        lens[lens == 0] = 1
+        rayDirs[mask] = dirs /lens[:, None]
+
+    random.seed(0)
+    for i in range(objsCnt):
+        sys.stdout.write('\r' +"%d" %i)
+        obj = objs[i]
+        raySamplesOpen = 0
+        co_len = int(coLens[i])
+        for raySample in range(raySamples):
+            rayObj = rayObjLast = obj
+            rayLoc = rayObj.location
+            if raySample == 0:
+                if co_len == 0: rayObjLast = 0  # Skip ray cast
+                else: rayDir = Vector(rayDirs[i])
+            else:
+                rayDir = Vector((random.random()*2-1, random.random()*2-1, random.random())).normalized()
+                
+            ### Walk along ray until leaving original element and find the next one within range
+            while rayObj == rayObjLast:
+                rayObjLast = rayObj
+                rayRes, rayLoc, rayNor, rayIdx, rayObj, rayMtx = scene.ray_cast(rayLoc+rayDir/1000, rayDir, distance=rayDist)
+            if not rayRes: raySamplesOpen += 1  # No other object found within range
+            # Debug:
+            #if rayRes: bpy.ops.mesh.primitive_ico_sphere_add(size=.5, view_align=False, enter_editmode=False, location=rayLoc)
+
+        if raySamples == 1:
+            if co_len == 0:   ratios[i] = 1
+            elif co_len == 1: ratios[i] = raySamplesOpen *.75
+            elif co_len >= 2: ratios[i] = raySamplesOpen *.5
+        else:
+            ratios[i] = raySamplesOpen /raySamples
+    print()
+
+    return {"ratios": ratios, "coLens": coLens, "coIdxs": coIdxs, "rayDirs": rayDirs}
+
+################################################################################   
+
 def generateDetonator(objs, connectsPair, objsEGrp):
             
     scene = bpy.context.scene
@@ -2153,98 +2214,73 @@ def generateDetonator(objs, connectsPair, objsEGrp):
     if raySamples > 1: print("Ray sampling method: Accurate")
     else:              print("Ray sampling method: Optimized")
 
-    random.seed(0)
+    ###### Confined space pre-pass, independent of the detonators and cached in the scene by geometry hash
+    # (Tweaking explosive settings won't require ray casting again)
+    detonHash = detonatorGeometryHash(objs, objsCnt, rayDist, raySamples, objsRatioMerge)
+    detonData = None
+    if "bcb_detonCache" in scene.keys():
+        detonCache = scene["bcb_detonCache"]
+        if detonCache["hash"] == detonHash:
+            print("Using cached confined space data.")
+            detonData = {"ratios": np.array(detonCache["ratios"], dtype=np.float64),
+                         "coLens": np.array(detonCache["coLens"], dtype=np.int64),
+                         "coIdxs": np.array(detonCache["coIdxs"], dtype=np.int64).reshape((-1, max(1, objsRatioMerge))),
+                         "rayDirs": np.array(detonCache["rayDirs"], dtype=np.float64).reshape((-1, 3))}
+    if detonData == None:
+        detonData = detonatorConfinedSpacePass(scene, objs, objsCnt, rayDist, raySamples, objsRatioMerge)
+        scene["bcb_detonCache"] = {"hash": detonHash,
+                                   "ratios": detonData["ratios"].tolist(),
+                                   "coLens": detonData["coLens"].tolist(),
+                                   "coIdxs": detonData["coIdxs"].ravel().tolist(),
+                                   "rayDirs": detonData["rayDirs"].ravel().tolist()}
+    objsCoLen = detonData["coLens"]
+    objsCoIdxs = detonData["coIdxs"]
+    rayDirs = detonData["rayDirs"]
+    objsLoc = np.array([objs[i].location for i in range(objsCnt)], dtype=np.float64).reshape((objsCnt, 3))
+    objsDetonSkipSet = set(objsDetonSkip)
 
     for detonatorObj in detonatorObjs:
-        objsDetonRatio = []
-        objsCoLen = [0] *objsCnt
-        objsCoIdxs = [[]] *objsCnt
+        objsDetonRatio = detonData["ratios"].copy()
+                
+        ### Directional blast impact
+        if qDirectImpact and objsCnt:
+            detonDirs = np.array(detonatorObj.location, dtype=np.float64) -objsLoc
+            lens = np.linalg.norm(detonDirs, axis=1) *np.linalg.norm(rayDirs, axis=1)
+            mask = (objsCoLen > 0) &(lens > 0)
+            cosAngles = np.zeros(objsCnt)
+            cosAngles[mask] = np.einsum('ij,ij->i', rayDirs[mask], detonDirs[mask]) /lens[mask]
+            angles = np.arccos(np.clip(cosAngles, -1, 1))                                    # Front, side, back
+            #objsDetonRatio[mask] *= 1 -(angles[mask] /3.14159)                               # 1, 0.5, 0
+            #objsDetonRatio[mask] *= np.minimum(1, 1.5 -(angles[mask] /3.14159))              # 1, 1, 0.5
+            objsDetonRatio[mask] *= np.minimum(1, 2 -(angles[mask] /3.14159) *2)              # 1, 1, 0
+            #objsDetonRatio[mask] *= np.minimum(1, 3 -(angles[mask] /3.14159) *3)             # 1, 1, 1, 0
+            #objsDetonRatio[mask] *= np.minimum(1, 2 -(angles[mask] /3.14159) *1.5)           # 1, 1, 1, 0.5
+            #objsDetonRatio[mask] *= np.minimum(1, 2.5 -(angles[mask] /3.14159) *2)           # 1, 1, 1, 1, 0.5
+
         for i in range(objsCnt):
-            sys.stdout.write('\r' +"%d" %i)
             obj = objs[i]
-            raySamplesOpen = 0
-            co_len = 0
-            
-            ### Use brute force sampling if enough samples are available
-            for raySample in range(raySamples):
-                rayObj = rayObjLast = obj
-                rayLoc = rayObj.location
-
-                qRayCast = 1
-                if raySample == 0:
-                    ### Build kd-tree for object locations
-                    kdObjs = mathutils.kdtree.KDTree(objsCnt)
-                    for j, ob in enumerate(objs):
-                        kdObjs.insert(ob.location, j)
-                    kdObjs.balance()
-                    ### Find closest objects via kd-tree
-                    co_find = obj.location
-                    aIndex = []; aCo = []  #; aDist = []
-                    for (co, index, dist) in kdObjs.find_range(co_find, rayDist):
-                        aIndex.append(index); aCo.append(co)  #; aDist.append(dist)
-                    aIndex = aIndex[1:]; aCo = aCo[1:]  # Remove first item because it's the same as co_find (zero distance)
-                    ### Average all found elements locations
-                    co_aver = Vector((0, 0, 0))
-                    for co in aCo: co_aver += co
-                    co_len = len(aCo)
-                    if co_len == 0: rayObjLast = 0  # Skip ray cast
-                    else:
-                        co_aver /= co_len
-                        rayDir = rayDir0 = (rayLoc -co_aver).normalized()
-                        objsCoLen[i] = co_len
-                        objsCoIdxs[i] = aIndex
-                else:
-                    rayDir = Vector((random.random()*2-1, random.random()*2-1, random.random())).normalized()
-                    
-                ### Walk along ray until leaving original element and find the next one within range
-                while rayObj == rayObjLast:
-                    rayObjLast = rayObj
-                    rayRes, rayLoc, rayNor, rayIdx, rayObj, rayMtx = scene.ray_cast(rayLoc+rayDir/1000, rayDir, distance=rayDist)
-                if not rayRes: raySamplesOpen += 1  # No other object found within range
-                # Debug:
-                #if rayRes: bpy.ops.mesh.primitive_ico_sphere_add(size=.5, view_align=False, enter_editmode=False, location=rayLoc)
-
-            if raySamples == 1:
-                if co_len == 0:   openSpaceRatio = 1
-                elif co_len == 1: openSpaceRatio = raySamplesOpen *.75
-                elif co_len >= 2: openSpaceRatio = raySamplesOpen *.5
-            else:
-                openSpaceRatio = raySamplesOpen /raySamples
-                
-            ### Directional blast impact
-            if qDirectImpact:
-                if co_len > 0:
-                    detonDir = detonatorObj.location -obj.location
-                    angle = rayDir0.angle(detonDir, -1)
-                    if angle >= 0:                                            # Front, side, back
-                        #openSpaceRatio *= 1 -(angle /3.14159)                # 1, 0.5, 0
-                        #openSpaceRatio *= min(1, 1.5 -(angle /3.14159))      # 1, 1, 0.5
-                        openSpaceRatio *= min(1, 2 -(angle /3.14159) *2)     # 1, 1, 0
-                        #openSpaceRatio *= min(1, 3 -(angle /3.14159) *3)      # 1, 1, 1, 0
-                        #openSpaceRatio *= min(1, 2 -(angle /3.14159) *1.5)   # 1, 1, 1, 0.5
-                        #openSpaceRatio *= min(1, 2.5 -(angle /3.14159) *2)   # 1, 1, 1, 1, 0.5
-
-            if obj not in objsDetonSkip: obj['DetonRatio'] = openSpaceRatio
-            objsDetonRatio.append(openSpaceRatio)
-        print()
+            if obj not in objsDetonSkipSet: obj['DetonRatio'] = float(objsDetonRatio[i])
+
+        objsDetonRatio = objsDetonRatio.tolist()
 
         ### Merging of open space ratios for objects withing ray length distance to smooth out results
+        # (Sequential on purpose: already merged ratios are used for the following elements)
         if objsRatioMerge:
+            coLens = objsCoLen.tolist()
+            coIdxs = objsCoIdxs.tolist()
             for i in range(objsCnt):
-                co_len = objsCoLen[i]
+                co_len = coLens[i]
                 if co_len > 0:
                     obj = objs[i]
-                    idxs = objsCoIdxs[i]
+                    idxs = coIdxs[i]
+                    mergeCnt = min(co_len, objsRatioMerge)
                     openSpaceRatio = 0
-                    idxCnt = 1
-                    for idx in idxs:
-                        #openSpaceRatio += objsDetonRatio[idx]          # Equally balanced samples
-                        openSpaceRatio += objsDetonRatio[idx] /idxCnt  # Balanced by importance
-                        if idxCnt == min(co_len, objsRatioMerge): break
-                        idxCnt += 1
-                    #openSpaceRatio /= min(co_len, objsRatioMerge)        # Equally balanced samples
-                    openSpaceRatio /= 2 -1 /min(co_len, objsRatioMerge)  # Balanced by importance
-                    if obj not in objsDetonSkip: obj['DetonRatioMerge'] = openSpaceRatio
+                    for idxCnt in range(1, mergeCnt +1):
+                        #openSpaceRatio += objsDetonRatio[idxs[idxCnt-1]]          # Equally balanced samples
+                        openSpaceRatio += objsDetonRatio[idxs[idxCnt-1]] /idxCnt  # Balanced by importance
+                    #openSpaceRatio /= mergeCnt        # Equally balanced samples
+                    openSpaceRatio /= 2 -1 /mergeCnt  # Balanced by importance
+                    if obj not in objsDetonSkipSet: obj['DetonRatioMerge'] = openSpaceRatio
                     objsDetonRatio[i] = openSpaceRatio
             
         ###### Transfer data to related constraints
@@ -2256,7 +2292,7 @@ def generateDetonator(objs, connectsPair, objsEGrp):
             pair = next(connectsPair_iter)
             objA = objs[pair[0]]
             objB = objs[pair[1]]
-            if objA not in objsDetonSkip or objB not in objsDetonSkip:
+            if objA not in objsDetonSkipSet or objB not in objsDetonSkipSet:
                 objAratio = objsDetonRatio[pair[0]]
                 objBratio = objsDetonRatio[pair[1]]
                 # Use average confined/open space ratio for connection
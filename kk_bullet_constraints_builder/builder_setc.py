@@ -37,89 +37,146 @@ import global_vars
 
 ### Import submodules
 from global_vars import *      # Contains global variables
+from const_table import *      # Contains columnar in-memory constraint table
 from file_io import *          # Contains file input & output functions
 from tools import *            # Contains smaller independently working tools
                             
 ################################################################################
 
-def setConstParams(cData,cDatb,cDef, name=None,loc=None,obj1=None,obj2=None,tol1=None,tol2=None,rotm=None,rot=None,
+def setConstParams(cTab,cIdx, name=None,loc=None,obj1=None,obj2=None,tol1=None,tol2=None,rotm=None,rot=None,
     e=None,bt=None,ub=None,dc=None,ct=None,so=None,si=None,
     ullx=None,ully=None,ullz=None,llxl=None,llxu=None,llyl=None,llyu=None,llzl=None,llzu=None,
     ulax=None,ulay=None,ulaz=None,laxl=None,laxu=None,layl=None,layu=None,lazl=None,lazu=None,
     uslx=None,usly=None,uslz=None,sdlx=None,sdly=None,sdlz=None,sslx=None,ssly=None,sslz=None,
     usax=None,usay=None,usaz=None,sdax=None,sday=None,sdaz=None,ssax=None,ssay=None,ssaz=None):
 
-    # setConstParams(cData,cDatb,cDef, name,loc,obj1,obj2,tol1,tol2,rotm,rot, e,bt,ub,dc,ct,so,si, ullx,ully,ullz, llxl,llxu,llyl,llyu,llzl,llzu, ulax,ulay,ulaz, laxl,laxu,layl,layu,lazl,lazu, uslx,usly,uslz, sdlx,sdly,sdlz, sslx,ssly,sslz, usax,usay,usaz, sdax,sday,sdaz, ssax,ssay,ssaz)
+    # setConstParams(cTab,cIdx, name,loc,obj1,obj2,tol1,tol2,rotm,rot, e,bt,ub,dc,ct,so,si, ullx,ully,ullz, llxl,llxu,llyl,llyu,llzl,llzu, ulax,ulay,ulaz, laxl,laxu,layl,layu,lazl,lazu, uslx,usly,uslz, sdlx,sdly,sdlz, sslx,ssly,sslz, usax,usay,usaz, sdax,sday,sdaz, ssax,ssay,ssaz)
 
     ### Base parameters (BCB specific)
-    if len(cDatb) == 0:  # Initialize when empty
-        for i in range(8): cDatb.append(None)
-    if name != None: cDatb[0] = name
-    if loc  != None: cDatb[1] = loc
-    if obj1 != None: cDatb[2] = obj1
-    if obj2 != None: cDatb[3] = obj2
-    if tol1 != None: cDatb[4] = tol1  # Should always get data
-    if tol2 != None: cDatb[5] = tol2  # Should always get data
-    if rotm != None: cDatb[6] = rotm
-    if rot  != None: cDatb[7] = rot
-
-    ### Constraint attributes (compatible with Blender class)
+    cTab.setBase(cIdx, name,loc,obj1,obj2,tol1,tol2,rotm,rot)  # tol1 and tol2 should always get data
+
+    ### Constraint attributes (compatible with Blender class, only values different from the defaults are stored)
     # s,e,bt,ub,dc,ct
-    if e  != None and e  != cDef["enabled"]:            cData["enabled"] = e
-    if bt != None and bt != cDef["breaking_threshold"]: cData["breaking_threshold"] = bt  # *(1-random.random()/2)
-    if ub != None and ub != cDef["use_breaking"]:       cData["use_breaking"] = ub
-    if dc != None and dc != cDef["disable_collisions"]: cData["disable_collisions"] = dc
-    if ct != None and ct != cDef["type"]:               cData["type"] = ct
-    if so != None and so != cDef["use_override_solver_iterations"]: cData["use_override_solver_iterations"] = so
-    if si != None and si != cDef["solver_iterations"]:              cData["solver_iterations"] = si
+    if e    != None: cTab.set(cIdx, "enabled", e)
+    if bt   != None: cTab.set(cIdx, "breaking_threshold", bt)  # *(1-random.random()/2)
+    if ub   != None: cTab.set(cIdx, "use_breaking", ub)
+    if dc   != None: cTab.set(cIdx, "disable_collisions", dc)
+    if ct   != None: cTab.set(cIdx, "type", ct)
+    if so   != None: cTab.set(cIdx, "use_override_solver_iterations", so)
+    if si   != None: cTab.set(cIdx, "solver_iterations", si)
     
     # Limits Linear
     # ullx,ully,ullz, llxl,llxu,llyl,llyu,llzl,llzu
-    if ullx != None and ullx != cDef["use_limit_lin_x"]:   cData["use_limit_lin_x"] = ullx
-    if ully != None and ully != cDef["use_limit_lin_y"]:   cData["use_limit_lin_y"] = ully
-    if ullz != None and ullz != cDef["use_limit_lin_z"]:   cData["use_limit_lin_z"] = ullz
-    if llxl != None and llxl != cDef["limit_lin_x_lower"]: cData["limit_lin_x_lower"] = llxl
-    if llxu != None and llxu != cDef["limit_lin_x_upper"]: cData["limit_lin_x_upper"] = llxu
-    if llyl != None and llyl != cDef["limit_lin_y_lower"]: cData["limit_lin_y_lower"] = llyl
-    if llyu != None and llyu != cDef["limit_lin_y_upper"]: cData["limit_lin_y_upper"] = llyu
-    if llzl != None and llzl != cDef["limit_lin_z_lower"]: cData["limit_lin_z_lower"] = llzl
-    if llzu != None and llzu != cDef["limit_lin_z_upper"]: cData["limit_lin_z_upper"] = llzu
+    if ullx != None: cTab.set(cIdx, "use_limit_lin_x", ullx)
+    if ully != None: cTab.set(cIdx, "use_limit_lin_y", ully)
+    if ullz != None: cTab.set(cIdx, "use_limit_lin_z", ullz)
+    if llxl != None: cTab.set(cIdx, "limit_lin_x_lower", llxl)
+    if llxu != None: cTab.set(cIdx, "limit_lin_x_upper", llxu)
+    if llyl != None: cTab.set(cIdx, "limit_lin_y_lower", llyl)
+    if llyu != None: cTab.set(cIdx, "limit_lin_y_upper", llyu)
+    if llzl != None: cTab.set(cIdx, "limit_lin_z_lower", llzl)
+    if llzu != None: cTab.set(cIdx, "limit_lin_z_upper", llzu)
 
     # Limits Angular
     # ulax,ulay,ulaz, laxl,laxu,layl,layu,lazl,lazu
-    if ulax != None and ulax != cDef["use_limit_ang_x"]:   cData["use_limit_ang_x"] = ulax
-    if ulay != None and ulay != cDef["use_limit_ang_y"]:   cData["use_limit_ang_y"] = ulay
-    if ulaz != None and ulaz != cDef["use_limit_ang_z"]:   cData["use_limit_ang_z"] = ulaz
-    if laxl != None and laxl != cDef["limit_ang_x_lower"]: cData["limit_ang_x_lower"] = laxl
-    if laxu != None and laxu != cDef["limit_ang_x_upper"]: cData["limit_ang_x_upper"] = laxu
-    if layl != None and layl != cDef["limit_ang_y_lower"]: cData["limit_ang_y_lower"] = layl
-    if layu != None and layu != cDef["limit_ang_y_upper"]: cData["limit_ang_y_upper"] = layu
-    if lazl != None and lazl != cDef["limit_ang_z_lower"]: cData["limit_ang_z_lower"] = lazl
-    if lazu != None and lazu != cDef["limit_ang_z_upper"]: cData["limit_ang_z_upper"] = lazu
+    if ulax != None: cTab.set(cIdx, "use_limit_ang_x", ulax)
+    if ulay != None: cTab.set(cIdx, "use_limit_ang_y", ulay)
+    if ulaz != None: cTab.set(cIdx, "use_limit_ang_z", ulaz)
+    if laxl != None: cTab.set(cIdx, "limit_ang_x_lower", laxl)
+    if laxu != None: cTab.set(cIdx, "limit_ang_x_upper", laxu)
+    if layl != None: cTab.set(cIdx, "limit_ang_y_lower", layl)
+    if layu != None: cTab.set(cIdx, "limit_ang_y_upper", layu)
+    if lazl != None: cTab.set(cIdx, "limit_ang_z_lower", lazl)
+    if lazu != None: cTab.set(cIdx, "limit_ang_z_upper", lazu)
 
     # Spring Linear
     # uslx,usly,uslz, sdlx,sdly,sdlz, sslx,ssly,sslz
-    if uslx != None and uslx != cDef["use_spring_x"]:       cData["use_spring_x"] = uslx
-    if usly != None and usly != cDef["use_spring_y"]:       cData["use_spring_y"] = usly
-    if uslz != None and uslz != cDef["use_spring_z"]:       cData["use_spring_z"] = uslz
-    if sdlx != None and sdlx != cDef["spring_damping_x"]:   cData["spring_damping_x"] = sdlx
-    if sdly != None and sdly != cDef["spring_damping_y"]:   cData["spring_damping_y"] = sdly
-    if sdlz != None and sdlz != cDef["spring_damping_z"]:   cData["spring_damping_z"] = sdlz
-    if sslx != None and sslx != cDef["spring_stiffness_x"]: cData["spring_stiffness_x"] = sslx
-    if ssly != None and ssly != cDef["spring_stiffness_y"]: cData["spring_stiffness_y"] = ssly
-    if sslz != None and sslz != cDef["spring_stiffness_z"]: cData["spring_stiffness_z"] = sslz
+    if uslx != None: cTab.set(cIdx, "use_spring_x", uslx)
+    if usly != None: cTab.set(cIdx, "use_spring_y", usly)
+    if uslz != None: cTab.set(cIdx, "use_spring_z", uslz)
+    if sdlx != None: cTab.set(cIdx, "spring_damping_x", sdlx)
+    if sdly != None: cTab.set(cIdx, "spring_damping_y", sdly)
+    if sdlz != None: cTab.set(cIdx, "spring_damping_z", sdlz)
+    if sslx != None: cTab.set(cIdx, "spring_stiffness_x", sslx)
+    if ssly != None: cTab.set(cIdx, "spring_stiffness_y", ssly)
+    if sslz != None: cTab.set(cIdx, "spring_stiffness_z", sslz)
     
     # Spring Angular
     # usax,usay,usaz, sdax,sday,sdaz, ssax,ssay,ssaz
-    if usax != None and usax != cDef["use_spring_ang_x"]:       cData["use_spring_ang_x"] = usax
-    if usay != None and usay != cDef["use_spring_ang_y"]:       cData["use_spring_ang_y"] = usay
-    if usaz != None and usaz != cDef["use_spring_ang_z"]:       cData["use_spring_ang_z"] = usaz
-    if sdax != None and sdax != cDef["spring_damping_ang_x"]:   cData["spring_damping_ang_x"] = sdax
-    if sday != None and sday != cDef["spring_damping_ang_y"]:   cData["spring_damping_ang_y"] = sday
-    if sdaz != None and sdaz != cDef["spring_damping_ang_z"]:   cData["spring_damping_ang_z"] = sdaz
-    if ssax != None and ssax != cDef["spring_stiffness_ang_x"]: cData["spring_stiffness_ang_x"] = ssax
-    if ssay != None and ssay != cDef["spring_stiffness_ang_y"]: cData["spring_stiffness_ang_y"] = ssay
-    if ssaz != None and ssaz != cDef["spring_stiffness_ang_z"]: cData["spring_stiffness_ang_z"] = ssaz
+    if usax != None: cTab.set(cIdx, "use_spring_ang_x", usax)
+    if usay != None: cTab.set(cIdx, "use_spring_ang_y", usay)
+    if usaz != None: cTab.set(cIdx, "use_spring_ang_z", usaz)
+    if sdax != None: cTab.set(cIdx, "spring_damping_ang_x", sdax)
+    if sday != None: cTab.set(cIdx, "spring_damping_ang_y", sday)
+    if sdaz != None: cTab.set(cIdx, "spring_damping_ang_z", sdaz)
+    if ssax != None: cTab.set(cIdx, "spring_stiffness_ang_x", ssax)
+    if ssay != None: cTab.set(cIdx, "spring_stiffness_ang_y", ssay)
+    if ssaz != None: cTab.set(cIdx, "spring_stiffness_ang_z", ssaz)
+
+########################################
+
+def compileBrkThresExpressions(elemGrps):
+
+    ### Compile the breaking threshold expressions of all element groups only once instead of parsing them again for every connection (optimization)
+    # Expression order: C, T, S, S9, B, B9, P (S9, B9 and P can also have zero-size strings if not used)
+    exprIdxs = [EGSidxBTC, EGSidxBTT, EGSidxBTS, EGSidxBTS9, EGSidxBTB, EGSidxBTB9, EGSidxBTP]
+    exprOptional = [0, 0, 0, 1, 0, 1, 1]
+    brkThresExprs = []
+    for elemGrp in elemGrps:
+        exprs = []; codes = []
+        for i in range(len(exprIdxs)):
+            expr = elemGrp[exprIdxs[i]]
+            exprs.append(expr)
+            if not len(expr) and exprOptional[i]:
+                codes.append(None)  # Not used
+                continue
+            # Make sure that user expressions are evaluated first to prevent invisible order of operation issues
+            try: code = compile("(" +expr +")", "<%s>" %elemGrp[EGSidxName], 'eval')
+            except:
+                print("\rError: Expression could not be compiled for element group '%s':" %elemGrp[EGSidxName], expr)
+                code = False
+            codes.append(code)
+        # [expressions, compiled expressions, error counts]
+        brkThresExprs.append([exprs, codes, [0 for i in range(len(exprIdxs))]])
+    return brkThresExprs
+
+########################################
+
+def evaluateBrkThresExpressions(brkThresExprs, elemGrp, exprVars, mul, mulCyl):
+
+    ### Evaluate the precompiled breaking threshold expressions of an element group for every degree of freedom
+    # exprVars are the local variables of setConstraintSettings() so expressions can use the same variables as before (a, h, w, x, y, z etc.)
+    exprs, codes, errCnts = brkThresExprs[elemGrp]
+    a = exprVars["a"]
+    # Multipliers are rounded the same way as when they were added to the expression strings
+    mul = float("%f" %mul); mulCyl = float("%f" %mulCyl)
+    values = []
+    for i in range(len(codes)):
+        code = codes[i]
+        if code == None: values.append(-1); continue
+        if code == False: errCnts[i] += 1; values.append(0); continue
+        ### Add surface variable and multipliers
+        try: value = eval(code, globals(), exprVars) *a *mul *mulCyl
+        except:
+            if errCnts[i] == 0:
+                print("\rError: Expression could not be evaluated for element group '%s':" %global_vars.elemGrps[elemGrp][EGSidxName], exprs[i], \
+                      dict([(var, exprVars[var]) for var in ['a', 'h', 'w', 'x', 'y', 'z']]))
+            errCnts[i] += 1
+            value = 0
+        values.append(value)
+    return values
+
+########################################
+
+def reportBrkThresExpressionErrors(brkThresExprs):
+
+    ### Summarize expression errors per element group
+    elemGrps = global_vars.elemGrps
+    for elemGrp in range(len(brkThresExprs)):
+        exprs, codes, errCnts = brkThresExprs[elemGrp]
+        for i in range(len(codes)):
+            if errCnts[i] > 0:
+                print("Error: Expression of element group '%s' failed for %d connections:" %(elemGrps[elemGrp][EGSidxName], errCnts[i]), exprs[i])
 
 ########################################
     
@@ -128,6 +185,7 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
     props = bpy.context.window_manager.bcb
     scene = bpy.context.scene
     elemGrps = global_vars.elemGrps
+    brkThresExprs = compileBrkThresExpressions(elemGrps)
     rbw_steps_per_second = scene.rigidbody_world.steps_per_second
     rbw_time_scale = scene.rigidbody_world.time_scale
     dirAxis = [1, 2, 3]
@@ -175,7 +233,10 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
 
     ### Generate settings and prepare the attributes but only store those which are different from the defaults
     print("Generating main constraint settings... (%d)" %len(connectsPair))
-    constsData = []
+    # Columnar constraint table indexed by constraint (replaces a [dict, list] pair per constraint)
+    cTab = constTable(cDef, len(emptyObjs))
+    # Flags constraints for which all settings are generated (on partial updates type and limits are not in the table)
+    qConstsComplete = [1 for i in range(len(emptyObjs))]
     connectsConsts_iter = iter(connectsConsts)
     connectsLoc_iter = iter(connectsLoc)
     connectsGeo_iter = iter(connectsGeo)
@@ -202,10 +263,8 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
         elemGrpB = objsEGrp[objsDict[objB]]
         # If objects are missing or connection not used then fill in empty data and skip rest
         if objA == None or objB == None or len(consts) == 0 or elemGrpA == -1 or elemGrpB == -1:
-            cData = {}; cDatb = []
             for cIdx in consts:
-                setConstParams(cData,cDatb,cDef)
-                constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx)
             continue
         
         geoContactArea = geo[0]
@@ -307,127 +366,35 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
             if not qNoCon:
                 # A is active group
                 if CT_A != 0:
-                    ### Prepare expression strings
-                    brkThresExprC_A = elemGrps_elemGrpA[EGSidxBTC]
-                    brkThresExprT_A = elemGrps_elemGrpA[EGSidxBTT]
-                    brkThresExprS_A = elemGrps_elemGrpA[EGSidxBTS]
-                    brkThresExprS9_A = elemGrps_elemGrpA[EGSidxBTS9]
-                    brkThresExprB_A = elemGrps_elemGrpA[EGSidxBTB]
-                    brkThresExprB9_A = elemGrps_elemGrpA[EGSidxBTB9]
-                    brkThresExprP_A = elemGrps_elemGrpA[EGSidxBTP]
                     brkThresValuePL_A = elemGrps_elemGrpA[EGSidxBTPL]
                     mul = elemGrps_elemGrpA[EGSidxBTX]
                     if objsID[pair[0]] != objsID[pair[1]]:
                         mul *= elemGrps_elemGrpA[EGSidxBTI]
-                    # Make sure that user expressions are evaluated first to prevent invisible order of operation issues
-                    if len(brkThresExprC_A): brkThresExprC_A = "(" +brkThresExprC_A +")"
-                    if len(brkThresExprT_A): brkThresExprT_A = "(" +brkThresExprT_A +")"
-                    if len(brkThresExprS_A): brkThresExprS_A = "(" +brkThresExprS_A +")"
-                    if len(brkThresExprS9_A): brkThresExprS9_A = "(" +brkThresExprS9_A +")"
-                    if len(brkThresExprB_A): brkThresExprB_A = "(" +brkThresExprB_A +")"
-                    if len(brkThresExprB9_A): brkThresExprB9_A = "(" +brkThresExprB9_A +")"
-                    if len(brkThresExprP_A): brkThresExprP_A = "(" +brkThresExprP_A +")"
                     # Area correction calculation for cylinders (*pi/4)
                     if elemGrps_elemGrpA[EGSidxCyln]: mulCyl = 0.7854
                     else:                             mulCyl = 1
                     # Increase threshold for boundary condition case
                     if CT_B == 0: mul *= 2
-                    ### Add surface variable and multipliers
-                    if len(brkThresExprC_A): brkThresExprC_A += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprT_A): brkThresExprT_A += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprS_A): brkThresExprS_A += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprS9_A): brkThresExprS9_A += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprB_A): brkThresExprB_A += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprB9_A): brkThresExprB9_A += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprP_A): brkThresExprP_A += "*a" +"*%f"%mul +"*%f"%mulCyl
                     
                     ### Evaluate the breaking thresholds expressions of both elements for every degree of freedom
-                    try: brkThresValueC_A = eval(brkThresExprC_A)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprC_A, objA.name, objB.name, a); brkThresValueC_A = 0
-                    try: brkThresValueT_A = eval(brkThresExprT_A)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprT_A); brkThresValueT_A = 0
-                    try: brkThresValueS_A = eval(brkThresExprS_A)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprS_A); brkThresValueS_A = 0
-
-                    if len(brkThresExprS9_A):  # Can also have zero-size string if not used
-                        try: brkThresValueS9_A = eval(brkThresExprS9_A)
-                        except: print("\rError: Expression could not be evaluated:", brkThresExprS9_A); brkThresValueS9_A = 0
-                    else: brkThresValueS9_A = -1
-
-                    try: brkThresValueB_A = eval(brkThresExprB_A)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprB_A); brkThresValueB_A = 0
-
-                    if len(brkThresExprB9_A):  # Can also have zero-size string if not used
-                        try: brkThresValueB9_A = eval(brkThresExprB9_A)
-                        except: print("\rError: Expression could not be evaluated:", brkThresExprB9_A); brkThresValueB9_A = 0
-                    else: brkThresValueB9_A = -1
-
-                    if len(brkThresExprP_A):  # Can also have zero-size string if not used
-                        try: brkThresValueP_A = eval(brkThresExprP_A)
-                        except: print("\rError: Expression could not be evaluated:", brkThresExprP_A); brkThresValueP_A = 0
-                    else: brkThresValueP_A = -1
+                    brkThresValueC_A, brkThresValueT_A, brkThresValueS_A, brkThresValueS9_A, brkThresValueB_A, brkThresValueB9_A, brkThresValueP_A = \
+                        evaluateBrkThresExpressions(brkThresExprs, elemGrpA, locals(), mul, mulCyl)
 
                 # B is active group
                 if CT_B != 0:
-                    ### Prepare expression strings
-                    brkThresExprC_B = elemGrps_elemGrpB[EGSidxBTC]
-                    brkThresExprT_B = elemGrps_elemGrpB[EGSidxBTT]
-                    brkThresExprS_B = elemGrps_elemGrpB[EGSidxBTS]
-                    brkThresExprS9_B = elemGrps_elemGrpB[EGSidxBTS9]
-                    brkThresExprB_B = elemGrps_elemGrpB[EGSidxBTB]
-                    brkThresExprB9_B = elemGrps_elemGrpB[EGSidxBTB9]
-                    brkThresExprP_B = elemGrps_elemGrpB[EGSidxBTP]
                     brkThresValuePL_B = elemGrps_elemGrpB[EGSidxBTPL]
                     mul = elemGrps_elemGrpB[EGSidxBTX]
                     if objsID[pair[0]] != objsID[pair[1]]:
                         mul *= elemGrps_elemGrpA[EGSidxBTI]
-                    # Make sure that user expressions are evaluated first to prevent invisible order of operation issues
-                    if len(brkThresExprC_B): brkThresExprC_B = "(" +brkThresExprC_B +")"
-                    if len(brkThresExprT_B): brkThresExprT_B = "(" +brkThresExprT_B +")"
-                    if len(brkThresExprS_B): brkThresExprS_B = "(" +brkThresExprS_B +")"
-                    if len(brkThresExprS9_B): brkThresExprS9_B = "(" +brkThresExprS9_B +")"
-                    if len(brkThresExprB_B): brkThresExprB_B = "(" +brkThresExprB_B +")"
-                    if len(brkThresExprB9_B): brkThresExprB9_B = "(" +brkThresExprB9_B +")"
-                    if len(brkThresExprP_B): brkThresExprP_B = "(" +brkThresExprP_B +")"
                     # Area correction calculation for cylinders (*pi/4)
                     if elemGrps_elemGrpB[EGSidxCyln]: mulCyl = 0.7854
                     else:                             mulCyl = 1
                     # Increase threshold for boundary condition case
                     if CT_A == 0: mul *= 2
-                    ### Add surface variable and multipliers
-                    if len(brkThresExprC_B): brkThresExprC_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprT_B): brkThresExprT_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprS_B): brkThresExprS_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprS9_B): brkThresExprS9_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprB_B): brkThresExprB_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprB9_B): brkThresExprB9_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-                    if len(brkThresExprP_B): brkThresExprP_B += "*a" +"*%f"%mul +"*%f"%mulCyl
-
+                    
                     ### Evaluate the breaking thresholds expressions of both elements for every degree of freedom
-                    try: brkThresValueC_B = eval(brkThresExprC_B)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprC_B); brkThresValueC_B = 0
-                    try: brkThresValueT_B = eval(brkThresExprT_B)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprT_B); brkThresValueT_B = 0
-                    try: brkThresValueS_B = eval(brkThresExprS_B)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprS_B); brkThresValueS_B = 0
-
-                    if len(brkThresExprS9_B):  # Can also have zero-size string if not used
-                        try: brkThresValueS9_B = eval(brkThresExprS9_B)
-                        except: print("\rError: Expression could not be evaluated:", brkThresExprS9_B); brkThresValueS9_B = 0
-                    else: brkThresValueS9_B = -1
-
-                    try: brkThresValueB_B = eval(brkThresExprB_B)
-                    except: print("\rError: Expression could not be evaluated:", brkThresExprB_B); brkThresValueB_B = 0
-
-                    if len(brkThresExprB9_B):  # Can also have zero-size string if not used
-                        try: brkThresValueB9_B = eval(brkThresExprB9_B)
-                        except: print("\rError: Expression could not be evaluated:", brkThresExprB9_B); brkThresValueB9_B = 0
-                    else: brkThresValueB9_B = -1
-
-                    if len(brkThresExprP_B):  # Can also have zero-size string if not used
-                        try: brkThresValueP_B = eval(brkThresExprP_B)
-                        except: print("\rError: Expression could not be evaluated:", brkThresExprP_B); brkThresValueP_B = 0
-                    else: brkThresValueP_B = -1
+                    brkThresValueC_B, brkThresValueT_B, brkThresValueS_B, brkThresValueS9_B, brkThresValueB_B, brkThresValueB9_B, brkThresValueP_B = \
+                        evaluateBrkThresExpressions(brkThresExprs, elemGrpB, locals(), mul, mulCyl)
 
                 # Both A and B are active groups and priority is the same
                 if CT_A != 0 and CT_B != 0 and Prio_A == Prio_B:
@@ -681,6 +648,8 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                 objConst0['Element Group'] = elemGrp
             else:
                 qUpdateComplete = 1
+            if not qUpdateComplete:
+                for cIdx in consts: qConstsComplete[cIdx] = 0
                 
         ### Set constraints by connection type preset
         ### Also convert real world breaking threshold to bullet breaking threshold and take simulation steps into account (Threshold = F / Steps)
@@ -745,171 +714,159 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
 
         ### 1x FIXED; Indestructible buffer between passive and active foundation elements
         if CT == -1:
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             if solvIter == 0: solvIter = max(1, int(props.solverIterations /10))  # If no custom Solver Iterations, an automatic value is generated
-            setConstParams(cData,cDatb,cDef, loc=loc, ub=0, dc=1, ct='FIXED', so=bool(solvIter),si=solvIter)
-            constsData.append([cData, cDatb])
+            setConstParams(cTab,cIdx, loc=loc, ub=0, dc=1, ct='FIXED', so=bool(solvIter),si=solvIter)
 
         ### 1x FIXED; Linear omni-directional + bending breaking threshold
         if CT == 1 or CT == 9 or CT == 10 or CT == 19:
             constCount = 1; correction = 1  # No correction required for this constraint type
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueC
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='FIXED', so=so,si=si)
+            setConstParams(cTab,cIdx, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='FIXED', so=so,si=si)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
 
         ### 1x POINT; Linear omni-directional breaking threshold
         if CT == 2 or CT == 25:
             constCount = 1; correction = 1  # No correction required for this constraint type
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueC
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='POINT', so=so,si=si)
+            setConstParams(cTab,cIdx, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='POINT', so=so,si=si)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
         
         ### 1x POINT + 1x FIXED; Linear omni-directional, bending breaking thresholds    
         if CT == 3 or CT == 20:
             constCount = 2; correction = 1  # No correction required for this constraint type
             
             ### First constraint
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueC
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='POINT', so=so,si=si)
+            setConstParams(cTab,cIdx, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='POINT', so=so,si=si)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
 
             ### Second constraint
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueB
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='FIXED', so=so,si=si)
+            setConstParams(cTab,cIdx, loc=loc, bt=brkThres, ub=ub, dc=dc, ct='FIXED', so=so,si=si)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
         
         ### 1x GENERIC; Compressive threshold
         if CT == 4 or CT == 5 or CT == 6 or CT == 11 or CT == 12 or CT == 15 or CT == 16 or CT == 17 or CT == 18 or CT == 21 or CT == 22 or CT == 23:
             ### First constraint
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueC
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock all directions for the compressive force
                 ### I left Y and Z unlocked because for this CT we have no separate breaking threshold for lateral force, the tensile constraint and its breaking threshold should apply for now
                 ### Also rotational forces should only be carried by the tensile constraint
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=0,ullz=0, llxl=llxl,llxu=99999, ulax=0,ulay=0,ulaz=0)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=0,ullz=0, llxl=llxl,llxu=99999, ulax=0,ulay=0,ulaz=0)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
 
         ### 1x GENERIC; Tensile (3D)
         if CT == 4:
             ### Second constraint
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueT
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock all directions for the tensile force
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=1,ullz=1, llxl=-99999,llxu=llxu,llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=1,ulay=1,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=1,ullz=1, llxl=-99999,llxu=llxu,llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=1,ulay=1,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
             
         ### 2x GENERIC; Tensile + shearing (3D), bending (3D) breaking thresholds
         if CT == 5:
             ### Tensile + shearing constraint (3D)
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueT
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions for shearing force
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=1,ullz=1, llxl=-99999,llxu=llxu,llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=1,ullz=1, llxl=-99999,llxu=llxu,llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot])
 
             ### Bending constraint (3D)
             constCount = 1; correction = 1.5  # Averaged correction factor for deviation of angular force evaluation for 6Dof constraints within the Bullet library
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueS
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions for bending force
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
             
         ### 3x GENERIC; Tensile constraint (1D) breaking threshold
         if CT == 6 or CT == 11 or CT == 12 or CT == 15 or CT == 16 or CT == 17 or CT == 18 or CT == 21 or CT == 22 or CT == 23:
             ### Tensile constraint (1D)
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueT
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock direction for tensile force
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=0,ullz=0, llxl=-99999,llxu=llxu, ulax=0,ulay=0,ulaz=0)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=0,ullz=0, llxl=-99999,llxu=llxu, ulax=0,ulay=0,ulaz=0)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
         ### 3x GENERIC; Shearing constraint (2D), bending constraint (3D) breaking thresholds
         if CT == 6 or CT == 11 or CT == 12 or CT == 21:
             ### Shearing constraint (2D)
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueS
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions for shearing force
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=1,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=1,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
             ### Bending constraint (3D)
             constCount = 1; correction = 1
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueB
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions for bending force
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
         ### 2x GENERIC; Shearing (1D) breaking thresholds
         if CT == 15 or CT == 16 or CT == 17 or CT == 18 or CT == 22 or CT == 23:
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
             
             ### Shearing constraint #1
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueS
             if brkThresValueS9 != -1:
                 value1 = value
@@ -919,7 +876,7 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                 values.sort()
                 value = values[0]  # Find and use smaller value (to be used along h axis)
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Find constraint axis which is closest to the height (h) orientation of the detected contact area  
@@ -941,33 +898,31 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     if abs(dirEul[1]) > abs(dirEul[2]): constAxisToLock = 3
                     else: constAxisToLock = 2
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 2:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ully=1,ullz=0, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
-                elif constAxisToLock == 3: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ully=0,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
+                if constAxisToLock == 2:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ully=1,ullz=0, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
+                elif constAxisToLock == 3: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ully=0,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
             ### Shearing constraint #2
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             if brkThresValueS9 != -1:
                 value = values[1]  # Find and use larger value (to be used along w axis)
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 3:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ully=1,ullz=0, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
-                elif constAxisToLock == 2: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ully=0,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
+                if constAxisToLock == 3:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ully=1,ullz=0, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
+                elif constAxisToLock == 2: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ully=0,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
             
         ### 2x GENERIC; Bending + torsion (1D) breaking thresholds
         if CT == 15 or CT == 17 or CT == 22:
             constCount = 1; correction = 1.5  # Averaged correction factor for deviation of angular force evaluation for 6Dof constraints within the Bullet library
             
             ### Bending with torsion constraint #1
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             btRatio = 1
             value = brkThresValueB
             if brkThresValueB9 != -1:
@@ -982,7 +937,7 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                       btRatio = geoHeight /geoWidth
                 else: btRatio = 1
             brkThres = value *btRatio *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Find constraint axis which is closest to the height (h) orientation of the detected contact area  
@@ -1004,34 +959,32 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     if abs(dirEul[1]) > abs(dirEul[2]): constAxisToLock = 3
                     else: constAxisToLock = 2
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 2:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
-                elif constAxisToLock == 3: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                if constAxisToLock == 2:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                elif constAxisToLock == 3: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
             ### Bending with torsion constraint #2
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             if brkThresValueB9 != -1:
                 value = values[1]  # Find and use larger value (to be used along w axis)
             if btRatio != 1: btRatio = 1 /btRatio
             brkThres = value *btRatio *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 3:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
-                elif constAxisToLock == 2: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                if constAxisToLock == 3:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                elif constAxisToLock == 2: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
         ### 3x GENERIC; Bending (1D), torsion (1D) breaking thresholds
         if CT == 16 or CT == 18 or CT == 23:
             constCount = 1; correction = 1.5  # Averaged correction factor for deviation of angular force evaluation for 6Dof constraints within the Bullet library
             
             ### Bending without torsion constraint #1
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             btRatio = 1
             value = brkThresValueB
             if brkThresValueB9 != -1:
@@ -1046,7 +999,7 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                       btRatio = geoHeight /geoWidth
                 else: btRatio = 1
             brkThres = value *btRatio *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Find constraint axis which is closest to the height (h) orientation of the detected contact area  
@@ -1068,30 +1021,28 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     if abs(dirEul[1]) > abs(dirEul[2]): constAxisToLock = 3
                     else: constAxisToLock = 2
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 2:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
-                elif constAxisToLock == 3: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                if constAxisToLock == 2:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                elif constAxisToLock == 3: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
             ### Bending without torsion constraint #2
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             if brkThresValueB9 != -1:
                 value = values[1]  # Find and use larger value (to be used along w axis)
             if btRatio != 1: btRatio = 1 /btRatio
             brkThres = value *btRatio *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 3:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
-                elif constAxisToLock == 2: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                if constAxisToLock == 3:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=0,ulaz=1, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                elif constAxisToLock == 2: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=0,ulay=1,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
             ### Torsion constraint
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             try: value = values[0]  # Use the smaller value from either standard or 90n
             except: pass
             btRatio = 1
@@ -1109,15 +1060,14 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
 #                else: btRatio = 1
             value *= .5  # Use 50% of the bending thresholds for torsion (we really need a formula for that)
             brkThres = value *btRatio *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock directions accordingly to axis
-                if constAxisToLock == 3:   setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
-                elif constAxisToLock == 2: setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                if constAxisToLock == 3:   setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                elif constAxisToLock == 2: setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=0,ully=0,ullz=0, ulax=1,ulay=0,ulaz=0, laxl=laxl,laxu=laxu,layl=layl,layu=layu,lazl=lazl,lazu=lazu)
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot],rotm=rotm)
 
         ###### Springs (additional)
 
@@ -1134,8 +1084,8 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount /2
             ### Loop through all constraints of this connection
             for i in range(3):
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1145,15 +1095,14 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING')
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING')
                 if CT != 7:
                     # Disable springs on start (requires plastic activation during simulation)
-                    setConstParams(cData,cDatb,cDef, e=0)
+                    setConstParams(cTab,cIdx, e=0)
                 if props.asciiExport:
                     if CT == 7:
-                          setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                    else: setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                          setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
+                    else: setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
                           
                 
         ### 4x SPRING; Circular placed for plastic deformability
@@ -1169,8 +1118,8 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount /2
             ### Loop through all constraints of this connection
             for i in range(4):
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1181,38 +1130,36 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING')
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING')
                 if CT != 8:
                     # Disable springs on start (requires plastic activation during simulation)
-                    setConstParams(cData,cDatb,cDef, e=0)
+                    setConstParams(cTab,cIdx, e=0)
                 if props.asciiExport:
                     if CT == 8:
-                          setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                    else: setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                          setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
+                    else: setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
 
         ### 1x SPRING; Now with angular limits circular placement is not required for plastic deformability anymore
         if CT == 19 or CT == 20 or CT == 21 or CT == 22 or CT == 23:
             constCount = 1; correction = 2   # Generic constraints detach already when less force than the breaking threshold is applied (the factor for springs without locks is 0.5) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueP
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
             if version_spring == 1:
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount
             else:  # Later versions use "spring2" which need different formulas to achieve the same behavior
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount /2
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
             if qUpdateComplete:
                 ### Enable linear and angular spring
-                setConstParams(cData,cDatb,cDef, loc=loc, ct='GENERIC_SPRING')
+                setConstParams(cTab,cIdx, loc=loc, ct='GENERIC_SPRING')
             # Disable springs on start (requires plastic activation during simulation, comment out if not required)
-            setConstParams(cData,cDatb,cDef, e=0)
+            setConstParams(cTab,cIdx, e=0)
             if props.asciiExport:
                 # Enable springs on start (if this spring is not for plastic deformation, comment out if not required)
-                #setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
+                #setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
                 # Disable springs on start (requires plastic activation during simulation, comment out if not required)
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
 
         ###### Springs only CTs
 
@@ -1235,8 +1182,8 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
             for j in range(3):
 
                 ### First constraint
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres1, ub=ub, dc=dc, rot=rotN, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres1, ub=ub, dc=dc, rot=rotN, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1246,14 +1193,13 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Lock direction for compressive force and enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=llxl,llxu=99999, ulax=0,ulay=0,ulaz=0)
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=llxl,llxu=99999, ulax=0,ulay=0,ulaz=0)
                 if props.asciiExport:
-                    setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                    setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
                     
                 ### Second constraint
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres2, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres2, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1263,14 +1209,13 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Lock direction for tensile force and enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=-99999,llxu=llxu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=-99999,llxu=llxu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
                 if props.asciiExport:
-                    setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                    setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
 
                 ### Third constraint
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres3, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres3, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1280,10 +1225,9 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Lock directions for shearing force and enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=0,ully=1,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=0,ully=1,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
                 if props.asciiExport:
-                    setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                    setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
 
         ### 3 x 4x SPRING; Compressive (1D), tensile (1D), shearing (2D) breaking thresholds; circular placed for plastic deformability
         if CT == 14:
@@ -1304,8 +1248,8 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
             for j in range(4):
 
                 ### First constraint
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres1, ub=ub, dc=dc, rot=rotN, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres1, ub=ub, dc=dc, rot=rotN, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1316,14 +1260,13 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Lock direction for compressive force and enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=llxl,llxu=99999, ulax=0,ulay=0,ulaz=0)
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=llxl,llxu=99999, ulax=0,ulay=0,ulaz=0)
                 if props.asciiExport:
-                    setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                    setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
 
                 ### Second constraint
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres2, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres2, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1334,14 +1277,13 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Lock direction for tensile force and enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=-99999,llxu=llxu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=1,ully=0,ullz=0, llxl=-99999,llxu=llxu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
                 if props.asciiExport:
-                    setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                    setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
 
                 ### Third constraint
-                cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
-                setConstParams(cData,cDatb,cDef, bt=brkThres3, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
+                cIdx = consts[cInc]; cInc += 1
+                setConstParams(cTab,cIdx, bt=brkThres3, ub=ub, dc=dc, rot=rotN, so=so,si=si, sslx=springStiff,ssly=springStiff,sslz=springStiff)
                 if qUpdateComplete:
                     rotm = 'QUATERNION'
                     ### Rotate constraint matrix
@@ -1352,89 +1294,85 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                     vec.rotate(rotN)
                     locN = Vector(loc) +vec
                     ### Lock directions for shearing force and enable linear spring
-                    setConstParams(cData,cDatb,cDef, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=0,ully=1,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
+                    setConstParams(cTab,cIdx, loc=locN,rotm=rotm, ct='GENERIC_SPRING', ullx=0,ully=1,ullz=1, llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=0,ulaz=0, uslx=1,usly=1,uslz=1, sdlx=springDamp,sdly=springDamp,sdlz=springDamp)
                 if props.asciiExport:
-                    setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
-                constsData.append([cData, cDatb])
+                    setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
 
         ### 1x SPRING; All degrees of freedom with plastic deformability
         if CT == 24:
             constCount = 1; correction = 2   # Generic constraints detach already when less force than the breaking threshold is applied (the factor for springs without locks is 0.5) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueC
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
             if version_spring == 1:
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount
             else:  # Later versions use "spring2" which need different formulas to achieve the same behavior
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount /2
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=1,usly=1,uslz=1, sslx=springStiff,ssly=springStiff,sslz=springStiff, sdlx=springDamp,sdly=springDamp,sdlz=springDamp, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
             if qUpdateComplete:
                 ### Enable linear and angular spring
-                setConstParams(cData,cDatb,cDef, loc=loc, ct='GENERIC_SPRING')
+                setConstParams(cTab,cIdx, loc=loc, ct='GENERIC_SPRING')
             # Disable springs on start (requires plastic activation during simulation, comment out if not required)
-            #setConstParams(cData,cDatb,cDef, e=0)
+            #setConstParams(cTab,cIdx, e=0)
             if props.asciiExport:
                 # Enable springs on start (if this spring is not for plastic deformation, comment out if not required)
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
                 # Disable springs on start (requires plastic activation during simulation, comment out if not required)
-                #setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
-            constsData.append([cData, cDatb])
+                #setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
 
         ### 1x SPRING; Bending + torsion (1D) breaking thresholds with plastic deformability
         if CT == 25:
             constCount = 1; correction = 2   # Generic constraints detach already when less force than the breaking threshold is applied (the factor for springs without locks is 0.5) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueP
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
             if version_spring == 1:
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount
             else:  # Later versions use "spring2" which need different formulas to achieve the same behavior
                 springStiff = value *btMultiplier /(springLength *tol2dist) *correction /constCount /2
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=0,usly=0,uslz=0, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si, uslx=0,usly=0,uslz=0, usax=1,usay=1,usaz=1, ssax=springStiff,ssay=springStiff,ssaz=springStiff, sdax=springDamp,sday=springDamp,sdaz=springDamp)
             if qUpdateComplete:
                 ### Enable linear and angular spring
-                setConstParams(cData,cDatb,cDef, loc=loc, ct='GENERIC_SPRING')
+                setConstParams(cTab,cIdx, loc=loc, ct='GENERIC_SPRING')
             # Disable springs on start (requires plastic activation during simulation, comment out if not required)
-            #setConstParams(cData,cDatb,cDef, e=0)
+            #setConstParams(cTab,cIdx, e=0)
             if props.asciiExport:
                 # Enable springs on start (if this spring is not for plastic deformation, comment out if not required)
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC",tol2dist,tol2rot])
                 # Disable springs on start (requires plastic activation during simulation, comment out if not required)
-                #setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
-            constsData.append([cData, cDatb])
+                #setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,tol1rot], tol2=["PLASTIC_OFF",tol2dist,tol2rot])
 
         ### 1x HINGE; Linear omni-directional + bending XY breaking threshold
         if CT == 26:
             ### First constraint
             constCount = 1; correction = 2.2   # Generic constraints detach already when less force than the breaking threshold is applied (around a factor of 0.455) so we multiply our threshold by this correctional value
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             value = brkThresValueC
             brkThres = value *btMultiplier /rbw_steps_per_second *rbw_time_scale *correction /constCount
-            setConstParams(cData,cDatb,cDef, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
+            setConstParams(cTab,cIdx, bt=brkThres, ub=ub, dc=dc, rot=rotN, so=so,si=si)
             if qUpdateComplete:
                 rotm = 'QUATERNION'
                 ### Lock all directions for the compressive force
                 ### I left Y and Z unlocked because for this CT we have no separate breaking threshold for lateral force, the tensile constraint and its breaking threshold should apply for now
                 ### Also rotational forces should only be carried by the tensile constraint
-                setConstParams(cData,cDatb,cDef, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=1,ullz=1, llxl=llxl,llxu=llxu,llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=1,ulaz=1, layl=layl,layu=layu,lazl=lazl,lazu=lazu)
+                setConstParams(cTab,cIdx, loc=loc,rotm=rotm, ct='GENERIC', ullx=1,ully=1,ullz=1, llxl=llxl,llxu=llxu,llyl=llyl,llyu=llyu,llzl=llzl,llzu=llzu, ulax=0,ulay=1,ulaz=1, layl=layl,layu=layu,lazl=lazl,lazu=lazu)
                 # Disable angular tolerances in build data array (required for monitor)
                 connectsTol[-1] = [tol1dist, -1, tol2dist, -1]
             if props.asciiExport:
-                setConstParams(cData,cDatb,cDef, tol1=["TOLERANCE",tol1dist,-1])
-            constsData.append([cData, cDatb])
+                setConstParams(cTab,cIdx, tol1=["TOLERANCE",tol1dist,-1])
 
         ###### Special CTs
         
         ### 1x GENERIC; Constraint for permanent collision suppression and no influence otherwise
         if CT != 0 and (props.disableCollisionPerm or disColPerm):
-            cData = {}; cDatb = []; cIdx = consts[cInc]; cInc += 1
+            cIdx = consts[cInc]; cInc += 1
             constCount = 1; correction = 1  # No correction required for this constraint type
-            setConstParams(cData,cDatb,cDef, loc=loc, bt=-1, ub=0, dc=1, ct='GENERIC')
-            constsData.append([cData, cDatb])
+            setConstParams(cTab,cIdx, loc=loc, bt=-1, ub=0, dc=1, ct='GENERIC')
 
     print()
-    if len(emptyObjs) != len(constsData):
-        print("WARNING: Size mismatch: emptyObjs, constsData;", len(emptyObjs), len(constsData))
+    reportBrkThresExpressionErrors(brkThresExprs)
+    if len(emptyObjs) != cTab.getUsedCount():
+        print("WARNING: Size mismatch: emptyObjs, cTab;", len(emptyObjs), cTab.getUsedCount())
     if len(connectsPair) != len(connectsTol):
         print("WARNING: Size mismatch: connectsPair, connectsTol;", len(connectsPair), len(connectsTol))
 
@@ -1448,45 +1386,29 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
         objB = objs[pair[1]]
         i = 1
         for cIdx in consts:
-            cData, cDatb = constsData[cIdx]
             name = "Con.%03d.%d" %(k, i)
             # Store names and objects
-            setConstParams(cData,cDatb,cDef, name=name, obj1=objA, obj2=objB)
+            setConstParams(cTab,cIdx, name=name, obj1=objA, obj2=objB)
             i += 1
 
     if not props.asciiExport:
 
         ### Write constraint settings into constraint objects
         print("Writing constraint settings into empty objects... (%d)" %len(emptyObjs))
-        emptyObjs_iter = iter(emptyObjs)
-        constsData_iter = iter(constsData)
-        for k in range(len(emptyObjs)):
-            sys.stdout.write('\r' +"%d" %k)
-            # Update progress bar
-            bpy.context.window_manager.progress_update(k /len(emptyObjs))
-            
-            objConst = next(emptyObjs_iter)
-            cData, cDatb = next(constsData_iter)
-            
-            ### Write empty object parameters (BCB specific attributes, commented out lines are defined elsewhere)
-            if cDatb != None and objConst != None:
-                if cDatb[0] != None: objConst.name                          = cDatb[0]
-                if cDatb[1] != None: objConst.location                      = cDatb[1]
-                if cDatb[2] != None: objConst.rigid_body_constraint.object1 = cDatb[2]
-                if cDatb[3] != None: objConst.rigid_body_constraint.object2 = cDatb[3]
-                if cDatb[6] != None: objConst.rotation_mode                 = cDatb[6]
-                if cDatb[7] != None: objConst.rotation_quaternion           = cDatb[7]
-            
-            ### Overwrite default constraint settings with new and different settings
-            if objConst != None:
-                setAttribsOfConstraint(objConst.rigid_body_constraint, cData)
-        print()
+        # Attributes are written column-wise, see setAttribsOfConstraints() (optimization)
+        setAttribsOfConstraints(emptyObjs, cTab)
 
         # Update names in database in case they were changed
         scene["bcb_emptyObjs"] = [obj.name for obj in emptyObjs if obj != None]
 
         ### Calculating constraint widgets for drawing
         print("Calculating constraint widgets for drawing... (%d)" %len(connectsPair))
+        ### Flag constraints which are scaled to the contact area (generic or enabled spring)
+        constTypes = cTab.getColumnArray("type")
+        qConstDirectional = ((constTypes == 'GENERIC') | ((constTypes == 'GENERIC_SPRING') & cTab.getColumnArray("enabled"))).tolist()
+        brkThres = cTab.getColumnArray("breaking_threshold")
+        qLinY = cTab.getColumnArray("use_limit_lin_y"); qLinZ = cTab.getColumnArray("use_limit_lin_z")
+        qAngY = cTab.getColumnArray("use_limit_ang_y"); qAngZ = cTab.getColumnArray("use_limit_ang_z")
         connectsConsts_iter = iter(connectsConsts)
         connectsGeo_iter = iter(connectsGeo)
         for k in range(len(connectsPair)):
@@ -1503,19 +1425,24 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
             h = geoHeight *1000
             w = geoWidth *1000
             
-            ### Gather values from constraints
+            ### Gather values from constraint data in memory instead of reading them back from the constraints (optimization)
             yl = 0; zl = 0; ya = 0; za = 0
             for cIdx in consts:
                 objConst = emptyObjs[cIdx]
                 if objConst != None:
-                    constData = objConst.rigid_body_constraint
-                    if constData.type == 'GENERIC' or (constData.type == 'GENERIC_SPRING' and constData.enabled):
+                    # On partial updates type and limits are unchanged, so they are read from the constraint instead
+                    if not qConstsComplete[cIdx]:
+                        const = objConst.rigid_body_constraint
+                        qConstDirectional[cIdx] = const.type == 'GENERIC' or (const.type == 'GENERIC_SPRING' and const.enabled)
+                        qLinY[cIdx] = const.use_limit_lin_y; qLinZ[cIdx] = const.use_limit_lin_z
+                        qAngY[cIdx] = const.use_limit_ang_y; qAngZ[cIdx] = const.use_limit_ang_z
+                    if qConstDirectional[cIdx]:
                         # Use shearing thresholds as base for empty scaling
-                        if constData.use_limit_lin_y: yl = constData.breaking_threshold
-                        if constData.use_limit_lin_z: zl = constData.breaking_threshold
+                        if qLinY[cIdx]: yl = brkThres[cIdx]
+                        if qLinZ[cIdx]: zl = brkThres[cIdx]
                         # Use bending thresholds as base for empty scaling (reminder: axis swapped)
-                        if constData.use_limit_ang_y: za = constData.breaking_threshold
-                        if constData.use_limit_ang_z: ya = constData.breaking_threshold
+                        if qAngY[cIdx]: za = brkThres[cIdx]
+                        if qAngZ[cIdx]: ya = brkThres[cIdx]
             ### Calculate new scaling from values
             if yl > 0 and zl > 0: aspect = yl /zl
             else: aspect = 1
@@ -1539,14 +1466,13 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
                 cIdx = consts[idx]
                 objConst = emptyObjs[cIdx]
                 if objConst != None:
-                    constData = objConst.rigid_body_constraint
                     #objConst.object.empty_draw_type = 'CUBE'  # This is set before duplication for performance reasons
                     objConst.empty_draw_size = .502  # Scale size slightly larger to make lines visible over solid elements
                     if props.disableCollisionPerm and idx == idxLast:  # Use simple if constraint is for permanent collision suppression
                         objConst.scale = axs_s
                     else:
                         # Scale the cube to the dimensions of the connection area
-                        if constCnt > 1 and (constData.type == 'GENERIC' or (constData.type == 'GENERIC_SPRING' and constData.enabled)):
+                        if constCnt > 1 and qConstDirectional[cIdx]:
                               objConst.scale = axs
                         else: objConst.scale = axs_s
         print()
@@ -1554,24 +1480,23 @@ def setConstraintSettings(objs, objsEGrp, emptyObjs, objsID, connectsPair, conne
     elif props.asciiExport:
 
         ### Fill empty constraint list with names of the objects for later use in Postprocessing Tools
-        constsData_iter = iter(constsData)
+        names = cTab.base[0]
         for k in range(len(emptyObjs)):
-            cData, cDatb = next(constsData_iter)
-            if cDatb != None:
-                if cDatb[0] != None: emptyObjs[k] = cDatb[0]
+            if names[k] != None: emptyObjs[k] = names[k]
 
         ### Export constraint settings
         print("Exporting constraint settings... (%d)" %len(emptyObjs))
         # Data structure of exData is basically an array of empty.rigid_body_constraint (a diff of attributes)
         # together with some BCB specific custom properties which have to be interpreted accordingly.
+        # Rows are only unpacked from the constraint table here, right before packing
         exData = []
-        constsData_iter = iter(constsData)
         for k in range(len(emptyObjs)):
             sys.stdout.write('\r' +"%d" %k)
             # Update progress bar
             bpy.context.window_manager.progress_update(k /len(emptyObjs))
             
-            cData, cDatb = next(constsData_iter)
+            row = cTab.row(k)
+            cData = row.data(); cDatb = row.base()
             ### Prepare data to be packed
             if cDatb != None and objConst != None:
                 if cDatb[1] != None: cDatb[1] = cDatb[1].to_tuple()          # loc
@@ -0,0 +1,171 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import array
+import numpy as np
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+### Constraint attributes managed by the table (compatible with Blender class, same order as in setConstParams())
+constTableAttribs = [
+    "enabled", "breaking_threshold", "use_breaking", "disable_collisions", "type", "use_override_solver_iterations", "solver_iterations",
+    "use_limit_lin_x", "use_limit_lin_y", "use_limit_lin_z", "limit_lin_x_lower", "limit_lin_x_upper", "limit_lin_y_lower", "limit_lin_y_upper", "limit_lin_z_lower", "limit_lin_z_upper",
+    "use_limit_ang_x", "use_limit_ang_y", "use_limit_ang_z", "limit_ang_x_lower", "limit_ang_x_upper", "limit_ang_y_lower", "limit_ang_y_upper", "limit_ang_z_lower", "limit_ang_z_upper",
+    "use_spring_x", "use_spring_y", "use_spring_z", "spring_damping_x", "spring_damping_y", "spring_damping_z", "spring_stiffness_x", "spring_stiffness_y", "spring_stiffness_z",
+    "use_spring_ang_x", "use_spring_ang_y", "use_spring_ang_z", "spring_damping_ang_x", "spring_damping_ang_y", "spring_damping_ang_z", "spring_stiffness_ang_x", "spring_stiffness_ang_y", "spring_stiffness_ang_z"
+    ]
+
+### Base parameters (BCB specific): name, loc, obj1, obj2, tol1, tol2, rotm, rot
+constTableBaseCnt = 8
+
+################################################################################
+
+class constTableRow():
+
+    ### Lightweight view on a single constraint of a constraint table for code which needs per-constraint access
+    # Attributes can be read directly, e.g. row.breaking_threshold (defaults are returned for unchanged attributes)
+    __slots__ = ("table", "idx")
+
+    def __init__(self, table, idx):
+        self.table = table
+        self.idx = idx
+
+    def __getattr__(self, attr):
+        try: return self.table.get(self.idx, attr)
+        except KeyError: raise AttributeError(attr)
+
+    def data(self):
+        return self.table.getData(self.idx)
+
+    def base(self):
+        return self.table.getBase(self.idx)
+
+########################################
+
+class constTable():
+
+    ### Columnar in-memory table of constraint settings replacing one [dict, list] pair per constraint (optimization)
+    # Every attribute is stored in a typed column pre-filled with the default value, a bitmask per row
+    # marks the attributes which differ from the defaults (only these need to be written or exported)
+
+    def __init__(self, cDef, rowCnt):
+        self.cDef = cDef
+        self.rowCnt = rowCnt
+        self.attribs = [attr for attr in constTableAttribs if attr in cDef]
+        self.bits = {}
+        self.types = {}
+        self.cols = {}
+        for i in range(len(self.attribs)):
+            attr = self.attribs[i]
+            value = cDef[attr]
+            self.bits[attr] = 1 <<i
+            if isinstance(value, bool):    typecode = 'B'
+            elif isinstance(value, int):   typecode = 'i'
+            elif isinstance(value, float): typecode = 'd'
+            else:                          typecode = None  # Strings (enums) are stored in plain lists
+            self.types[attr] = typecode
+            if typecode != None: self.cols[attr] = array.array(typecode, [value]) *rowCnt
+            else:                self.cols[attr] = [value] *rowCnt
+        self.mask = array.array('Q', [0]) *rowCnt      # Attributes differing from defaults
+        self.used = array.array('B', [0]) *rowCnt      # Rows for which settings have been generated
+        ### Base parameters
+        self.base = [[None] *rowCnt for i in range(constTableBaseCnt)]
+
+    def __len__(self):
+        return self.rowCnt
+
+    def row(self, idx):
+        return constTableRow(self, idx)
+
+    ########################################
+
+    def setBase(self, idx, name=None, loc=None, obj1=None, obj2=None, tol1=None, tol2=None, rotm=None, rot=None):
+        self.used[idx] = 1
+        base = self.base
+        if name != None: base[0][idx] = name
+        if loc  != None: base[1][idx] = loc
+        if obj1 != None: base[2][idx] = obj1
+        if obj2 != None: base[3][idx] = obj2
+        if tol1 != None: base[4][idx] = tol1
+        if tol2 != None: base[5][idx] = tol2
+        if rotm != None: base[6][idx] = rotm
+        if rot  != None: base[7][idx] = rot
+
+    def set(self, idx, attr, value):
+        # Only store values which are different from the defaults
+        if value != self.cDef[attr]:
+            self.cols[attr][idx] = value
+            self.mask[idx] |= self.bits[attr]
+
+    ########################################
+
+    def get(self, idx, attr):
+        value = self.cols[attr][idx]
+        if self.types[attr] == 'B': return bool(value)
+        return value
+
+    def getBase(self, idx):
+        return [col[idx] for col in self.base]
+
+    def getData(self, idx):
+        ### Dictionary of all attributes which differ from the defaults (same as the former cData)
+        data = {}
+        mask = self.mask[idx]
+        if mask:
+            for attr in self.attribs:
+                if mask &self.bits[attr]: data[attr] = self.get(idx, attr)
+        return data
+
+    def getColumn(self, attr):
+        ### Row indices and values of all rows for which the given attribute differs from the default
+        if self.rowCnt == 0: return [], []
+        bit = np.uint64(self.bits[attr])
+        idxs = np.nonzero(np.frombuffer(self.mask, dtype=np.uint64) &bit)[0].tolist()
+        col = self.cols[attr]
+        if self.types[attr] == 'B': values = [bool(col[i]) for i in idxs]
+        else:                       values = [col[i] for i in idxs]
+        return idxs, values
+
+    def getColumnArray(self, attr):
+        ### Complete column as NumPy array (shared memory for typed columns)
+        col = self.cols[attr]
+        if self.types[attr] == 'B': return np.frombuffer(col, dtype=np.uint8).astype(np.bool_)
+        if self.types[attr] == 'i': return np.frombuffer(col, dtype=np.intc)
+        if self.types[attr] == 'd': return np.frombuffer(col, dtype=np.float64)
+        return np.array(col)
+
+    def getUsedCount(self):
+        return sum(self.used)
@@ -0,0 +1,329 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import multiprocessing, sys
+import numpy as np
+from multiprocessing import sharedctypes
+
+# This module must not import bpy or any module depending on it because its functions
+# are executed by worker processes outside of Blender (plain Python with NumPy)
+
+### Geometry buffers and settings of the current process (set by setBuffers())
+bufs = {}
+cfg = {}
+
+################################################################################
+
+def toShared(arr):
+
+    ### Copy NumPy array into shared memory so worker processes can access it without pickling the data
+    arr = np.ascontiguousarray(arr)
+    raw = sharedctypes.RawArray('b', max(1, arr.nbytes))
+    np.frombuffer(raw, dtype=np.int8, count=arr.nbytes)[:] = arr.view(np.int8).ravel()
+    return raw, arr.dtype.str, arr.shape
+
+########################################
+
+def fromShared(item):
+
+    ### Wrap shared memory as NumPy array (no copy)
+    raw, dtype, shape = item
+    count = 1
+    for dim in shape: count *= dim
+    return np.frombuffer(raw, dtype=np.dtype(dtype), count=count).reshape(shape)
+
+########################################
+
+def setBuffers(geoBufs, settings):
+
+    ### Set geometry buffers and settings to be used by the contact area functions of this process
+    global bufs, cfg
+    bufs = geoBufs
+    cfg = settings
+
+########################################
+
+def poolInit(sharedBufs, settings):
+
+    ### Initialize worker process with shared geometry buffers and settings
+    geoBufs = {}
+    for name, item in sharedBufs.items():
+        geoBufs[name] = fromShared(item)
+    setBuffers(geoBufs, settings)
+
+################################################################################
+
+def boundaryBoxFacesBuf(i, selMin, selMax):
+
+    ### Calculate boundary box of faces within a given boundary box for element i (buffer based version of boundaryBoxFaces())
+    faceOffs = bufs["faceOffs"]
+    f0 = faceOffs[i]; f1 = faceOffs[i +1]
+    centers = bufs["faceCenters"][f0:f1]
+    mask = (centers[:, 0] < selMax[0]) & (centers[:, 0] > selMin[0]) \
+         & (centers[:, 1] < selMax[1]) & (centers[:, 1] > selMin[1]) \
+         & (centers[:, 2] < selMax[2]) & (centers[:, 2] > selMin[2])
+    if not mask.any():
+        return None, None, None, 0
+    selArea = float(bufs["faceAreas"][f0:f1][mask].sum())
+
+    ### Calculate boundary box corners of the vertices of all selected faces
+    loopOffs = bufs["loopOffs"]
+    l0 = loopOffs[i]; l1 = loopOffs[i +1]
+    loopMask = mask[bufs["loopFaces"][l0:l1]]
+    cos = bufs["cos"][bufs["vertOffs"][i] +bufs["loopVerts"][l0:l1][loopMask]]
+    bbMin = cos.min(axis=0).tolist()
+    bbMax = cos.max(axis=0).tolist()
+    bbCenter = [(bbMin[j] +bbMax[j]) /2 for j in range(3)]
+    
+    return bbMin, bbMax, bbCenter, selArea
+
+########################################
+
+def calculateContactAreaForPairBuf(a, b, sDistFallb, qNonManifold, qAccurate):
+
+    ###### Calculate contact area for a single pair of elements
+    searchDist = cfg["searchDistance"]
+    searchDistMesh = cfg["searchDistanceMesh"]
+    surfaceForced = cfg["surfaceForced"]
+    surfaceThickness = cfg["surfaceThickness"]
+    minimumContactArea = cfg["minimumContactArea"]
+
+    ### Get boundary box corners
+    bbs = bufs["bbs"]
+    bbAMin = bbs[a, :3].tolist(); bbAMax = bbs[a, 3:].tolist()
+    bbBMin = bbs[b, :3].tolist(); bbBMax = bbs[b, 3:].tolist()
+
+    ### Determine faces within search range of both objects and return their surface area
+    geoContactAreaF = 0
+    qSkipConnect = 0
+    if qAccurate:
+        # Create new faces bbox for A for faces within searchDistMesh range of bbox B
+        bbBMinSDM = [v -searchDistMesh for v in bbBMin]
+        bbBMaxSDM = [v +searchDistMesh for v in bbBMax]
+        bbAMinF, bbAMaxF, bbACenterF, areaA = boundaryBoxFacesBuf(a, bbBMinSDM, bbBMaxSDM)
+        # Create new faces bbox for B for faces within searchDistMesh range of bbox A
+        bbAMinSDM = [v -searchDistMesh for v in bbAMin]
+        bbAMaxSDM = [v +searchDistMesh for v in bbAMax]
+        bbBMinF, bbBMaxF, bbBCenterF, areaB = boundaryBoxFacesBuf(b, bbAMinSDM, bbAMaxSDM)
+        # Create new faces bbox for A for faces within searchDist range of bbox B
+        bbBMinSD = [v -searchDist for v in bbBMin]
+        bbBMaxSD = [v +searchDist for v in bbBMax]
+        bbAMinF2, bbAMaxF2, bbACenterF2, areaA2 = boundaryBoxFacesBuf(a, bbBMinSD, bbBMaxSD)
+        # Create new faces bbox for B for faces within searchDist range of bbox A
+        bbAMinSD = [v -searchDist for v in bbAMin]
+        bbAMaxSD = [v +searchDist for v in bbAMax]
+        bbBMinF2, bbBMaxF2, bbBCenterF2, areaB2 = boundaryBoxFacesBuf(b, bbAMinSD, bbAMaxSD)
+
+        ### Check if detected contact area is implausible high compared to the total surface area of the objects
+        areaAtot = bufs["areaTots"][a]
+        areaBtot = bufs["areaTots"][b]
+        if areaA >= areaAtot /2 or areaB >= areaBtot /2: 
+            if areaA > 0:
+                if areaA < areaAtot /2: geoContactAreaF = areaA
+                bbAMin, bbAMax = bbAMinF, bbAMaxF
+            if areaB > 0:
+                if areaB < areaBtot /2: geoContactAreaF = areaB
+                bbBMin, bbBMax = bbBMinF, bbBMaxF
+        # Use the smallest detected area of both objects as contact area
+        elif areaA > 0 and areaB > 0:
+            geoContactAreaF = min(areaA, areaB)
+            bbAMin, bbAMax = bbAMinF, bbAMaxF
+            bbBMin, bbBMax = bbBMinF, bbBMaxF
+        # Or if only one area is greater zero then use that one
+        elif areaA > 0:
+            geoContactAreaF = areaA
+            bbAMin, bbAMax = bbAMinF, bbAMaxF
+        elif areaB > 0:
+            geoContactAreaF = areaB
+            bbBMin, bbBMax = bbBMinF, bbBMaxF
+        ### Alternatively use regular search distance face areas to derive locations from (but not for contact area as it may be too inaccurate)
+        # Use the smallest detected area of both objects as contact area
+        elif sDistFallb and areaA2 > 0 and areaB2 > 0:
+            bbAMin, bbAMax = bbAMinF2, bbAMaxF2
+            bbBMin, bbBMax = bbBMinF2, bbBMaxF2
+        # Or if only one area is greater zero then use that one
+        elif sDistFallb and areaA2 > 0:
+            bbAMin, bbAMax = bbAMinF2, bbAMaxF2
+        elif sDistFallb and areaB2 > 0:
+            bbBMin, bbBMax = bbBMinF2, bbBMaxF2
+        elif not sDistFallb: qSkipConnect = 1
+
+        ### Calculate overlap of face based boundary boxes rather than simple boundary box overlap
+        if areaA > 0 and areaB > 0:
+            overlapF = [min(bbAMaxF[j],bbBMaxF[j]) -max(bbAMinF[j],bbBMinF[j]) for j in range(3)]
+            # If one axis is out of search distance range then fall back to simple boundary box based overlap
+            if min(overlapF) < -searchDistMesh:
+                  qSkipConnect = 1
+            else: overlapX, overlapY, overlapZ = [max(0,v) for v in overlapF]
+        if areaA > 0:
+            overlapF = [min(bbAMaxF[j],bbBMax[j]) -max(bbAMinF[j],bbBMin[j]) for j in range(3)]
+            # If one axis is out of search distance range then fall back to simple boundary box based overlap
+            if min(overlapF) < -searchDistMesh:
+                  qSkipConnect = 1
+            else: overlapX, overlapY, overlapZ = [max(0,v) for v in overlapF]
+        if areaB > 0:
+            overlapF = [min(bbAMax[j],bbBMaxF[j]) -max(bbAMin[j],bbBMinF[j]) for j in range(3)]
+            # If one axis is out of search distance range then fall back to simple boundary box based overlap
+            if min(overlapF) < -searchDistMesh:
+                  qSkipConnect = 1
+            else: overlapX, overlapY, overlapZ = [max(0,v) for v in overlapF]
+        ### Alternatively use overlap of face based boundary boxes based on regular search distance
+        elif sDistFallb and areaA2 > 0 and areaB2 > 0:
+            overlapF = [min(bbAMaxF2[j],bbBMaxF2[j]) -max(bbAMinF2[j],bbBMinF2[j]) for j in range(3)]
+            # If one axis is out of search distance range then fall back to simple boundary box based overlap
+            if min(overlapF) < -searchDist:
+                  qSkipConnect = 1
+            else: overlapX, overlapY, overlapZ = [max(0,v) for v in overlapF]
+        elif sDistFallb and areaA2 > 0:
+            overlapF = [min(bbAMaxF2[j],bbBMax[j]) -max(bbAMinF2[j],bbBMin[j]) for j in range(3)]
+            # If one axis is out of search distance range then fall back to simple boundary box based overlap
+            if min(overlapF) < -searchDist:
+                  qSkipConnect = 1
+            else: overlapX, overlapY, overlapZ = [max(0,v) for v in overlapF]
+        elif sDistFallb and areaB2 > 0:
+            overlapF = [min(bbAMax[j],bbBMaxF2[j]) -max(bbAMin[j],bbBMinF2[j]) for j in range(3)]
+            # If one axis is out of search distance range then fall back to simple boundary box based overlap
+            if min(overlapF) < -searchDist:
+                  qSkipConnect = 1
+            else: overlapX, overlapY, overlapZ = [max(0,v) for v in overlapF]
+        elif not sDistFallb: qSkipConnect = 1
+                
+    if not qAccurate or qSkipConnect or sDistFallb:
+        ### Calculate simple overlap of boundary boxes for contact area calculation (project along all axis')
+        # Include minimumContactArea for rare cases of edge-to-edge contact where we don't want to get zero as result
+        overlapX, overlapY, overlapZ = [max(0, min(bbAMax[j],bbBMax[j]) -max(bbAMin[j],bbBMin[j]) +2*minimumContactArea) for j in range(3)]
+
+    if not qSkipConnect or surfaceForced:
+
+        ### Calculate area based on either the sum of all axis surfaces...
+        if not qNonManifold or sDistFallb:
+            overlapAreaX = overlapY *overlapZ
+            overlapAreaY = overlapX *overlapZ
+            overlapAreaZ = overlapX *overlapY
+            # Add up all contact areas
+            geoContactAreaB = overlapAreaX +overlapAreaY +overlapAreaZ
+                
+        ### Or calculate contact area based on predefined custom thickness
+        if qNonManifold:
+            if surfaceForced:
+                geoContactAreaB = (overlapX +overlapY +overlapZ) *surfaceThickness
+            elif not sDistFallb:
+                geoContactAreaB = 0
+
+        ### Calculate alternative contact area from object dimensions
+        dimA = bufs["dims"][a].tolist()
+        dimB = bufs["dims"][b].tolist()
+        # We use the surface area of the smallest side since we don't want to artificially strengthen the structure in case later sanity check fails
+        areaA = min(min(dimA[0]*dimA[1], dimA[0]*dimA[2]), dimA[1]*dimA[2])
+        areaB = min(min(dimB[0]*dimB[1], dimB[0]*dimB[2]), dimB[1]*dimB[2])
+        geoContactAreaD = min(areaA, areaB)
+
+        ### Sanity check: in case no boundary box intersection is found use element dimensions based contact area as fallback 
+        if geoContactAreaB > 0: geoContactArea = geoContactAreaB
+        else:                   geoContactArea = geoContactAreaD
+
+        # Sanity check: contact area based on faces is expected to be smaller than boundary box and dimensions contact area, only then use face based contact area
+        qVolCorrect = 0
+        if geoContactAreaF < geoContactArea and geoContactAreaF > 0:
+            geoContactArea = geoContactAreaF
+        elif not qNonManifold:
+            qVolCorrect = 1
+        
+        ### Find out element thickness to be used for bending threshold calculation 
+        if geoContactAreaB > 0:
+            geo = [overlapX, overlapY, overlapZ]
+            geoAxis = [1, 2, 3]
+            geo, geoAxis = zip(*sorted(zip(geo, geoAxis)))
+            geoHeight = geo[1]  # First item = mostly 0, second item = thickness/height, third item = width 
+            geoWidth = geo[2]
+        else:
+            geoAxis = [0, 0, 0]
+            geoHeight = geoContactArea**0.5
+            geoWidth = geoHeight
+        
+        # Add custom thickness to contact area (only for manifolds as it is already included in non-manifolds)
+        if not qNonManifold:
+            geoContactArea += geoWidth *surfaceThickness
+        
+        ### Use center of contact area boundary box as constraints location
+        center = [(max(bbAMin[j],bbBMin[j]) + min(bbAMax[j],bbBMax[j])) /2 for j in range(3)]
+
+        return geoContactArea, geoHeight, geoWidth, center, geoAxis, qVolCorrect
+
+    return 0, 0, 0, [0,0,0], [1,2,3], 0  # Dummy data, connection will be remove later because of zero area anyway
+
+########################################
+
+def calculateContactAreaChunk(chunk):
+
+    ### Calculate contact area for a range of connections (executed in-process or by worker processes)
+    start, end = chunk
+    pairs = bufs["pairs"]
+    sDistFallbs = bufs["sDistFallbs"]
+    nonManifolds = bufs["nonManifolds"]
+    qAccurate = cfg["qAccurate"]
+    connectsGeo = np.zeros((end -start, 7))
+    connectsLoc = np.zeros((end -start, 3))
+    for k in range(start, end):
+        a, b = pairs[k]
+        if a < 0: continue  # Connection without element group
+        qNonManifold = nonManifolds[a] or nonManifolds[b]
+        geoContactArea, geoHeight, geoWidth, center, geoAxis, qVolCorrect = calculateContactAreaForPairBuf(a, b, sDistFallbs[k], qNonManifold, qAccurate)
+        # Geometry array: [area, height, width, axisNormal, axisHeight, axisWidth, qVolCorrect]
+        connectsGeo[k -start] = [geoContactArea, geoHeight, geoWidth, geoAxis[0], geoAxis[1], geoAxis[2], qVolCorrect]
+        connectsLoc[k -start] = center
+    return connectsGeo, connectsLoc
+
+################################################################################
+
+def calculateContactAreaParallel(sharedBufs, settings, connectCnt, processCnt, pythonPath=None):
+
+    ### Distribute contact area calculation on a pool of worker processes, returns geometry and location arrays
+    # Small chunks keep all processes busy until the end, but not too small to limit communication overhead
+    chunkSize = max(1, min(5000, int(connectCnt /(processCnt *8)) +1))
+    chunks = [(start, min(start +chunkSize, connectCnt)) for start in range(0, connectCnt, chunkSize)]
+    
+    ctx = multiprocessing.get_context('spawn')
+    # Blender's own executable can't be used to spawn workers, use its bundled Python instead
+    if pythonPath != None: ctx.set_executable(pythonPath)
+    pool = ctx.Pool(processCnt, initializer=poolInit, initargs=(sharedBufs, settings))
+    try:
+        connectsGeo = []; connectsLoc = []
+        for i, (geo, loc) in enumerate(pool.imap(calculateContactAreaChunk, chunks)):
+            connectsGeo.append(geo); connectsLoc.append(loc)
+            sys.stdout.write('\r' +"%d" %chunks[i][1])
+        print()
+    finally:
+        pool.terminate()
+    
+    if len(connectsGeo): return np.concatenate(connectsGeo), np.concatenate(connectsLoc)
+    else:                return np.zeros((0, 7)), np.zeros((0, 3))
@@ -30,7 +30,8 @@
 
 ################################################################################
 
-import bpy, mathutils, pickle, zlib, base64, os
+import bpy, mathutils, pickle, zlib, base64, os, sys, hashlib
+import numpy as np
 from mathutils import Vector
 import global_vars
 
@@ -92,6 +93,35 @@ def dataFromFile(pathName, qPickle=True, qCompressed=False):
 
 ########################################
 
+def arrayToFile(data, pathName):
+    ### Write NumPy array as .npy file
+    try: np.save(pathName, data)
+    except:
+        print('Error: Could not write file:', pathName)
+        return 1
+
+########################################
+
+def arrayFromFile(pathName, qMemMap=True):
+    ### Read NumPy array from .npy file, memory-mapped by default so only accessed parts are loaded
+    try:
+        if qMemMap: return np.load(pathName, mmap_mode='r')
+        else:       return np.load(pathName)
+    except:
+        print('Error: Could not read file:', pathName)
+        return None
+
+########################################
+
+def getDisplCorrectionFilePath(names, vertCnts):
+    ### File path of displacement correction data keyed by a hash of the model (names and vertex counts of corrected elements)
+    md5 = hashlib.md5()
+    for name, vertCnt in zip(names, vertCnts):
+        md5.update(("%s:%d;" %(name, vertCnt)).encode())
+    return os.path.join(logPath, "bcb-diff-%s.npy" %md5.hexdigest()[:16])
+
+########################################
+
 def makeListsPickleFriendly(listOld):
     listNew1 = []
     for sub1 in listOld:
@@ -272,6 +302,49 @@ def setAttribsOfConstraint(const, props):
 
 ########################################
 
+def setAttribsOfConstraints(objConsts, cTab):
+
+    ### Write BCB specific empty object parameters and constraint attributes for many constraint empty objects at once
+    ### Values are taken column by column from the constraint table (see const_table.py) so that every column
+    ### is written in one tight loop without reading the current values back first (optimization)
+    # Base parameters (cTab.base index: attribute name, True if attribute of rigid body constraint)
+    colsBase = [[0, "name", 0], [1, "location", 0], [2, "object1", 1], [3, "object2", 1], [6, "rotation_mode", 0], [7, "rotation_quaternion", 0]]
+    objs = [None] *len(objConsts); consts = [None] *len(objConsts)
+    for k in range(len(objConsts)):
+        objConst = objConsts[k]
+        if objConst != None:
+            objs[k] = objConst
+            consts[k] = objConst.rigid_body_constraint
+
+    ### Gather columns, base parameters first as they also contain the constraint partner objects
+    cols = []
+    for j, attr, qConst in colsBase:
+        col = cTab.base[j]
+        idxs = [k for k in range(len(col)) if col[k] != None and objs[k] != None]
+        if len(idxs): cols.append([attr, qConst, idxs, [col[k] for k in idxs]])
+    for attr in cTab.attribs:
+        idxs, values = cTab.getColumn(attr)
+        idxsValid = [i for i in range(len(idxs)) if objs[idxs[i]] != None]
+        if len(idxsValid): cols.append([attr, 1, [idxs[i] for i in idxsValid], [values[i] for i in idxsValid]])
+
+    ### Write columns
+    colCnt = len(cols)
+    for c in range(colCnt):
+        sys.stdout.write('\r' +"%d/%d" %(c+1, colCnt))
+        # Update progress bar
+        bpy.context.window_manager.progress_update(c /colCnt)
+
+        attr, qConst, idxs, values = cols[c]
+        if qConst: targets = consts
+        else:      targets = objs
+        # Skip attributes which are not available in this Blender version
+        if not hasattr(targets[idxs[0]], attr): continue
+        for i, value in zip(idxs, values):
+            setattr(targets[i], attr, value)
+    print()
+
+########################################
+
 def exportDataToText(exportData):
 
     ### Exporting data into internal ASCII text file
@@ -0,0 +1,168 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import bpy, mathutils
+import numpy as np
+from mathutils import Vector
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+def geoCacheInit():
+
+    ### Enable geometry cache with empty data (to be called at start of a build)
+    bpy.app.driver_namespace["bcb_geoCache"] = {}
+
+########################################
+
+def geoCacheClear():
+
+    ### Remove all cached geometry data and disable cache (to be called at end of a build)
+    try: del bpy.app.driver_namespace["bcb_geoCache"]
+    except: pass
+
+########################################
+
+def geoCacheInvalidate(objs):
+
+    ### Remove cached geometry data for given objects (to be called after mesh or transform changes)
+    try: geoCache = bpy.app.driver_namespace["bcb_geoCache"]
+    except: return
+    for obj in objs:
+        try: del geoCache[obj.as_pointer()]
+        except: pass
+
+########################################
+
+def geoCacheKey(obj):
+
+    ### Revision key for cached mesh data, if the mesh changes the key will differ
+    # (Transformation is compared separately as matrix to avoid building tuples on every access)
+    me = obj.data
+    return (me.as_pointer(), len(me.vertices), len(me.polygons))
+    
+########################################
+
+def geoCacheGet(obj):
+
+    ### Return cached geometry data for given object, calculate it if not existing or outdated
+    # Outside of a build (cache disabled) the data is calculated but not stored
+    try: geoCache = bpy.app.driver_namespace["bcb_geoCache"]
+    except: return geoCacheCalculate(obj)
+
+    key = geoCacheKey(obj)
+    ptr = obj.as_pointer()
+    try: geo = geoCache[ptr]
+    except: pass
+    else:
+        if geo["key"] == key and geo["matrix"] == obj.matrix_world: return geo
+
+    geo = geoCache[ptr] = geoCacheCalculate(obj)
+    geo["key"] = key
+    geo["matrix"] = obj.matrix_world.copy()
+    return geo
+
+########################################
+
+def geoCacheCalculate(obj):
+
+    ### Calculate all per-object geometry data at once via foreach_get (optimization)
+    me = obj.data
+    mat = np.array(obj.matrix_world)
+    matRot = mat[:3, :3].T
+    matLoc = mat[:3, 3]
+    geo = {}
+
+    ### Vertices in global space and boundary box
+    vertCnt = len(me.vertices)
+    cos = np.empty(vertCnt *3, dtype=np.float32)
+    me.vertices.foreach_get("co", cos)
+    cosLocal = cos.reshape((vertCnt, 3)).astype(np.float64)
+    cos = np.dot(cosLocal, matRot) +matLoc
+    geo["cos"] = cos
+    if vertCnt > 0:
+        bbMin = Vector(cos.min(axis=0)); bbMax = Vector(cos.max(axis=0))
+        geo["bbMin"] = bbMin; geo["bbMax"] = bbMax; geo["bbCenter"] = (bbMin +bbMax) /2
+    else:
+        geo["bbMin"] = geo["bbMax"] = geo["bbCenter"] = None
+
+    ### Faces (centers in global space, areas, vertex indices)
+    faceCnt = len(me.polygons)
+    centers = np.empty(faceCnt *3, dtype=np.float32)
+    me.polygons.foreach_get("center", centers)
+    geo["faceCenters"] = np.dot(centers.reshape((faceCnt, 3)), matRot) +matLoc
+    areas = np.empty(faceCnt, dtype=np.float32)
+    me.polygons.foreach_get("area", areas)
+    geo["faceAreas"] = areas
+    geo["areaTot"] = float(areas.sum(dtype=np.float64))
+    loopStarts = np.empty(faceCnt, dtype=np.int32)
+    me.polygons.foreach_get("loop_start", loopStarts)
+    loopTotals = np.empty(faceCnt, dtype=np.int32)
+    me.polygons.foreach_get("loop_total", loopTotals)
+    geo["faceLoopStarts"] = loopStarts
+    geo["faceLoopTotals"] = loopTotals
+    loopCnt = len(me.loops)
+    loopVerts = np.empty(loopCnt, dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loopVerts)
+    geo["loopVerts"] = loopVerts
+    # Face index per loop (loop ranges of all faces are contiguous but not necessarily sorted)
+    faceOrder = np.argsort(loopStarts, kind='mergesort')
+    geo["loopFaces"] = np.repeat(faceOrder, loopTotals[faceOrder]).astype(np.int32)
+
+    ### Mesh volume in local space as signed sum of tetrahedrons over fan triangulated faces
+    # (Relative to the vertex centroid for better precision, only meaningful for water tight meshes)
+    if vertCnt > 0 and loopCnt > 0:
+        loopIdxs = np.arange(loopCnt, dtype=np.int32)
+        loopFirsts = loopStarts[geo["loopFaces"]]
+        mask = (loopIdxs > loopFirsts) &(loopIdxs < loopFirsts +loopTotals[geo["loopFaces"]] -1)
+        cosRel = cosLocal -cosLocal.mean(axis=0)
+        triA = cosRel[loopVerts[loopFirsts[mask]]]
+        triB = cosRel[loopVerts[loopIdxs[mask]]]
+        triC = cosRel[loopVerts[loopIdxs[mask] +1]]
+        geo["volume"] = abs(float(np.einsum('ij,ij->', triA, np.cross(triB, triC)))) /6
+    else:
+        geo["volume"] = 0
+    
+    ### Check if mesh is water tight (non-manifold), an edge is manifold if exactly two faces are using it
+    edgeCnt = len(me.edges)
+    if edgeCnt > 0:
+        loopEdges = np.empty(loopCnt, dtype=np.int32)
+        me.loops.foreach_get("edge_index", loopEdges)
+        edgeFaceCnts = np.bincount(loopEdges, minlength=edgeCnt)
+        geo["qNonManifold"] = int(np.any(edgeFaceCnts != 2))
+    else:
+        geo["qNonManifold"] = 0
+
+    return geo
@@ -279,6 +279,15 @@ maxMenuElementGroupItems = 300       # 300   | Maximum allowed element group ent
 emptyDrawSize = 0.25                 # 0.25  | Display size of constraint empty objects as radius in meters
 visualizerDrawSize = 1.0             # 1     | Maximum radius the visualizer will be scaled to when reaching maximum force
 minimumContactArea = 0.000001        # 1 mm² | Zero limit for a detected contact area to be considered for connection in m²
+contactAreaProcesses = 0             # 0     | Number of worker processes for the contact area calculation (0 = disabled, -1 = all CPU cores), only used for large connection counts
+contactAreaProcessesMinConnections = 1000  # 1000 | Minimum connection count for the contact area calculation to use worker processes (see contactAreaProcesses)
+clusterPassesMax = 100               # 100   | Maximum number of merging passes for bundling constraint empties into clusters (see Cluster Radius)
+clusterChunkSize = 1000000           # 1000000 | Maximum number of distances calculated at once when searching cluster candidates (limits memory usage)
+incrementalBuild = 0                 # 0     | Enables incremental rebuilding of connections on Update for elements modified since the last build (detected by geometry fingerprints)
+mohrCoulombWriteTolerance = 0.001    # 0.001 | Relative change below which the monitor skips writing a new Mohr-Coulomb breaking threshold (0 = write all changes)
+profileBuild = 0                     # 0     | Enables the build profiler writing per-stage timing, memory peak and operator call counts as bcb-profile-*.json next to the render output path
+profileBuildCProfile = 0             # 0     | Additionally dumps cProfile statistics as bcb-profile-*.prof (requires profileBuild)
+logMonitor = 0                       # 0     | Enables the monitor log writing per-frame timings and connection counts per element group on stop as bcb-monitor-*.csv (1) or bcb-monitor-*.json (2) next to the render output path
 asciiExportName = "BCB_export"       #       | Name of ASCII text file to be exported
 asciiTriggersName = "BCB_triggers"   #       | Name of ASCII text file to contain a list of connections to trigger during simulation (Syntax per line: frame number, "objA name", "objB name")
 grpNameBuilding = "BCB_Building"
@@ -0,0 +1,154 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import numpy as np
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+class mohrCoulombEngine():
+
+    ### Array based breaking threshold update depending on pressure (Mohr-Coulomb theory) for the monitor
+    # Constraints are given as settings objects (rigid_body_constraint or FM constraint), which of them provide the compressive
+    # force and which get modified is determined once on init as constraint types and limits don't change during simulation
+
+    def __init__(self, connCnt, objCnt):
+        self.connCnt = connCnt
+        self.objCnt = objCnt
+        self.qMohrCoulomb = np.zeros(connCnt, dtype=np.bool_)
+        self.objA = np.zeros(connCnt, dtype=np.int64)          # Index of first element in object table
+        self.objB = np.zeros(connCnt, dtype=np.int64)          # Index of second element in object table
+        self.contactArea = np.ones(connCnt, dtype=np.float64)
+        self.mul = np.zeros(connCnt, dtype=np.float64)
+        ### Compressive constraints
+        self.compCons = []
+        self.compConn = []
+        ### Constraints to be modified
+        self.modCons = []
+        self.modConn = []
+        self.modBrkThres = []       # Original breaking thresholds
+        self.modBrkThresLast = None  # Last written breaking thresholds (NaN = unknown, always write)
+
+    def addConnection(self, k, objA, objB, cons, constsBrkThres, contactArea, mul):
+        self.qMohrCoulomb[k] = 1
+        self.objA[k] = objA
+        self.objB[k] = objB
+        self.contactArea[k] = contactArea
+        self.mul[k] = mul
+        for i in range(len(cons)):
+            con = cons[i]
+            if con == None: continue
+            ### Determine compressive constraints in connection
+            if i < 2:  # Only first two constraints can provide a compressive force for most CTs (except spring arrays)
+                ### For Point and Fixed costraints
+                ### For Generic constraints
+                # Compressive constraints
+                if con.type != 'GENERIC' \
+                or con.use_limit_lin_x:
+                    self.compCons.append(con)
+                    self.compConn.append(k)
+            ### Determine constraints to modify
+            if i > 0:  # We know that first constraint is always pressure
+                ### For Point and Fixed costraints
+                ### For Generic constraints
+                # Tensile constraints - Comment this line out to include all constraints
+                # Shear constraints - Comment this line out to include all constraints
+                # Bend constraints - Comment this line out to include all constraints
+                if con.type != 'GENERIC' \
+                or con.use_limit_lin_x \
+                or con.use_limit_lin_y or con.use_limit_lin_z \
+                or con.use_limit_ang_x or con.use_limit_ang_y or con.use_limit_ang_z:
+                    self.modCons.append(con)
+                    self.modConn.append(k)
+                    self.modBrkThres.append(constsBrkThres[i])
+
+    def finalize(self):
+        self.compConn = np.array(self.compConn, dtype=np.int64)
+        self.modConn = np.array(self.modConn, dtype=np.int64)
+        self.modBrkThres = np.array(self.modBrkThres, dtype=np.float64)
+        self.modBrkThresLast = np.full(len(self.modCons), np.nan)
+
+    ########################################
+
+    def update(self, qActive, qModify, rbw_steps_per_second, rbw_time_scale):
+
+        ### Compute and apply new breaking thresholds
+        # qActive: Connections which contribute their force to the elements
+        # qModify: Connections for which thresholds are updated (subset of qActive)
+        qActive = qActive &self.qMohrCoulomb
+        qModify = qModify &qActive
+
+        ### Determine force of the compressive constraints of all active connections (impulses are gathered once per frame)
+        forces = np.zeros(len(self.compCons), dtype=np.float64)
+        compCons = self.compCons
+        for i in np.nonzero(qActive[self.compConn])[0]:
+            forces[i] = abs(compCons[i].appliedImpulse())
+        forces *= rbw_steps_per_second /rbw_time_scale  # Conversion from impulses to forces
+        connForce = np.bincount(self.compConn, weights=forces, minlength=self.connCnt)
+
+        ### Summarize forces per element, also counting the number of connections
+        idxs = np.nonzero(qActive)[0]
+        objsForces = np.zeros(self.objCnt, dtype=np.float64)
+        objsConstCnts = np.zeros(self.objCnt, dtype=np.float64)
+        for objIdxs in (self.objA[idxs], self.objB[idxs]):
+            np.add.at(objsForces, objIdxs, connForce[idxs])
+            np.add.at(objsConstCnts, objIdxs, 1)
+
+        ### Get forces for both connected elements and divide it by the number of connections
+        idxs = np.nonzero(qModify)[0]
+        objA = self.objA[idxs]; objB = self.objB[idxs]
+        forceA = objsForces[objA] /objsConstCnts[objA]
+        forceB = objsForces[objB] /objsConstCnts[objB]
+        forceElem = (forceA +forceB) /2  # Calculate average force and thus strength for the connection
+        force = (connForce[idxs] +forceElem) /2  # Use also the average of the averaged force per element and the invididual constraint force
+        ### Compute new breaking threshold incease based on force
+        # σ = F /A
+        # τ = c +σ *tan(ϕ)
+        brkThresInc = np.zeros(self.connCnt, dtype=np.float64)
+        brkThresInc[idxs] = force /self.contactArea[idxs] *1 *self.mul[idxs] *rbw_time_scale /rbw_steps_per_second
+
+        ### Apply breaking threshold increase, only values which changed by more than the tolerance are written
+        brkThres = self.modBrkThres +brkThresInc[self.modConn]
+        brkThresLast = self.modBrkThresLast
+        qChanged = qModify[self.modConn] &~(np.abs(brkThres -brkThresLast) <= np.abs(brkThresLast) *mohrCoulombWriteTolerance)
+        modCons = self.modCons
+        for i in np.nonzero(qChanged)[0]:
+            modCons[i].breaking_threshold = brkThres[i]
+        brkThresLast[qChanged] = brkThres[qChanged]
+
+    def scaleWritten(self, qConns, fact):
+        ### Keep last written values in sync when thresholds are scaled externally (progressive weakening)
+        q = qConns[self.modConn]
+        self.modBrkThresLast[q] *= fact
@@ -31,12 +31,16 @@
 ################################################################################
 
 import bpy, sys, time, os, math
+import numpy as np
 import global_vars
 
 ### Import submodules
 from global_vars import *      # Contains global variables
 from builder import *          # Contains constraints builder function
 from build_data import *       # Contains build data access functions
+from monitor_state import *    # Contains array based monitor state
+from mohr_coulomb import *     # Contains array based Mohr-Coulomb breaking threshold update
+from monitor_log import *      # Contains per-frame monitor log
 
 ################################################################################
 
@@ -54,6 +58,9 @@ def monitor_eventHandler(scene):
             
             # Store frame time
             bpy.app.driver_namespace["bcb_time"] = time.time()
+
+            # Start optional monitor log
+            monitorLogStart(scene)
             
             ###### Function
             monitor_initBuffers(scene)
@@ -114,7 +121,7 @@ def monitor_eventHandler(scene):
                     ### Set new time scale
                     scene.rigidbody_world.time_scale = props.timeScalePeriodValue
                     ###### Execute update of all existing constraints with new time scale
-                    build()
+                    build(qIncremental=0)
 
             ### Init weakening
             if props.progrWeak:
@@ -130,11 +137,15 @@ def monitor_eventHandler(scene):
             ### Damping region initialization
             monitor_dampingRegion(scene)
 
+            ### Monitor log record of the start frame
+            monitor_logFrame(scene)
+
         ################################
         ### What to do AFTER start frame
         elif "bcb_monitor" in bpy.app.driver_namespace.keys() and scene.frame_current > scene.frame_start:   # Check this to skip the last run when jumping back to start frame
             time_last = bpy.app.driver_namespace["bcb_time"]
             bpy.app.driver_namespace["bcb_time"] = time.time()
+            monitorLogFrameBegin()
             if props.progrWeak and bpy.app.driver_namespace["bcb_progrWeakTmp"]:
                 progrWeakCurrent = bpy.app.driver_namespace["bcb_progrWeakCurrent"]
                 print("Frame: %d | Time: %0.2f s | Weakness: %0.3fx" %(scene.frame_current, time.time() -time_last, progrWeakCurrent *props.progrWeakStartFact))
@@ -142,10 +153,13 @@ def monitor_eventHandler(scene):
                 print("Frame: %d | Time: %0.2f s" %(scene.frame_current, time.time() -time_last))
         
             ###### Function
+            monitorLogLap("other")
             cntBroken = monitor_checkForChange(scene)
+            monitorLogLap("checkForChange")
             
             ###### Function
             monitor_checkForTriggers(scene)
+            monitorLogLap("triggers")
             
             ### Apply progressive weakening factor
             if props.progrWeak and bpy.app.driver_namespace["bcb_progrWeakTmp"] \
@@ -167,7 +181,10 @@ def monitor_eventHandler(scene):
                     # Set original solver precision
                     scene.rigidbody_world.solver_iterations = bpy.app.driver_namespace["bcb_monitor_originalSolverIterations"]
                     ###### Execute update of all existing constraints with new time scale
-                    build()
+                    build(qIncremental=0)
+                    # Breaking thresholds have been rewritten, so Mohr-Coulomb data needs to be renewed
+                    try: del bpy.app.driver_namespace["bcb_mohrCoulomb"]
+                    except: pass
                     ### Move detonator force fields to other layer to deactivate influence (Todo: Detonator not yet part of BCB)
                     if "Detonator" in bpy.data.groups:
                         for obj in bpy.data.groups["Detonator"].objects:
@@ -189,7 +206,12 @@ def monitor_eventHandler(scene):
                 monitor_displCorrectDiffExport(scene)
 
             ### Damping region update
+            monitorLogLap("other")
             monitor_dampingRegion(scene)
+            monitorLogLap("damping")
+
+            ### Monitor log record of this frame
+            monitor_logFrame(scene)
 
     # When Fracture Modifier is in use
     else:
@@ -201,6 +223,9 @@ def monitor_eventHandler(scene):
             
             # Store frame time
             bpy.app.driver_namespace["bcb_time"] = time.time()
+
+            # Start optional monitor log
+            monitorLogStart(scene)
             
             # Dummy data init (not needed for FM)
             bpy.app.driver_namespace["bcb_monitor"] = None
@@ -225,11 +250,15 @@ def monitor_eventHandler(scene):
             ### Damping region initialization
             monitor_dampingRegion_fm(scene)
 
+            ### Monitor log record of the start frame
+            monitor_logFrame(scene)
+
         ################################
         ### What to do AFTER start frame
         elif "bcb_monitor" in bpy.app.driver_namespace.keys() and scene.frame_current > scene.frame_start:   # Check this to skip the last run when jumping back to start frame
             time_last = bpy.app.driver_namespace["bcb_time"]
             bpy.app.driver_namespace["bcb_time"] = time.time()
+            monitorLogFrameBegin()
             if props.progrWeak and bpy.app.driver_namespace["bcb_progrWeakTmp"]:
                 progrWeakCurrent = bpy.app.driver_namespace["bcb_progrWeakCurrent"]
                 print("Frame: %d | Time: %0.2f s | Weakness: %0.3fx" %(scene.frame_current, time.time() -time_last, progrWeakCurrent *props.progrWeakStartFact))
@@ -237,14 +266,18 @@ def monitor_eventHandler(scene):
                 print("Frame: %d | Time: %0.2f s" %(scene.frame_current, time.time() -time_last))
         
             ###### Function
+            monitorLogLap("other")
             if bpy.app.driver_namespace["bcb_monitor"] != None:
                 monitor_checkForChange_fm(scene)
+            monitorLogLap("checkForChange")
 
             ###### Function
             cntBrokenAbs = monitor_countIntactConnections_fm(scene)
             
             ###### Function
+            monitorLogLap("other")
             monitor_checkForTriggers_fm(scene)
+            monitorLogLap("triggers")
 
             ### Find difference to last frame
             try: cntBrokenAbsLast = bpy.app.driver_namespace["bcb_progrWeakBroken"]
@@ -279,7 +312,12 @@ def monitor_eventHandler(scene):
                 monitor_displCorrectDiffExport(scene)
 
             ### Damping region update
+            monitorLogLap("other")
             monitor_dampingRegion_fm(scene)
+            monitorLogLap("damping")
+
+            ### Monitor log record of this frame
+            monitor_logFrame(scene, cntBrokenAbs)
 
 ################################################################################
 
@@ -346,6 +384,9 @@ def monitor_stop_eventHandler(scene):
                         mod.show_render = False
                         mod.show_viewport = False
 
+        # Write buffered monitor log
+        monitorLogStop()
+
         ### Free all monitor related data
         # When official Blender and not Fracture Modifier is in use
         if not hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') or not asciiExportName in scene.objects:
@@ -377,44 +418,35 @@ def monitor_initBuffers(scene):
     
     props = bpy.context.window_manager.bcb
     elemGrps = global_vars.elemGrps
-    connects = bpy.app.driver_namespace["bcb_monitor"] = []
-    
-    ### Prepare scene object dictionaries by type to be used for faster item search (optimization)
-    scnObjs = {}
-    scnEmptyObjs = {}
-    for obj in scene.objects:
-        if obj.type == 'MESH':    scnObjs[obj.name] = obj
-        elif obj.type == 'EMPTY': scnEmptyObjs[obj.name] = obj
+    connects = bpy.app.driver_namespace["bcb_monitor"] = monitorState()
+    # Make sure no element group index or Mohr-Coulomb data is left over from an earlier simulation
+    try: del bpy.app.driver_namespace["bcb_grpsObjs"]
+    except: pass
+    try: del bpy.app.driver_namespace["bcb_mohrCoulomb"]
+    except: pass
     
     ###### Get data from scene
 
     try: names = scene["bcb_objs"]
     except: names = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-    objs = []
-    for name in names:
-        if len(name):
-            try: objs.append(scnObjs[name])
-            except: objs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
-        else: objs.append(None)
+    objs, namesMissing = resolveObjectNames(scene, names, 'MESH')
+    for name in namesMissing: print("Error: Object %s missing, rebuilding constraints is required." %name)
 
     try: names = scene["bcb_emptyObjs"]
     except: names = []; print("Error: bcb_emptyObjs property not found, rebuilding constraints is required.")
-    emptyObjs = []
-    for name in names:
-        if len(name):
-            try: emptyObjs.append(scnEmptyObjs[name])
-            except: emptyObjs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
-        else: emptyObjs.append(None)
+    emptyObjs, namesMissing = resolveObjectNames(scene, names, 'EMPTY')
+    for name in namesMissing: print("Error: Object %s missing, rebuilding constraints is required." %name)
         
     try: objsEGrp = scene["bcb_objsEGrp"]
     except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, rebuilding constraints is required.")
-    try: connectsPair = scene["bcb_connectsPair"]
+    fields = getBinaryBuildDataFromScene(scene)
+    try: connectsPair = fields["connectsPair"]
     except: connectsPair = []; print("Error: bcb_connectsPair property not found, rebuilding constraints is required.")
-    try: connectsConsts = scene["bcb_connectsConsts"]
+    try: connectsConsts = fields["connectsConsts"]
     except: connectsConsts = []; print("Error: bcb_connectsConsts property not found, rebuilding constraints is required.")
-    try: connectsTol = scene["bcb_connectsTol"]
+    try: connectsTol = fields["connectsTol"]
     except: connectsTol = []; print("Error: bcb_connectsTol property not found, rebuilding constraints is required.")
-    try: connectsGeo = scene["bcb_connectsGeo"]
+    try: connectsGeo = fields["connectsGeo"]
     except: connectsGeo = []; print("Error: bcb_connectsGeo property not found, rebuilding constraints is required.")
     
     ### Create original transform data array
@@ -439,22 +471,17 @@ def monitor_initBuffers(scene):
             Prio_A = elemGrps_elemGrpA[EGSidxPrio]
             Prio_B = elemGrps_elemGrpB[EGSidxPrio]
             elemGrp = None
-            if Prio_A >= Prio_B: elemGrp = elemGrps_elemGrpA
-            else:                elemGrp = elemGrps_elemGrpB
+            if Prio_A >= Prio_B: elemGrp = elemGrps_elemGrpA; elemGrpIdx = elemGrpA
+            else:                elemGrp = elemGrps_elemGrpB; elemGrpIdx = elemGrpB
             qMohrCoulomb = elemGrp[EGSidxMCTh]
             mul = elemGrp[EGSidxBTX]
             qProgrWeak = elemGrp[EGSidxPrWk]
 
-            # Calculate distance between both elements of the connection
-            dist = (objA.matrix_world.to_translation() -objB.matrix_world.to_translation()).length
-            # Calculate angle between two elements
-            quat0 = objA.matrix_world.to_quaternion()
-            quat1 = objB.matrix_world.to_quaternion()
-            angl = quat0.rotation_difference(quat1).angle
             consts = []
             constsEnabled = []
             constsUseBrk = []
             constsBrkThres = []
+            constsSpring = []
             mode = 1
             if props.disableCollisionPerm: conConsts = connectsConsts[d][:-1]  # For permanent collision suppression the last constraint should be ignored
             else: conConsts = connectsConsts[d]
@@ -467,6 +494,7 @@ def monitor_initBuffers(scene):
                         constsEnabled.append(emptyObj.rigid_body_constraint.enabled)
                         constsUseBrk.append(emptyObj.rigid_body_constraint.use_breaking)
                         constsBrkThres.append(emptyObj.rigid_body_constraint.breaking_threshold)
+                        constsSpring.append(emptyObj.rigid_body_constraint.type == 'GENERIC_SPRING')
                         # Disable breakability for warm up time
                         #if props.warmUpPeriod: emptyObj.rigid_body_constraint.use_breaking = 0
                         # Set initial mode state if plastic or not (activate plastic mode only if the connection constists exclusively of springs)
@@ -479,19 +507,56 @@ def monitor_initBuffers(scene):
                         constsEnabled.append(0)
                         constsUseBrk.append(0)
                         constsBrkThres.append(0)
+                        constsSpring.append(0)
                 else:
                     constsEnabled.append(0)
                     constsUseBrk.append(0)
                     constsBrkThres.append(0)
-            #                0                1                2     3     4       5              6             7               8       9       10      11      12    13              14 15 16            17   18
-            connects.append([[objA, pair[0]], [objB, pair[1]], dist, angl, consts, constsEnabled, constsUseBrk, geoContactArea, tol[0], tol[1], tol[2], tol[3], mode, constsBrkThres, 0, 0, qMohrCoulomb, mul, qProgrWeak])
+                    constsSpring.append(0)
+            connects.addConnection(objA, objB, pair[0], pair[1], consts, constsEnabled, constsUseBrk, constsBrkThres, constsSpring, geoContactArea, tol, mode, qMohrCoulomb, mul, qProgrWeak, elemGrpIdx)
             cCnt += 1
         d += 1
+    # Convert into arrays and store original distances and angles between the elements of all connections
+    connects.finalize()
         
     print("connections")
         
 ################################################################################
 
+def monitor_initMohrCoulomb(scene):
+
+    ### Get Mohr-Coulomb engine for all monitored connections (cached during simulation)
+    try: return bpy.app.driver_namespace["bcb_mohrCoulomb"]
+    except: pass
+
+    connects = bpy.app.driver_namespace["bcb_monitor"]
+    # When official Blender and not Fracture Modifier is in use
+    if isinstance(connects, monitorState):
+        mohrCoulomb = mohrCoulombEngine(len(connects), len(connects.objs))
+        for k in np.nonzero(connects.qMohrCoulomb)[0]:
+            cons = []
+            for const in connects.getConsts(k):
+                if const != None: cons.append(const.rigid_body_constraint)
+                else:             cons.append(None)
+            constsBrkThres = connects.constsBrkThres[connects.constsStart[k]:connects.constsStart[k +1]]
+            mohrCoulomb.addConnection(k, connects.objA[k], connects.objB[k], cons, constsBrkThres, connects.contactArea[k], connects.mul[k])
+    # When Fracture Modifier is in use
+    else:
+        objsIdx = {}
+        for connect in connects:
+            for obj in (connect[0][0], connect[1][0]):
+                if obj not in objsIdx: objsIdx[obj] = len(objsIdx)
+        mohrCoulomb = mohrCoulombEngine(len(connects), len(objsIdx))
+        for k in range(len(connects)):
+            connect = connects[k]
+            if connect[6]:  # qMohrCoulomb
+                mohrCoulomb.addConnection(k, objsIdx[connect[0][0]], objsIdx[connect[1][0]], connect[2], connect[5], connect[4], connect[7])
+    mohrCoulomb.finalize()
+    bpy.app.driver_namespace["bcb_mohrCoulomb"] = mohrCoulomb
+    return mohrCoulomb
+
+################################################################################
+
 def monitor_checkForChange(scene):
 
     if debug: print("Calling checkForChange")
@@ -506,183 +571,104 @@ def monitor_checkForChange(scene):
     # Diagnostic verbose
     if props.submenu_assistant_advanced:
         brokenC, brokenT, brokenS, brokenB = 0, 0, 0, 0
-        
-    ###### Initial pass for the Mohr-Coulomb theory to measure the pressure acting per element
-    objsForces = {}
-    objsConstCnts = {}
-    for connect in connects:
-        conMode = connect[12]
-
-        ### If connection is in fixed mode then check if first tolerance is reached
-        if conMode == 0:
-            consts = connect[4]
-            if consts[0].rigid_body_constraint.use_breaking:
-                qMohrCoulomb = connect[16]
-
-                if qMohrCoulomb:
-                    ### Determine force of the compressive constraints in connection
-                    force = 0
-                    for const in consts[:2]:  # Only first two constraints can provide a compressive force for most CTs (except spring arrays)
-                        con = const.rigid_body_constraint
-                        ### For Point and Fixed costraints
-                        ### For Generic constraints
-                        # Compressive constraints
-                        if con.type != 'GENERIC' \
-                        or con.use_limit_lin_x:
-                            forceCon = abs(con.appliedImpulse()) *rbw_steps_per_second /rbw_time_scale  # Conversion from impulses to forces
-                            force += forceCon
-                    # Summarize forces and add them to the forces list, also counting the number of connections
-                    objA = connect[0][0]
-                    objB = connect[1][0]
-                    for obj in [objA, objB]:
-                        if obj not in objsForces: objsForces[obj] = force
-                        else:                     objsForces[obj] += force
-                        if obj not in objsConstCnts: objsConstCnts[obj] = 1
-                        else:                        objsConstCnts[obj] += 1
-
-    ###### Main pass
-    d = 0; e = 0; cntP = 0; cntB = 0
-    for connect in connects:
-        consts = connect[4]
-        conMode = connect[12]
-        qProgrWeak = connect[18]
-
-        ### If connection is in fixed mode then check if first tolerance is reached
-        if conMode == 0:
-            d += 1
-            if consts[0].rigid_body_constraint.use_breaking:
-                objA = connect[0][0]
-                objB = connect[1][0]
-                distOrig = connect[2]
-                anglOrig = connect[3]
-                tolDist = connect[8]
-                tolRot = connect[9]
-                contactArea = connect[7]
-                constsBrkThres = connect[13]
-                distDifLast = connect[14]
-                anglDifLast = connect[15]
-                qMohrCoulomb = connect[16]
-                mul = connect[17]
-                
-                # Calculate distance between both elements of the connection
-                dist = (objA.matrix_world.to_translation() -objB.matrix_world.to_translation()).length
-                if dist > 0: distDif = abs(1 -(distOrig /dist))
-                else: distDif = 1
-
-                # Calculate angle between two elements
-                vecA = Vector((0,0,1)); vecB = Vector((0,0,1))
-                vecA.rotate(objA.matrix_world.to_quaternion())  # Rotate Z vector according to object orientation
-                vecB.rotate(objB.matrix_world.to_quaternion())
-                anglDif = abs(anglOrig -vecA.angle(vecB))
-
-                # If change in relative distance is larger than tolerance plus change in angle (angle is involved here to allow for bending and buckling)
-                if (tolDist != -1 and distDif > tolDist +(anglDif /pi)) \
-                or (tolRot != -1 and anglDif > tolRot):
-                    qPlastic = 0
-                    for const in consts:
-                        # Enable spring constraints for this connection by setting its stiffness
-                        if const.rigid_body_constraint.type == 'GENERIC_SPRING':
-                            const.rigid_body_constraint.enabled = 1
-                            qPlastic = 1
-                        # Disable non-spring constraints for this connection
-                        else: const.rigid_body_constraint.enabled = 0
-                    if qPlastic:
-                        # Update distance in comparison list so we use the last elastic deformation
-                        connect[2] = dist
-                        # Flag connection as being in plastic mode
-                        connect[12] += 1
-                        cntP += 1
-                    else:
-                        # Flag connection as being disconnected
-                        connect[12] += 2
-                        cntB += 1
-
-                # When no breaking or mode change happens but connection is breakable
-                else:
 
-                    ### Dynamic change of breaking thresholds depending on pressure (Mohr-Coulomb theory)
-                    if qMohrCoulomb:
-                        ### Diagnostic verbose
-                        if props.submenu_assistant_advanced:
-                            for i in range(0, len(consts)):
-                                con = consts[i].rigid_body_constraint
-                                if not con.isIntact():
-                                    if   i == 0: brokenC += 1
-                                    elif i == 1: brokenT += 1
-                                    elif i == 2 or i == 3: brokenS += 1
-                                    elif i == 4 or i == 5: brokenB += 1
-                        ### Determine force of the compressive constraints in connection
-                        force = 0
-                        for const in consts[:2]:  # Only first two constraints can provide a compressive force for most CTs (except spring arrays)
-                            con = const.rigid_body_constraint
-                            ### For Point and Fixed costraints
-                            ### For Generic constraints
-                            # Compressive constraints
-                            if con.type != 'GENERIC' \
-                            or con.use_limit_lin_x:
-                                forceCon = abs(con.appliedImpulse()) *rbw_steps_per_second /rbw_time_scale  # Conversion from impulses to forces
-                                force += forceCon
-                        ### Get forces from the force list for both connected elements and divide it by the number of connections
-                        forceA = objsForces[objA] /objsConstCnts[objA]
-                        forceB = objsForces[objB] /objsConstCnts[objB]
-                        #forceElem = min(forceA, forceB)  # Use the smaller force and thus strength for the connection
-                        forceElem = (forceA +forceB) /2  # Calculate average force and thus strength for the connection
-                        force = (force +forceElem) /2  # Use also the average of the averaged force per element and the invididual constraint force
-                        ### Compute new breaking threshold incease based on force
-                        # σ = F /A
-                        # τ = c +σ *tan(ϕ)
-                        brkThresInc = force /contactArea *1 *mul
-                        # Modify constraints
-                        for i in range(1, len(consts)):  # We know that first constraint is always pressure
-                            con = consts[i].rigid_body_constraint
-                            ### For Point and Fixed costraints
-                            ### For Generic constraints
-                            # Tensile constraints - Comment this line out to include all constraints
-                            # Shear constraints - Comment this line out to include all constraints
-                            # Bend constraints - Comment this line out to include all constraints
-                            if con.type != 'GENERIC' \
-                            or con.use_limit_lin_x \
-                            or con.use_limit_lin_y or con.use_limit_lin_z \
-                            or con.use_limit_ang_x or con.use_limit_ang_y or con.use_limit_ang_z:
-                                # Apply breaking threshold incease
-                                con.breaking_threshold = constsBrkThres[i] +(brkThresInc *rbw_time_scale /rbw_steps_per_second)
-
-        ### If connection is in plastic mode then check if second tolerance is reached
-        if conMode == 1:
-            e += 1
-            if len(consts) and consts[0] != None and consts[0].rigid_body_constraint.use_breaking:
-                objA = connect[0][0]
-                objB = connect[1][0]
-                distOrig = connect[2]
-                anglOrig = connect[3]
-                tolDist = connect[10]
-                tolRot = connect[11]
-                
-                # Calculate distance between both elements of the connection
-                dist = (objA.matrix_world.to_translation() -objB.matrix_world.to_translation()).length
-                if dist > 0: distDif = abs(1 -(distOrig /dist))
-                else: distDif = 1
-
-                # Calculate angle between two elements
-                quatA = objA.matrix_world.to_quaternion()
-                quatB = objB.matrix_world.to_quaternion()
-                anglDif = math.asin(math.sin( abs(anglOrig -quatA.rotation_difference(quatB).angle) /2))   # The construct "asin(sin(x))" is a triangle function to achieve a seamless rotation loop from input
-
-                # If change in relative distance is larger than tolerance plus change in angle (angle is involved here to allow for bending and buckling)
-                if (tolDist != -1 and distDif > tolDist +(anglDif /pi)) \
-                or (tolRot != -1 and anglDif > tolRot):
-                    # Disable plastic constraints for this connection
-                    for const in consts:
-                        if const.rigid_body_constraint.type == 'GENERIC_SPRING':
-                            const.rigid_body_constraint.enabled = 0
-                    # Flag connection as being disconnected
-                    connect[12] += 1  # conMode
-                    cntB += 1
+    consts = connects.consts
+    constsStart = connects.constsStart
+    connectsObjA = connects.objA
+    connectsObjB = connects.objB
+    conMode = connects.mode.copy()  # Modes at the beginning of the frame (connections change their mode only once per frame)
+    qFixed = conMode == 0
+    qPlastic = conMode == 1
+    qFixedBrk = qFixed &connects.qBreakable
+    qPlasticBrk = qPlastic &connects.qBreakable
         
-        # Progressive Weakening
-        if qProgrWeak and progrWeakVar != 1:
-            for const in consts:
+    ###### Main pass
+    d = int(np.count_nonzero(qFixed)); e = int(np.count_nonzero(qPlastic)); cntP = 0; cntB = 0
+
+    ### Calculate distance and angle changes between the elements of all breakable connections at once
+    locs, quats = connects.getTransforms()  # One bulk read of all element transforms
+    dist = np.linalg.norm(locs[connectsObjA] -locs[connectsObjB], axis=1)
+    distDif = np.ones(len(connects))
+    qDist = dist > 0
+    distDif[qDist] = np.abs(1 -(connects.distOrig[qDist] /dist[qDist]))
+    anglDif = np.zeros(len(connects))
+    # Fixed mode: Angle between the Z axes of both elements
+    vecs = monitorQuatsRotateZ(quats)
+    vecA = vecs[connectsObjA[qFixedBrk]]; vecB = vecs[connectsObjB[qFixedBrk]]
+    cosAngl = (vecA *vecB).sum(axis=1) /(np.linalg.norm(vecA, axis=1) *np.linalg.norm(vecB, axis=1))
+    anglDif[qFixedBrk] = np.abs(connects.anglOrig[qFixedBrk] -np.arccos(np.clip(cosAngl, -1, 1)))
+    # Plastic mode: Rotation difference between both elements
+    angl = monitorQuatsRotationDifferenceAngle(quats[connectsObjA[qPlasticBrk]], quats[connectsObjB[qPlasticBrk]])
+    anglDif[qPlasticBrk] = np.arcsin(np.sin(np.abs(connects.anglOrig[qPlasticBrk] -angl) /2))   # The construct "asin(sin(x))" is a triangle function to achieve a seamless rotation loop from input
+
+    ### If change in relative distance is larger than tolerance plus change in angle (angle is involved here to allow for bending and buckling)
+    # First tolerance for connections in fixed mode, second tolerance for connections in plastic mode
+    tolDist = np.where(qFixed, connects.tol1Dist, connects.tol2Dist)
+    tolRot = np.where(qFixed, connects.tol1Rot, connects.tol2Rot)
+    qExceeded = (qFixedBrk |qPlasticBrk) \
+              &(((tolDist != -1) &(distDif > tolDist +(anglDif /pi))) \
+              | ((tolRot != -1) &(anglDif > tolRot)))
+
+    ### Fixed connections exceeding the first tolerance
+    for k in np.nonzero(qExceeded &qFixed)[0]:
+        qPlasticK = 0
+        for i in range(constsStart[k], constsStart[k +1]):
+            # Enable spring constraints for this connection by setting its stiffness
+            if connects.constsSpring[i]:
+                consts[i].rigid_body_constraint.enabled = 1
+                qPlasticK = 1
+            # Disable non-spring constraints for this connection
+            else: consts[i].rigid_body_constraint.enabled = 0
+        if qPlasticK:
+            # Update distance in comparison list so we use the last elastic deformation
+            connects.distOrig[k] = dist[k]
+            # Flag connection as being in plastic mode
+            connects.mode[k] += 1
+            cntP += 1
+        else:
+            # Flag connection as being disconnected
+            connects.mode[k] += 2
+            cntB += 1
+
+    ### Plastic connections exceeding the second tolerance
+    for k in np.nonzero(qExceeded &qPlastic)[0]:
+        # Disable plastic constraints for this connection
+        for i in range(constsStart[k], constsStart[k +1]):
+            if connects.constsSpring[i]:
+                consts[i].rigid_body_constraint.enabled = 0
+        # Flag connection as being disconnected
+        connects.mode[k] += 1
+        cntB += 1
+
+    ### When no breaking or mode change happens but connection is breakable
+    ### Dynamic change of breaking thresholds depending on pressure (Mohr-Coulomb theory)
+    qMohrCoulomb = qFixedBrk &connects.qMohrCoulomb
+    if qMohrCoulomb.any():
+        ### Diagnostic verbose
+        if props.submenu_assistant_advanced:
+            for k in np.nonzero(qMohrCoulomb &~qExceeded)[0]:
+                constsK = connects.getConsts(k)
+                for i in range(0, len(constsK)):
+                    con = constsK[i].rigid_body_constraint
+                    if not con.isIntact():
+                        if   i == 0: brokenC += 1
+                        elif i == 1: brokenT += 1
+                        elif i == 2 or i == 3: brokenS += 1
+                        elif i == 4 or i == 5: brokenB += 1
+        # All fixed connections contribute their force to the elements, but only those not changing their mode get new thresholds
+        monitorLogLap("checkForChange")
+        mohrCoulomb = monitor_initMohrCoulomb(scene)
+        mohrCoulomb.update(qMohrCoulomb, ~qExceeded, rbw_steps_per_second, rbw_time_scale)
+        monitorLogLap("mohrCoulomb")
+
+    ### Progressive Weakening
+    if progrWeakVar != 1:
+        for i in connects.getConstsIdx(np.nonzero(connects.qProgrWeak)[0]):
+            const = consts[i]
+            if const != None:
                 const.rigid_body_constraint.breaking_threshold *= progrWeakVar
+        if "bcb_mohrCoulomb" in bpy.app.driver_namespace:
+            bpy.app.driver_namespace["bcb_mohrCoulomb"].scaleWritten(connects.qProgrWeak, progrWeakVar)
            
     sys.stdout.write("Connections: %d Intact & %d Plastic" %(d, e))
     if cntP > 0: sys.stdout.write(" | Deformed: %d" %cntP)
@@ -716,6 +702,11 @@ def monitor_initBuffers_fm(scene):
 
     props = bpy.context.window_manager.bcb
     connects = bpy.app.driver_namespace["bcb_monitor"] = []
+    # Make sure no element group index or Mohr-Coulomb data is left over from an earlier simulation
+    try: del bpy.app.driver_namespace["bcb_grpsObjs"]
+    except: pass
+    try: del bpy.app.driver_namespace["bcb_mohrCoulomb"]
+    except: pass
     
     # Get Fracture Modifier
     try: ob = scene.objects[asciiExportName]
@@ -750,11 +741,12 @@ def monitor_initBuffers_fm(scene):
 
     try: objsEGrp = scene["bcb_objsEGrp"]
     except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, rebuilding constraints is required.")
-    try: connectsPair = scene["bcb_connectsPair"]
+    fields = getBinaryBuildDataFromScene(scene)
+    try: connectsPair = fields["connectsPair"]
     except: connectsPair = []; print("Error: bcb_connectsPair property not found, rebuilding constraints is required.")
-    try: connectsConsts = scene["bcb_connectsConsts"]
+    try: connectsConsts = fields["connectsConsts"]
     except: connectsConsts = []; print("Error: bcb_connectsConsts property not found, rebuilding constraints is required.")
-    try: connectsGeo = scene["bcb_connectsGeo"]
+    try: connectsGeo = fields["connectsGeo"]
     except: connectsGeo = []; print("Error: bcb_connectsGeo property not found, rebuilding constraints is required.")
     
     ### Create original transform data array
@@ -777,8 +769,8 @@ def monitor_initBuffers_fm(scene):
             Prio_A = elemGrps_elemGrpA[EGSidxPrio]
             Prio_B = elemGrps_elemGrpB[EGSidxPrio]
             elemGrp = None
-            if Prio_A >= Prio_B: elemGrp = elemGrps_elemGrpA
-            else:                elemGrp = elemGrps_elemGrpB
+            if Prio_A >= Prio_B: elemGrp = elemGrps_elemGrpA; elemGrpIdx = elemGrpA
+            else:                elemGrp = elemGrps_elemGrpB; elemGrpIdx = elemGrpB
             qMohrCoulomb = elemGrp[EGSidxMCTh]
             mul = elemGrp[EGSidxBTX]
             qProgrWeak = elemGrp[EGSidxPrWk]
@@ -806,8 +798,8 @@ def monitor_initBuffers_fm(scene):
                 else:
                     constsEnabled.append(0)
                     constsBrkThres.append(0)
-            #                0                1                2       3              4               5               6             7    8
-            connects.append([[objA, pair[0]], [objB, pair[1]], consts, constsEnabled, geoContactArea, constsBrkThres, qMohrCoulomb, mul, qProgrWeak])
+            #                0                1                2       3              4               5               6             7    8           9
+            connects.append([[objA, pair[0]], [objB, pair[1]], consts, constsEnabled, geoContactArea, constsBrkThres, qMohrCoulomb, mul, qProgrWeak, elemGrpIdx])
             cCnt += 1
         d += 1
         
@@ -832,117 +824,43 @@ def monitor_checkForChange_fm(scene):
     except: print("Error: Fracture Modifier object expected but not found."); return
     md = ob.modifiers["Fracture"]
 
-    # Get intact flag of all connections (if broken or not)
-    consIntact = []
-    for connect in connects:
-        consts = connect[2]
-        if len(consts) > 0: consIntact.append(consts[0].isIntact())
-        else:               consIntact.append(0)
+    # Get intact and breakable flag of all connections
+    qActive = np.zeros(len(connects), dtype=np.bool_)
+    for k in range(len(connects)):
+        consts = connects[k][2]
+        if len(consts) > 0 and consts[0].isIntact() and consts[0].use_breaking: qActive[k] = 1
 
     # Diagnostic verbose
     if props.submenu_assistant_advanced:
         brokenC, brokenT, brokenS, brokenB = 0, 0, 0, 0
+        for k in np.nonzero(qActive)[0]:
+            connect = connects[k]
+            if connect[6]:  # qMohrCoulomb
+                consts = connect[2]
+                for i in range(0, len(consts)):
+                    con = consts[i]
+                    if not con.isIntact():
+                        if   i == 0: brokenC += 1
+                        elif i == 1: brokenT += 1
+                        elif i == 2 or i == 3: brokenS += 1
+                        elif i == 4 or i == 5: brokenB += 1
         
-    ###### Initial pass for the Mohr-Coulomb theory to measure the pressure acting per element
-    objsForces = {}
-    objsConstCnts = {}
-    c = 0
-    for connect in connects:
-        consts = connect[2]
-        conIntact = consIntact[c]
-        c += 1
-
-        if conIntact:
-            if consts[0].use_breaking:
-                qMohrCoulomb = connect[6]
-
-                if qMohrCoulomb:
-                    ### Determine force of the compressive constraints in connection
-                    force = 0
-                    for con in consts[:2]:  # Only first two constraints can provide a compressive force for most CTs (except spring arrays)
-                        ### For Point and Fixed costraints
-                        ### For Generic constraints
-                        # Compressive constraints
-                        if con.type != 'GENERIC' \
-                        or con.use_limit_lin_x:
-                            forceCon = abs(con.appliedImpulse()) *rbw_steps_per_second /rbw_time_scale  # Conversion from impulses to forces
-                            force += forceCon
-                    # Summarize forces and add them to the forces list, also counting the number of connections
-                    objA = connect[0][0]
-                    objB = connect[1][0]
-                    for obj in [objA, objB]:
-                        if obj not in objsForces: objsForces[obj] = force
-                        else:                     objsForces[obj] += force
-                        if obj not in objsConstCnts: objsConstCnts[obj] = 1
-                        else:                        objsConstCnts[obj] += 1
-
-    ###### Main pass
-    c = 0
-    for connect in connects:
-        consts = connect[2]
-        conIntact = consIntact[c]
-        c += 1
-
-        if conIntact:
-            if consts[0].use_breaking:
-                objA = connect[0][0]
-                objB = connect[1][0]
-                contactArea = connect[4]
-                constsBrkThres = connect[5]
-                qMohrCoulomb = connect[6]
-                mul = connect[7]
-                qProgrWeak = connect[8]
-            
-                ### Dynamic change of breaking thresholds depending on pressure (Mohr-Coulomb theory)
-                if qMohrCoulomb:
-                    ### Diagnostic verbose
-                    if props.submenu_assistant_advanced:
-                        for i in range(0, len(consts)):
-                            con = consts[i]
-                            if not con.isIntact():
-                                if   i == 0: brokenC += 1
-                                elif i == 1: brokenT += 1
-                                elif i == 2 or i == 3: brokenS += 1
-                                elif i == 4 or i == 5: brokenB += 1
-                    ### Determine force of the compressive constraints in connection
-                    force = 0
-                    for con in consts[:2]:  # Only first two constraints can provide a compressive force for most CTs (except spring arrays)
-                        ### For Point and Fixed costraints
-                        ### For Generic constraints
-                        # Compressive constraints
-                        if con.type != 'GENERIC' \
-                        or con.use_limit_lin_x:
-                            forceCon = abs(con.appliedImpulse()) *rbw_steps_per_second /rbw_time_scale  # Conversion from impulses to forces
-                            force += forceCon
-                    ### Get forces from the force list for both connected elements and divide it by the number of connections
-                    forceA = objsForces[objA] /objsConstCnts[objA]
-                    forceB = objsForces[objB] /objsConstCnts[objB]
-                    #forceElem = min(forceA, forceB)  # Use the smaller force and thus strength for the connection
-                    forceElem = (forceA +forceB) /2  # Calculate average force and thus strength for the connection
-                    force = (force +forceElem) /2  # Use also the average of the averaged force per element and the invididual constraint force
-                    ### Compute new breaking threshold incease based on force
-                    # σ = F /A
-                    # τ = c +σ *tan(ϕ)
-                    brkThresInc = force /contactArea *1 *mul
-                    # Modify constraints
-                    for i in range(1, len(consts)):  # First constraint is always pressure
-                        con = consts[i]
-                        ### For Point and Fixed costraints
-                        ### For Generic constraints
-                        # Tensile constraints - Comment this line out to include all constraints
-                        # Shear constraints - Comment this line out to include all constraints
-                        # Bend constraints - Comment this line out to include all constraints
-                        if con.type != 'GENERIC' \
-                        or con.use_limit_lin_x \
-                        or con.use_limit_lin_y or con.use_limit_lin_z \
-                        or con.use_limit_ang_x or con.use_limit_ang_y or con.use_limit_ang_z:
-                            # Apply breaking threshold incease
-                            con.breaking_threshold = constsBrkThres[i] +(brkThresInc *rbw_time_scale /rbw_steps_per_second)
-
-                # Progressive Weakening
-                if qProgrWeak and progrWeakVar != 1:
-                    for const in consts:
-                        const.breaking_threshold *= progrWeakVar
+    ### Dynamic change of breaking thresholds depending on pressure (Mohr-Coulomb theory)
+    monitorLogLap("checkForChange")
+    mohrCoulomb = monitor_initMohrCoulomb(scene)
+    mohrCoulomb.update(qActive, qActive, rbw_steps_per_second, rbw_time_scale)
+    monitorLogLap("mohrCoulomb")
+
+    ### Progressive Weakening
+    if progrWeakVar != 1:
+        qProgrWeak = np.zeros(len(connects), dtype=np.bool_)
+        for k in np.nonzero(qActive)[0]:
+            connect = connects[k]
+            if connect[8]:  # qProgrWeak
+                for const in connect[2]:
+                    const.breaking_threshold *= progrWeakVar
+                qProgrWeak[k] = 1
+        mohrCoulomb.scaleWritten(qProgrWeak, progrWeakVar)
                 
     # Diagnostic verbose
     if props.submenu_assistant_advanced and (brokenC or brokenT or brokenS or brokenB):
@@ -992,31 +910,55 @@ def monitor_countIntactConnections_fm(scene):
 
 ################################################################################
 
+def monitor_logFrame(scene, cntBroken=None):
+
+    ### Count intact, plastic and broken connections per element group and add them to the monitor log
+    monitorLogLap("other")
+    if not monitorLogActive(): return
+
+    props = bpy.context.window_manager.bcb
+    elemGrps = global_vars.elemGrps
+    connects = bpy.app.driver_namespace["bcb_monitor"]
+
+    grpCnts = {}
+    if connects != None and len(connects):
+        if isinstance(connects, monitorState):
+            conElemGrp = connects.elemGrp
+            conState = np.minimum(connects.mode, 2)  # 0 = intact, 1 = plastic, 2 = broken
+            ### Connections broken by Bullet through their breaking thresholds keep their mode, so their constraints are checked as well
+            consts = connects.consts; constsStart = connects.constsStart.tolist(); constsSpring = connects.constsSpring
+            for k in np.nonzero(connects.qBreakable &(conState < 2))[0].tolist():
+                # Fixed connections are represented by their first constraint, plastic ones by their first spring constraint
+                for i in range(constsStart[k], constsStart[k +1]):
+                    if conState[k] == 0 or constsSpring[i]: break
+                try: qIntact = consts[i].rigid_body_constraint.isIntact()
+                except: qIntact = 1
+                if not qIntact: conState[k] = 2
+        # When Fracture Modifier is in use (no plastic mode, connections are broken when their first constraint is)
+        else:
+            conElemGrp = np.array([connect[9] for connect in connects], dtype=np.int64)
+            conState = np.zeros(len(connects), dtype=np.int64)
+            for k in range(len(connects)):
+                consts = connects[k][2]
+                if len(consts) > 0 and consts[0] != None and not consts[0].isIntact(): conState[k] = 2
+        cnts = np.zeros((len(elemGrps), 3), dtype=np.int64)
+        np.add.at(cnts, (conElemGrp, conState), 1)
+        for i in np.nonzero(cnts.any(axis=1))[0]:
+            grpCnts[elemGrps[i][EGSidxName]] = cnts[i].tolist()
+
+    if props.progrWeak: progrWeak = round(bpy.app.driver_namespace["bcb_progrWeakCurrent"] *props.progrWeakStartFact, 6)
+    else: progrWeak = None
+
+    monitorLogFrame(scene.frame_current, grpCnts, progrWeak, cntBroken)
+
+################################################################################
+
 def monitor_initTriggers(scene):
 
     props = bpy.context.window_manager.bcb
     elemGrps = global_vars.elemGrps
-    ### Get data from scene
-    try: objs = scene["bcb_objs"]
-    except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-    try: objsEGrp = scene["bcb_objsEGrp"]
-    except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
-    
-    ### Create group index with their respective objects
-    grpsObjs = {}
-    for elemGrp in elemGrps:
-        grpName = elemGrp[EGSidxName]
-        grpObjs = []
-        for obj in objs:
-            elemGrpIdx = objsEGrp[objsDict[obj]]
-            if elemGrpIdx != -1:
-                if elemGrp == elemGrps[elemGrpIdx]:
-                    grpObjs.append(obj)
-        grpsObjs[grpName] = grpObjs
+    ### Get element group index with their respective objects from scene (cached during simulation)
+    grpsObjs = getElementGroupObjectListsFromScene(scene)
     
     ### Get trigger data from text file
     try: triggers = bpy.data.texts[asciiTriggersName +".txt"].as_string()
@@ -1059,8 +1001,6 @@ def monitor_initTriggers(scene):
             print("One of more names can be interpreted as group, trigger list will be extended with their members.")
         print()
         
-        bpy.app.driver_namespace["bcb_triggers"] = triggers
-        
         # When Fracture Modifier is in use
         if hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') and asciiExportName in scene.objects:
 
@@ -1073,32 +1013,60 @@ def monitor_initTriggers(scene):
             for const in md.mesh_constraints:
                 connects.append([bool(const.enabled), float(const.breaking_threshold)])
 
+            ### Map element name pairs to constraint indices
+            pairsIdx = {}
+            for i, const in enumerate(md.mesh_constraints):
+                pair = (const.island1.name, const.island2.name)
+                try: pairsIdx[pair].append(i)
+                except: pairsIdx[pair] = [i]
+
+        # When official Blender and not Fracture Modifier is in use
+        else:
+            ### Map element name pairs to connection indices
+            connects = bpy.app.driver_namespace["bcb_monitor"]
+            objsNames = [obj.name for obj in connects.objs]
+            pairsIdx = {}
+            for k in range(len(connects)):
+                pair = (objsNames[connects.objA[k]], objsNames[connects.objB[k]])
+                try: pairsIdx[pair].append(k)
+                except: pairsIdx[pair] = [k]
+
+        ### Resolve triggers to connection indices and sort them by frame, so only a lookup is required per frame
+        triggersFrames = {}
+        for trigger in triggers:
+            objAt = trigger[1]
+            objBt = trigger[2]
+            idxs = []
+            try: idxs.extend(pairsIdx[(objAt, objBt)])
+            except: pass
+            if objAt != objBt:
+                try: idxs.extend(pairsIdx[(objBt, objAt)])
+                except: pass
+            if len(idxs):
+                try: triggersFrames[trigger[0]].append([objAt, objBt, idxs])
+                except: triggersFrames[trigger[0]] = [[objAt, objBt, idxs]]
+
+        bpy.app.driver_namespace["bcb_triggers"] = triggersFrames
+
 ################################################################################
 
 def monitor_checkForTriggers(scene):
 
     if debug: print("Calling checkForTriggers")
 
-    try: triggers = bpy.app.driver_namespace["bcb_triggers"]
+    try: triggers = bpy.app.driver_namespace["bcb_triggers"][scene.frame_current]
     except: return
     connects = bpy.app.driver_namespace["bcb_monitor"]
 
     triggerCnt = 0    
-    for trigger in triggers:
-        if trigger[0] == scene.frame_current:
-            objAt = trigger[1]
-            objBt = trigger[2]
-            for connect in connects:
-                objAn = connect[0][0].name
-                objBn = connect[1][0].name
-                if (objAn == objAt and objBn == objBt) or (objAn == objBt and objBn == objAt):
-                    if triggerCnt < 10:
-                        print("Triggered connection: %s, %s" %(objAt, objBt))
-                        triggerCnt += 1
-                    consts = connect[4]
-                    for const in consts:
-                        const.rigid_body_constraint.enabled = 0
-                    connect[12] = 2  # conMode
+    for objAt, objBt, idxs in triggers:
+        for k in idxs:
+            if triggerCnt < 10:
+                print("Triggered connection: %s, %s" %(objAt, objBt))
+                triggerCnt += 1
+            for const in connects.getConsts(k):
+                const.rigid_body_constraint.enabled = 0
+            connects.mode[k] = 2  # conMode
     if triggerCnt > 10:
         print("Triggered further %d connection(s)." %(triggerCnt -10))
                     
@@ -1108,29 +1076,24 @@ def monitor_checkForTriggers_fm(scene):
 
     if debug: print("Calling checkForTriggers_fm")
 
-    try: triggers = bpy.app.driver_namespace["bcb_triggers"]
+    try: triggers = bpy.app.driver_namespace["bcb_triggers"][scene.frame_current]
     except: return
 
     # Get Fracture Modifier
     try: ob = scene.objects[asciiExportName]
     except: print("Error: Fracture Modifier object expected but not found."); return
     md = ob.modifiers["Fracture"]
+    mdConsts = md.mesh_constraints
 
     triggerCnt = 0    
-    for trigger in triggers:
-        if trigger[0] == scene.frame_current:
-            objAt = trigger[1]
-            objBt = trigger[2]
-            qPrintOnce = 1
-            for const in md.mesh_constraints:
-                objAn = const.island1.name
-                objBn = const.island2.name
-                if (objAn == objAt and objBn == objBt) or (objAn == objBt and objBn == objAt):
-                    if triggerCnt < 10:
-                        print("Triggered constraint: %s, %s" %(objAt, objBt))
-                        triggerCnt += 1
-                    const.enabled = 0
-                    const.breaking_threshold = 0  # FM will switch to plastic mode if 1st tolerance is exceeded, so we also need to reset BT
+    for objAt, objBt, idxs in triggers:
+        for i in idxs:
+            const = mdConsts[i]
+            if triggerCnt < 10:
+                print("Triggered constraint: %s, %s" %(objAt, objBt))
+                triggerCnt += 1
+            const.enabled = 0
+            const.breaking_threshold = 0  # FM will switch to plastic mode if 1st tolerance is exceeded, so we also need to reset BT
     if triggerCnt > 10:
         print("Triggered further %d constraint(s)." %(triggerCnt -10))
 
@@ -1144,12 +1107,12 @@ def monitor_fixSprings(scene):
     
     qFM = hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE')
     fixSprCnt = 0
-    for connect in connects:
-        consts = connect[4]
+    for k in range(len(connects)):
+        consts = connects.getConsts(k)
         for const in consts:
             if const.rigid_body_constraint.type == "GENERIC_SPRING" and const.rigid_body_constraint.enabled and (not qFM or (qFM and const.rigid_body_constraint.isIntact())):
-                objA = connect[0][0]
-                objB = connect[1][0]
+                objA = connects.objs[connects.objA[k]]
+                objB = connects.objs[connects.objB[k]]
 
                 ### Create new constraint (Todo: Triggers are ignored for now)
                 objConst = bpy.data.objects.new('Con', None)
@@ -1248,121 +1211,45 @@ def monitor_motorWarmUp_fm(scene):
             
 ################################################################################
 
-def monitor_dampingRegion(scene):
-
-    if debug: print("Calling dampingRegion")
+def monitor_getDampingRegionObjects(scene):
 
+    ### Get damping region objects
     props = bpy.context.window_manager.bcb
-
-    ### Get damping region object
     dampRegObjs = []
     if len(props.dampRegObj):
         for obj in scene.objects:
             if props.dampRegObj in obj.name:
                 dampRegObjs.append(obj)
-    if len(dampRegObjs):
-        if scene.frame_current == scene.frame_start: print("Damping region object(s) found:", len(dampRegObjs))
-    else: return
+    if len(dampRegObjs): print("Damping region object(s) found:", len(dampRegObjs))
+    return dampRegObjs
 
-    elemGrps = global_vars.elemGrps
+########################################
 
-    ### Get data from scene
-    try: objs = scene["bcb_objs"]
-    except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-    try: objsEGrp = scene["bcb_objsEGrp"]
-    except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
-    
-    ### Create group index with their respective objects
-    grpsObjs = {}
-    for elemGrp in elemGrps:
-        grpName = elemGrp[EGSidxName]
-        grpObjs = []
-        for obj in objs:
-            elemGrpIdx = objsEGrp[objsDict[obj]]
-            if elemGrpIdx != -1:
-                if elemGrp == elemGrps[elemGrpIdx]:
-                    grpObjs.append(obj)
-        grpsObjs[grpName] = grpObjs
-    
-    ### On start frame backup data
+def monitor_dampingRegion(scene):
+
+    if debug: print("Calling dampingRegion")
+
+    props = bpy.context.window_manager.bcb
+
+    ### On start frame get damping regions and backup data of damped elements (cached during simulation)
     if "bcb_damps" not in bpy.app.driver_namespace:
-        dampsData = bpy.app.driver_namespace["bcb_damps"] = []    
-
-        for elemGrp in elemGrps:
-            qDampReg = elemGrp[EGSidxDmpR]
-            if qDampReg:
-                grpName = elemGrp[EGSidxName]
-                for objName in grpsObjs[grpName]:
-                    obj = scene.objects[objName]
-                    dampsData.append([obj.rigid_body.linear_damping, obj.rigid_body.angular_damping, 0])
+        dampRegObjs = monitor_getDampingRegionObjects(scene)
+        objs = []
+        if len(dampRegObjs):
+            elemGrps = global_vars.elemGrps
+            ### Get element group index with their respective objects from scene (cached during simulation)
+            grpsObjs = getElementGroupObjectListsFromScene(scene)
+            objNames = []
+            for elemGrp in elemGrps:
+                if elemGrp[EGSidxDmpR]:
+                    objNames.extend(grpsObjs[elemGrp[EGSidxName]])
+            objs = [obj for obj in resolveObjectNames(scene, objNames)[0] if obj != None and obj.rigid_body != None]
+        damps = bpy.app.driver_namespace["bcb_damps"] = monitorDampingRegions(dampRegObjs, [obj.rigid_body for obj in objs], objs)
     else:
-        dampsData = bpy.app.driver_namespace["bcb_damps"]
-
-    ### Precompute region data once per frame:
-    # For each dampRegObj compute:
-    #   - axis-aligned min/max bound (location ± scale)
-    #   - linear and angular damping values (using object properties fallback to props)
-    dampRegData = []
-    for region in dampRegObjs:
-        min_bound = region.location - region.scale
-        max_bound = region.location + region.scale
-        dampLin = props.dampRegLin
-        dampAng = props.dampRegAng
-        if "dampRegLinear" in region.keys():
-            dampLin = region["dampRegLinear"]
-        if "dampRegAngular" in region.keys():
-            dampAng = region["dampRegAngular"]
-        dampRegData.append((min_bound, max_bound, dampLin, dampAng))
+        damps = bpy.app.driver_namespace["bcb_damps"]
 
     ### Set new damping
-    if len(dampsData):
-
-        dataIdx = 0
-        for elemGrp in elemGrps:
-            qDampReg = elemGrp[EGSidxDmpR]
-            if qDampReg:
-                grpName = elemGrp[EGSidxName]
-                for objName in grpsObjs[grpName]:
-
-                    obj = scene.objects[objName]
-                    objLoc = obj.matrix_world.to_translation()
-                    objRB = obj.rigid_body
-
-                    # Retrieve original values and flag
-                    dampLinOrig, dampAngOrig, qFlagged = dampsData[dataIdx]
-
-                    # Start from original values, then combine for regions that contain the object
-                    newLin = dampLinOrig
-                    newAng = dampAngOrig
-                    inAnyRegion = False
-
-                    # Use precomputed region data
-                    for (min_bound, max_bound, rLin, rAng) in dampRegData:
-                        if (min_bound.x <= objLoc.x <= max_bound.x and
-                            min_bound.y <= objLoc.y <= max_bound.y and
-                            min_bound.z <= objLoc.z <= max_bound.z):
-                            inAnyRegion = True
-                            # Non-linear combination as in original implementation
-                            newLin = (1 - (1 - newLin) * (1 - rLin))
-                            newAng = (1 - (1 - newAng) * (1 - rAng))
-
-                    if inAnyRegion:
-                        # Apply combined damping values
-                        if objRB.linear_damping != newLin: objRB.linear_damping = newLin
-                        if objRB.angular_damping != newAng: objRB.angular_damping = newAng
-                        dampsData[dataIdx][2] = 1
-                    else:
-                        # If it was flagged previously but now outside regions -> restore original
-                        if qFlagged:
-                            if objRB.linear_damping != dampLinOrig: objRB.linear_damping = dampLinOrig
-                            if objRB.angular_damping != dampAngOrig: objRB.angular_damping = dampAngOrig
-                            dampsData[dataIdx][2] = 0
-
-                    dataIdx += 1
+    damps.update(props.dampRegLin, props.dampRegAng)
 
 ########################################
 
@@ -1372,121 +1259,29 @@ def monitor_dampingRegion_fm(scene):
 
     props = bpy.context.window_manager.bcb
 
-    ### Get damping region object
-    dampRegObjs = []
-    if len(props.dampRegObj):
-        for obj in scene.objects:
-            if props.dampRegObj in obj.name:
-                dampRegObjs.append(obj)
-    if len(dampRegObjs):
-        if scene.frame_current == scene.frame_start: print("Damping region object(s) found:", len(dampRegObjs))
-    else: return
-
-    elemGrps = global_vars.elemGrps
-
-    # When Fracture Modifier is in use
-    if hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') and asciiExportName in scene.objects:
-        try: objFM = scene.objects[asciiExportName]
-        except: print("Error: Fracture Modifier object expected but not found."); return
-        md = objFM.modifiers["Fracture"]
-
-    ### Get data from scene
-    try: objs = scene["bcb_objs"]
-    except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-    try: objsEGrp = scene["bcb_objsEGrp"]
-    except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
-    
-    ### Create group index with their respective objects
-    grpsObjs = {}
-    for elemGrp in elemGrps:
-        grpName = elemGrp[EGSidxName]
-        grpObjs = []
-        for obj in objs:
-            elemGrpIdx = objsEGrp[objsDict[obj]]
-            if elemGrpIdx != -1:
-                if elemGrp == elemGrps[elemGrpIdx]:
-                    grpObjs.append(obj)
-        grpsObjs[grpName] = grpObjs
-    
-    ### On start frame backup data
+    ### On start frame get damping regions and backup data of damped elements (cached during simulation)
     if "bcb_damps" not in bpy.app.driver_namespace:
-        dampsData = bpy.app.driver_namespace["bcb_damps"] = []    
-
-        for elemGrp in elemGrps:
-            qDampReg = elemGrp[EGSidxDmpR]
-            if qDampReg:
-                grpName = elemGrp[EGSidxName]
-                for objName in grpsObjs[grpName]:
-                    shard = md.mesh_islands[objName]
-                    dampsData.append([shard.rigidbody.linear_damping, shard.rigidbody.angular_damping, 0])
+        dampRegObjs = monitor_getDampingRegionObjects(scene)
+        rbs = []
+        if len(dampRegObjs):
+            # When Fracture Modifier is in use
+            if hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') and asciiExportName in scene.objects:
+                try: objFM = scene.objects[asciiExportName]
+                except: print("Error: Fracture Modifier object expected but not found."); return
+                md = objFM.modifiers["Fracture"]
+            elemGrps = global_vars.elemGrps
+            ### Get element group index with their respective objects from scene (cached during simulation)
+            grpsObjs = getElementGroupObjectListsFromScene(scene)
+            for elemGrp in elemGrps:
+                if elemGrp[EGSidxDmpR]:
+                    for objName in grpsObjs[elemGrp[EGSidxName]]:
+                        rbs.append(md.mesh_islands[objName].rigidbody)
+        damps = bpy.app.driver_namespace["bcb_damps"] = monitorDampingRegions(dampRegObjs, rbs)
     else:
-        dampsData = bpy.app.driver_namespace["bcb_damps"]
-
-    ### Precompute region data once per frame:
-    # For each dampRegObj compute:
-    #   - axis-aligned min/max bound (location ± scale)
-    #   - linear and angular damping values (using object properties fallback to props)
-    dampRegData = []
-    for region in dampRegObjs:
-        min_bound = region.location - region.scale
-        max_bound = region.location + region.scale
-        dampLin = props.dampRegLin
-        dampAng = props.dampRegAng
-        if "dampRegLinear" in region.keys():
-            dampLin = region["dampRegLinear"]
-        if "dampRegAngular" in region.keys():
-            dampAng = region["dampRegAngular"]
-        dampRegData.append((min_bound, max_bound, dampLin, dampAng))
+        damps = bpy.app.driver_namespace["bcb_damps"]
 
     ### Set new damping
-    if len(dampsData):
-
-        dataIdx = 0
-        for elemGrp in elemGrps:
-            qDampReg = elemGrp[EGSidxDmpR]
-            if qDampReg:
-                grpName = elemGrp[EGSidxName]
-                for objName in grpsObjs[grpName]:
-
-                    shard = md.mesh_islands[objName]
-                    objLoc = shard.rigidbody.location
-                    objRB = shard.rigidbody
-
-                    # Retrieve original values and flag
-                    dampLinOrig, dampAngOrig, qFlagged = dampsData[dataIdx]
-
-                    # Start from original values, then combine for regions that contain the object
-                    newLin = dampLinOrig
-                    newAng = dampAngOrig
-                    inAnyRegion = False
-
-                    # Use precomputed region data
-                    for (min_bound, max_bound, rLin, rAng) in dampRegData:
-                        if (min_bound.x <= objLoc.x <= max_bound.x and
-                            min_bound.y <= objLoc.y <= max_bound.y and
-                            min_bound.z <= objLoc.z <= max_bound.z):
-                            inAnyRegion = True
-                            # Non-linear combination as in original implementation
-                            newLin = (1 - (1 - newLin) * (1 - rLin))
-                            newAng = (1 - (1 - newAng) * (1 - rAng))
-
-                    if inAnyRegion:
-                        # Apply combined damping values
-                        if objRB.linear_damping != newLin: objRB.linear_damping = newLin
-                        if objRB.angular_damping != newAng: objRB.angular_damping = newAng
-                        dampsData[dataIdx][2] = 1
-                    else:
-                        # If it was flagged previously but now outside regions -> restore original
-                        if qFlagged:
-                            if objRB.linear_damping != dampLinOrig: objRB.linear_damping = dampLinOrig
-                            if objRB.angular_damping != dampAngOrig: objRB.angular_damping = dampAngOrig
-                            dampsData[dataIdx][2] = 0
-
-                    dataIdx += 1
+    damps.update(props.dampRegLin, props.dampRegAng)
 
 ################################################################################
 
@@ -1495,70 +1290,62 @@ def monitor_displCorrectDiffExport(scene):
     elemGrps = global_vars.elemGrps
 
     # When Fracture Modifier is in use
-    if hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') and asciiExportName in scene.objects:
+    qFM = hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') and asciiExportName in scene.objects
+    if qFM:
         try: objFM = scene.objects[asciiExportName]
         except: print("Error: Fracture Modifier object expected but not found."); return
         md = objFM.modifiers["Fracture"]
+        matFM = np.array(objFM.matrix_world)
 
-    ### Get data from scene
-    try: objs = scene["bcb_objs"]
-    except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-    try: objsEGrp = scene["bcb_objsEGrp"]
-    except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
-    ### Prepare dictionary of element indices for faster item search (optimization)
-    objsDict = {}
-    for i in range(len(objs)):
-        objsDict[objs[i]] = i
-    
-    ### Create group index with their respective objects
-    grpsObjs = {}
-    for elemGrp in elemGrps:
-        grpName = elemGrp[EGSidxName]
-        grpObjs = []
-        for obj in objs:
-            elemGrpIdx = objsEGrp[objsDict[obj]]
-            if elemGrpIdx != -1:
-                if elemGrp == elemGrps[elemGrpIdx]:
-                    grpObjs.append(obj)
-        grpsObjs[grpName] = grpObjs
+    ### Get element group index with their respective objects from scene (cached during simulation)
+    grpsObjs = getElementGroupObjectListsFromScene(scene)
     
-    if "bcb_vLocs" not in bpy.app.driver_namespace:
-        vLocData = bpy.app.driver_namespace["bcb_vLocs"] = []    
-        qStartFrame = 1
-    else:
-        vLocDataStart = bpy.app.driver_namespace["bcb_vLocs"]  
-        vLocData = []
-        qStartFrame = 0
+    qStartFrame = "bcb_vLocs" not in bpy.app.driver_namespace
 
+    ### Gather world space vertex locations of all elements to correct as one array
+    objNames = []
     for elemGrp in elemGrps:
         grpDCor = elemGrp[EGSidxDCor]
         if grpDCor:
             grpName = elemGrp[EGSidxName]
-            for objName in grpsObjs[grpName]:
-
-                # When official Blender and not Fracture Modifier is in use
-                if not hasattr(bpy.types.DATA_PT_modifiers, 'FRACTURE') or not asciiExportName in scene.objects:
-                    obj = scene.objects[objName]
-                    for vert in obj.data.vertices:
-                        vLoc_world = obj.matrix_world *vert.co  # Vertex location in world space
-                        vLocData.append(vLoc_world)
-                # When Fracture Modifier is in use
-                else:
-                    shard = md.mesh_islands[objName]
-                    for vert in shard.vertices:
-                        vLoc_world = objFM.matrix_world *vert.co  # Vertex location in world space
-                        vLocData.append(vLoc_world)
-
+            objNames.extend(grpsObjs[grpName])
+    vertCnts = []
+    vLocsList = []
+    # When official Blender and not Fracture Modifier is in use
+    if not qFM:
+        objs, objNamesMissing = resolveObjectNames(scene, objNames)
+        if len(objNamesMissing):
+            print("Error: Displacement correction elements not found in scene:", len(objNamesMissing)); return
+        for obj in objs:
+            me = obj.data
+            vertCnt = len(me.vertices)
+            cos = np.empty(vertCnt *3, dtype=np.float32)
+            me.vertices.foreach_get("co", cos)
+            mat = np.array(obj.matrix_world)
+            vLocsList.append(np.dot(cos.reshape((vertCnt, 3)), mat[:3, :3].T) +mat[:3, 3])  # Vertex locations in world space
+            vertCnts.append(vertCnt)
+    # When Fracture Modifier is in use
+    else:
+        for objName in objNames:
+            shard = md.mesh_islands[objName]
+            cos = np.array([tuple(vert.co) for vert in shard.vertices], dtype=np.float64).reshape((-1, 3))
+            vLocsList.append(np.dot(cos, matFM[:3, :3].T) +matFM[:3, 3])  # Vertex locations in world space
+            vertCnts.append(len(cos))
+    if len(vLocsList): vLocData = np.concatenate(vLocsList)
+    else: vLocData = np.zeros((0, 3))
+
+    if qStartFrame:
+        bpy.app.driver_namespace["bcb_vLocs"] = vLocData
+        
     ### Export data to file
-    if not qStartFrame and len(vLocData):
+    elif len(vLocData):
+        vLocDataStart = bpy.app.driver_namespace["bcb_vLocs"]
         if len(vLocData) == len(vLocDataStart):
-            for idx in range(len(vLocData)):
-                vLocData[idx] = tuple(vLocData[idx] -vLocDataStart[idx])
-            filePath = os.path.join(logPath, "bcb-diff-%d.cfg" %len(vLocData))
+            filePath = getDisplCorrectionFilePath(objNames, vertCnts)
             if not os.path.exists(filePath):
                 print("Displacement correction vertices: %d" %len(vLocData))
                 print("Exporting displacement correction data to:", filePath)
-                dataToFile(vLocData, filePath, qPickle=True, qCompressed=True)
+                arrayToFile((vLocData -vLocDataStart).astype(np.float32), filePath)
                 # Clear vertex location properties
                 del bpy.app.driver_namespace["bcb_vLocs"]
         else:
@@ -1575,80 +1362,42 @@ def monitor_freeBuffers(scene):
         elemGrps = global_vars.elemGrps
         connects = bpy.app.driver_namespace["bcb_monitor"]
 
-        ### Get data from scene
-        try: objs = scene["bcb_objs"]
-        except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-        try: objsEGrp = scene["bcb_objsEGrp"]
-        except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
-        ### Prepare dictionary of element indices for faster item search (optimization)
-        objsDict = {}
-        for i in range(len(objs)):
-            objsDict[objs[i]] = i
-
-        ### Create group index with their respective objects
-        grpsObjs = {}
-        for elemGrp in elemGrps:
-            grpName = elemGrp[EGSidxName]
-            grpObjs = []
-            for obj in objs:
-                elemGrpIdx = objsEGrp[objsDict[obj]]
-                if elemGrpIdx != -1:
-                    if elemGrp == elemGrps[elemGrpIdx]:
-                        grpObjs.append(obj)
-            grpsObjs[grpName] = grpObjs
+        ### Get element group index with their respective objects from scene (cached during simulation)
+        grpsObjs = getElementGroupObjectListsFromScene(scene)
 
         if connects != None:
 
             ### Restore original constraint and element data
             qWarning = 0
-            for connect in connects:
-                consts = connect[4]
-                constsEnabled = connect[5]
-                constsUseBrk = connect[6]
-                constsBrkThres = connect[13]
-                for i in range(len(consts)):
-                    const = consts[i]
-                    if const != None:
-                        if const.rigid_body_constraint != None and const.rigid_body_constraint.object1 != None:
-                            # Restore original settings
-                            const.rigid_body_constraint.enabled = constsEnabled[i]
-                            const.rigid_body_constraint.use_breaking = constsUseBrk[i]
-                            const.rigid_body_constraint.breaking_threshold = constsBrkThres[i]
-                        else:
-                            if not qWarning:
-                                qWarning = 1
-                                print("\rWarning: Element has lost its constraint references or the corresponding empties their constraint properties respectively, rebuilding constraints is recommended.")
-                            print("(%s)" %const.name)
+            consts = connects.consts
+            constsEnabled = connects.constsEnabled.tolist()
+            constsUseBrk = connects.constsUseBrk.tolist()
+            constsBrkThres = connects.constsBrkThres.tolist()
+            for i in range(len(consts)):
+                const = consts[i]
+                if const != None:
+                    if const.rigid_body_constraint != None and const.rigid_body_constraint.object1 != None:
+                        # Restore original settings
+                        const.rigid_body_constraint.enabled = constsEnabled[i]
+                        const.rigid_body_constraint.use_breaking = constsUseBrk[i]
+                        const.rigid_body_constraint.breaking_threshold = constsBrkThres[i]
+                    else:
+                        if not qWarning:
+                            qWarning = 1
+                            print("\rWarning: Element has lost its constraint references or the corresponding empties their constraint properties respectively, rebuilding constraints is recommended.")
+                        print("(%s)" %const.name)
                         
         ### Damping Region - revert RBs to original dampings
         if "bcb_damps" in bpy.app.driver_namespace:
-            ### Get damping region object
-            dampRegObjs = []
-            if len(props.dampRegObj):
-                for obj in scene.objects:
-                    if props.dampRegObj in obj.name:
-                        dampRegObjs.append(obj)
-            dampsData = bpy.app.driver_namespace["bcb_damps"]
-            if len(dampRegObjs) and len(dampsData):
-                dataIdx = 0
-                for elemGrp in elemGrps:
-                    qDampReg = elemGrp[EGSidxDmpR]
-                    if qDampReg:
-                        grpName = elemGrp[EGSidxName]
-                        for objName in grpsObjs[grpName]:
-                            obj = scene.objects[objName]
-                            objRB = obj.rigid_body
-                            # Get original values
-                            dampLinOrig, dampAngOrig, qFlagged = dampsData[dataIdx]
-                            dataIdx += 1
-                            # Reset values to original
-                            if objRB.linear_damping != dampLinOrig: objRB.linear_damping = dampLinOrig
-                            if objRB.angular_damping != dampAngOrig: objRB.angular_damping = dampAngOrig
-                                    
+            bpy.app.driver_namespace["bcb_damps"].restore()
             # Clear damping properties
             try: del bpy.app.driver_namespace["bcb_damps"]
             except: pass
 
+        # Clear cached element group index
+        try: del bpy.app.driver_namespace["bcb_grpsObjs"]
+        except: pass
+
 ################################################################################
 
 def monitor_freeBuffers_fm(scene):
@@ -1666,27 +1415,8 @@ def monitor_freeBuffers_fm(scene):
             except: print("Error: Fracture Modifier object expected but not found."); return
             md = objFM.modifiers["Fracture"]
 
-        ### Get data from scene
-        try: objs = scene["bcb_objs"]
-        except: objs = []; print("Error: bcb_objs property not found, rebuilding constraints is required.")
-        try: objsEGrp = scene["bcb_objsEGrp"]
-        except: objsEGrp = []; print("Error: bcb_objsEGrp property not found, cleanup may be incomplete.")
-        ### Prepare dictionary of element indices for faster item search (optimization)
-        objsDict = {}
-        for i in range(len(objs)):
-            objsDict[objs[i]] = i
-
-        ### Create group index with their respective objects
-        grpsObjs = {}
-        for elemGrp in elemGrps:
-            grpName = elemGrp[EGSidxName]
-            grpObjs = []
-            for obj in objs:
-                elemGrpIdx = objsEGrp[objsDict[obj]]
-                if elemGrpIdx != -1:
-                    if elemGrp == elemGrps[elemGrpIdx]:
-                        grpObjs.append(obj)
-            grpsObjs[grpName] = grpObjs
+        ### Get element group index with their respective objects from scene (cached during simulation)
+        grpsObjs = getElementGroupObjectListsFromScene(scene)
 
         if connects != None:
 
@@ -1711,32 +1441,15 @@ def monitor_freeBuffers_fm(scene):
 
         ### Damping Region - revert RBs to original dampings
         if "bcb_damps" in bpy.app.driver_namespace:
-            ### Get damping region object
-            dampRegObjs = []
-            if len(props.dampRegObj):
-                for obj in scene.objects:
-                    if props.dampRegObj in obj.name:
-                        dampRegObjs.append(obj)
-            dampsData = bpy.app.driver_namespace["bcb_damps"]
-            if len(dampRegObjs) and len(dampsData):
-                dataIdx = 0
-                for elemGrp in elemGrps:
-                    qDampReg = elemGrp[EGSidxDmpR]
-                    if qDampReg:
-                        grpName = elemGrp[EGSidxName]
-                        for objName in grpsObjs[grpName]:
-                            shard = md.mesh_islands[objName]
-                            objRB = shard.rigidbody
-                            # Get original values
-                            dampLinOrig, dampAngOrig, qFlagged = dampsData[dataIdx]
-                            dataIdx += 1
-                            # Reset values to original
-                            if objRB.linear_damping != dampLinOrig: objRB.linear_damping = dampLinOrig
-                            if objRB.angular_damping != dampAngOrig: objRB.angular_damping = dampAngOrig
+            bpy.app.driver_namespace["bcb_damps"].restore()
             # Clear damping properties
             try: del bpy.app.driver_namespace["bcb_damps"]
             except: pass
 
+        # Clear cached element group index
+        try: del bpy.app.driver_namespace["bcb_grpsObjs"]
+        except: pass
+
         # Clear monitor properties
         try: del bpy.app.driver_namespace["bcb_monitor_fm"]
         except: pass
@@ -1781,6 +1494,10 @@ def monitor_freeBuffers_both(scene):
         try: del bpy.app.driver_namespace["bcb_triggers"]
         except: pass
 
+        # Clear Mohr-Coulomb data
+        try: del bpy.app.driver_namespace["bcb_mohrCoulomb"]
+        except: pass
+
         # Clear vertex location properties
         try: del bpy.app.driver_namespace["bcb_vLocs"]
         except: pass
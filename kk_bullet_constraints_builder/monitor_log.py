@@ -0,0 +1,172 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import bpy, os, time, json, csv
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+### State of the currently running monitor log (None if disabled)
+monitorLogSession = None
+
+### Monitor sub-steps measured separately, everything else is accounted as "other"
+monitorLogSteps = ["checkForChange", "mohrCoulomb", "triggers", "damping", "other"]
+
+################################################################################
+
+def monitorLogStart(scene):
+
+    ### Start monitor log for a new simulation (only if enabled for developers)
+    global monitorLogSession
+    if not logMonitor: return
+    if monitorLogSession != None: monitorLogStop()
+
+    session = monitorLogSession = {}
+    name = os.path.splitext(os.path.basename(bpy.data.filepath))[0]
+    if not len(name): name = "untitled"
+    session["name"] = name
+    session["frameStart"] = scene.frame_start
+    session["frames"] = []   # Records are buffered and written on stop to keep file access out of the simulation
+    session["timeMonitorEnd"] = None
+    monitorLogFrameBegin()
+
+########################################
+
+def monitorLogActive():
+
+    return monitorLogSession != None
+
+########################################
+
+def monitorLogFrameBegin():
+
+    ### Reset sub-step timers at the beginning of the monitor for a new frame
+    session = monitorLogSession
+    if session == None: return
+    session["timeFrame"] = session["timeMark"] = time.time()
+    session["steps"] = {}
+
+########################################
+
+def monitorLogLap(step):
+
+    ### Add the time since the last lap to the given sub-step of the current frame
+    session = monitorLogSession
+    if session == None: return
+    timeNow = time.time()
+    steps = session["steps"]
+    try: steps[step] += timeNow -session["timeMark"]
+    except: steps[step] = timeNow -session["timeMark"]
+    session["timeMark"] = timeNow
+
+########################################
+
+def monitorLogFrame(frame, grpCnts, progrWeak, cntBroken=None):
+
+    ### Buffer record of the current frame
+    # grpCnts: {element group name: [intact, plastic, broken]}, cntBroken: total broken count if no group counts are available
+    session = monitorLogSession
+    if session == None: return
+
+    # Monitor time ends with the last lap so that the logging itself is not measured
+    timeMonitor = session["timeMark"] -session["timeFrame"]
+    # Time between the end of the last monitor run and the start of this one is spent in the Bullet step (and redraw)
+    if session["timeMonitorEnd"] != None: timeBullet = round(session["timeFrame"] -session["timeMonitorEnd"], 6)
+    else: timeBullet = None
+    if len(grpCnts):
+        cnts = [sum(grpCnt[i] for grpCnt in grpCnts.values()) for i in range(3)]
+    else: cnts = [None, None, cntBroken]
+    steps = session["steps"]
+    session["frames"].append({
+        "frame": frame,
+        "timeMonitor": round(timeMonitor, 6),
+        "timeBullet": timeBullet,
+        "steps": dict([(step, round(steps.get(step, 0), 6)) for step in monitorLogSteps]),
+        "progrWeak": progrWeak,
+        "intact": cnts[0],
+        "plastic": cnts[1],
+        "broken": cnts[2],
+        "groups": grpCnts
+        })
+    session["timeMonitorEnd"] = time.time()
+
+########################################
+
+def monitorLogStop():
+
+    ### Finish monitor log and write all buffered records next to the render output path
+    global monitorLogSession
+    session = monitorLogSession
+    if session == None: return
+    monitorLogSession = None
+
+    scene = bpy.context.scene
+    outPath = os.path.split(scene.render.filepath)[0]
+    outPath = bpy.path.abspath(outPath)
+    if logMonitor == 2: filePath = os.path.join(outPath, "bcb-monitor-%s.json" %session["name"])
+    else:               filePath = os.path.join(outPath, "bcb-monitor-%s.csv" %session["name"])
+    print("Writing monitor log to:", filePath)
+    frames = session["frames"]
+    try:
+        f = open(filePath, "w", newline="")
+        if logMonitor == 2:
+            log = {
+                "name": session["name"],
+                "blendFile": bpy.data.filepath,
+                "blenderVersion": bpy.app.version_string,
+                "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "frameStart": session["frameStart"],
+                "frames": frames
+                }
+            json.dump(log, f, indent=2)
+        else:
+            ### One row per frame with columns for every element group which occurred during the simulation
+            grpNames = []
+            for record in frames:
+                for grpName in record["groups"].keys():
+                    if grpName not in grpNames: grpNames.append(grpName)
+            stateNames = ["intact", "plastic", "broken"]
+            writer = csv.writer(f)
+            writer.writerow(["frame", "timeMonitor", "timeBullet"] +["time_" +step for step in monitorLogSteps] +["progrWeak"] +stateNames \
+                           +["%s:%s" %(grpName, state) for grpName in grpNames for state in stateNames])
+            for record in frames:
+                row = [record["frame"], record["timeMonitor"], record["timeBullet"]] +[record["steps"][step] for step in monitorLogSteps] \
+                     +[record["progrWeak"]] +[record[state] for state in stateNames]
+                for grpName in grpNames:
+                    try: row.extend(record["groups"][grpName])
+                    except: row.extend([None, None, None])
+                writer.writerow(["" if value == None else value for value in row])
+        f.close()
+    except: print('Error: Could not write file:', filePath)
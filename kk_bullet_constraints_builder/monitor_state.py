@@ -0,0 +1,312 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import bpy
+import numpy as np
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+def monitorQuatsFromMatrices(mats):
+
+    ### Quaternions (w, x, y, z) from an array of 3x3 matrices in Blender memory layout (mats[n][column][row])
+    # Vectorized version of mat3_to_quat() used by Matrix.to_quaternion(), signs are identical so angles match mathutils
+    mats = mats /np.linalg.norm(mats, axis=2)[:, :, None]
+    cnt = len(mats)
+    quats = np.empty((cnt, 4), dtype=np.float64)
+    m00 = mats[:, 0, 0]; m01 = mats[:, 0, 1]; m02 = mats[:, 0, 2]
+    m10 = mats[:, 1, 0]; m11 = mats[:, 1, 1]; m12 = mats[:, 1, 2]
+    m20 = mats[:, 2, 0]; m21 = mats[:, 2, 1]; m22 = mats[:, 2, 2]
+    tr = 0.25 *(1 +m00 +m11 +m22)
+    q0 = tr > 1e-4
+    q1 = ~q0 &(m00 > m11) &(m00 > m22)
+    q2 = ~q0 &~q1 &(m11 > m22)
+    q3 = ~q0 &~q1 &~q2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.sqrt(np.where(q0, tr, 1))
+        r = 1 /(4 *s)
+        quats[q0] = np.column_stack((s, (m12 -m21) *r, (m20 -m02) *r, (m01 -m10) *r))[q0]
+        s = 2 *np.sqrt(np.abs(1 +m00 -m11 -m22)); r = 1 /s
+        quats[q1] = np.column_stack(((m12 -m21) *r, 0.25 *s, (m10 +m01) *r, (m20 +m02) *r))[q1]
+        s = 2 *np.sqrt(np.abs(1 +m11 -m00 -m22)); r = 1 /s
+        quats[q2] = np.column_stack(((m20 -m02) *r, (m10 +m01) *r, 0.25 *s, (m21 +m12) *r))[q2]
+        s = 2 *np.sqrt(np.abs(1 +m22 -m00 -m11)); r = 1 /s
+        quats[q3] = np.column_stack(((m01 -m10) *r, (m20 +m02) *r, (m21 +m12) *r, 0.25 *s))[q3]
+    quats /= np.linalg.norm(quats, axis=1)[:, None]
+    return quats
+
+########################################
+
+def monitorQuatsRotationDifferenceAngle(quatsA, quatsB):
+
+    ### Same as quatA.rotation_difference(quatB).angle for arrays of unit quaternions (wrapped to -pi..pi like mathutils)
+    w = np.clip((quatsA *quatsB).sum(axis=1), -1, 1)
+    angl = 2 *np.arccos(np.abs(w))
+    angl[w < 0] *= -1
+    return angl
+
+########################################
+
+def monitorQuatsRotateZ(quats):
+
+    ### Z axis vectors rotated by quaternions (same as Vector((0,0,1)).rotate(quat))
+    w = quats[:, 0]; x = quats[:, 1]; y = quats[:, 2]; z = quats[:, 3]
+    return np.column_stack((2 *(x *z +w *y), 2 *(y *z -w *x), 1 -2 *(x *x +y *y)))
+
+################################################################################
+
+class monitorMatrixReader():
+
+    ### Bulk reader for the world matrices of a fixed list of objects
+    # All matrices of bpy.data.objects are read at once and the requested ones picked by index
+
+    def __init__(self, objs):
+        self.objs = objs
+        self.dataObjsIdx = None     # Index of every object in bpy.data.objects
+        self.dataNames = None       # Names of bpy.data.objects the indices are valid for
+
+    def read(self):
+        ### World matrices in Blender memory layout (mats[n][column][row])
+        objsData = bpy.data.objects
+        dataNames = objsData.keys()
+        if dataNames != self.dataNames:
+            # Object indices in bpy.data.objects change when objects are added, removed or renamed (list is sorted by name)
+            dataIdx = {}
+            for i, obj in enumerate(objsData): dataIdx[obj] = i
+            try: self.dataObjsIdx = np.array([dataIdx[obj] for obj in self.objs], dtype=np.int64)
+            except: self.dataObjsIdx = None
+            self.dataNames = dataNames
+        if self.dataObjsIdx is not None:
+            try:
+                mats = np.empty(len(objsData) *16, dtype=np.float32)
+                objsData.foreach_get("matrix_world", mats)
+                return mats.reshape((-1, 4, 4))[self.dataObjsIdx].astype(np.float64)
+            except: self.dataObjsIdx = None
+        # Fallback: Read matrices one by one
+        mats = np.array([obj.matrix_world for obj in self.objs], dtype=np.float64).reshape((-1, 4, 4))
+        return mats.transpose((0, 2, 1))
+
+################################################################################
+
+class monitorState():
+
+    ### Structure-of-arrays state of all connections watched by the monitor (replacing one 19-slot list per connection)
+    # Elements are stored once in an object table and referenced by index, the constraints of all connections
+    # are stored in flat arrays with connection ranges given by constsStart[i]:constsStart[i+1]
+
+    def __init__(self):
+        self.objs = []              # Object table
+        self.objsIdx = {}           # Object: index in object table
+        ### Per connection (lists during init, arrays after finalize())
+        self.objA = []              # Index of first element in object table
+        self.objB = []              # Index of second element in object table
+        self.pairA = []             # Index of first element in build data
+        self.pairB = []             # Index of second element in build data
+        self.elemGrp = []           # Index of the element group defining the connection settings
+        self.contactArea = []
+        self.tol1Dist = []; self.tol1Rot = []     # Tolerances for fixed mode (-1 = disabled)
+        self.tol2Dist = []; self.tol2Rot = []     # Tolerances for plastic mode (-1 = disabled)
+        self.mode = []              # 0 = fixed, 1 = plastic, >=2 = broken
+        self.qMohrCoulomb = []
+        self.mul = []
+        self.qProgrWeak = []
+        self.constsStart = [0]
+        ### Per constraint (flat)
+        self.consts = []            # Constraint empties (None for missing ones)
+        self.constsEnabled = []     # Original settings (restored after simulation)
+        self.constsUseBrk = []
+        self.constsBrkThres = []
+        self.constsSpring = []      # Constraint is of type GENERIC_SPRING
+        ### Transform data
+        self.distOrig = None
+        self.anglOrig = None
+        self.matrixReader = None
+
+    def __len__(self):
+        return len(self.objA)
+
+    ########################################
+
+    def addObject(self, obj):
+        try: return self.objsIdx[obj]
+        except:
+            idx = self.objsIdx[obj] = len(self.objs)
+            self.objs.append(obj)
+            return idx
+
+    def addConnection(self, objA, objB, pairA, pairB, consts, constsEnabled, constsUseBrk, constsBrkThres, constsSpring, contactArea, tol, mode, qMohrCoulomb, mul, qProgrWeak, elemGrp):
+        self.objA.append(self.addObject(objA))
+        self.objB.append(self.addObject(objB))
+        self.pairA.append(pairA); self.pairB.append(pairB)
+        self.contactArea.append(contactArea)
+        self.tol1Dist.append(tol[0]); self.tol1Rot.append(tol[1])
+        self.tol2Dist.append(tol[2]); self.tol2Rot.append(tol[3])
+        self.mode.append(mode)
+        self.qMohrCoulomb.append(qMohrCoulomb)
+        self.mul.append(mul)
+        self.qProgrWeak.append(qProgrWeak)
+        self.elemGrp.append(elemGrp)
+        self.consts.extend(consts)
+        self.constsEnabled.extend(constsEnabled)
+        self.constsUseBrk.extend(constsUseBrk)
+        self.constsBrkThres.extend(constsBrkThres)
+        self.constsSpring.extend(constsSpring)
+        self.constsStart.append(len(self.consts))
+
+    def finalize(self):
+        ### Convert collected lists into arrays and store the original transforms
+        self.objA = np.array(self.objA, dtype=np.int64)
+        self.objB = np.array(self.objB, dtype=np.int64)
+        self.pairA = np.array(self.pairA, dtype=np.int64)
+        self.pairB = np.array(self.pairB, dtype=np.int64)
+        self.contactArea = np.array(self.contactArea, dtype=np.float64)
+        self.tol1Dist = np.array(self.tol1Dist, dtype=np.float64); self.tol1Rot = np.array(self.tol1Rot, dtype=np.float64)
+        self.tol2Dist = np.array(self.tol2Dist, dtype=np.float64); self.tol2Rot = np.array(self.tol2Rot, dtype=np.float64)
+        self.mode = np.array(self.mode, dtype=np.int64)
+        self.qMohrCoulomb = np.array(self.qMohrCoulomb, dtype=np.bool_)
+        self.mul = np.array(self.mul, dtype=np.float64)
+        self.qProgrWeak = np.array(self.qProgrWeak, dtype=np.bool_)
+        self.elemGrp = np.array(self.elemGrp, dtype=np.int64)
+        self.constsStart = np.array(self.constsStart, dtype=np.int64)
+        self.constsEnabled = np.array(self.constsEnabled, dtype=np.bool_)
+        self.constsUseBrk = np.array(self.constsUseBrk, dtype=np.bool_)
+        self.constsBrkThres = np.array(self.constsBrkThres, dtype=np.float64)
+        self.constsSpring = np.array(self.constsSpring, dtype=np.bool_)
+        ### Connections are breakable if their first constraint is
+        constsFirst = self.constsStart[:-1]
+        self.qBreakable = np.zeros(len(self), dtype=np.bool_)
+        hasConsts = constsFirst < self.constsStart[1:]
+        self.qBreakable[hasConsts] = self.constsUseBrk[constsFirst[hasConsts]]
+        for i in np.nonzero(hasConsts)[0]:
+            if self.consts[constsFirst[i]] == None: self.qBreakable[i] = 0
+        ### Original distances and angles between both elements
+        locs, quats = self.getTransforms()
+        self.distOrig = np.linalg.norm(locs[self.objA] -locs[self.objB], axis=1)
+        self.anglOrig = monitorQuatsRotationDifferenceAngle(quats[self.objA], quats[self.objB])
+
+    ########################################
+
+    def getConsts(self, i):
+        return self.consts[self.constsStart[i]:self.constsStart[i +1]]
+
+    def getConstsIdx(self, idxs):
+        ### Flat constraint indices of all given connections
+        if len(idxs) == 0: return np.zeros(0, dtype=np.int64)
+        starts = self.constsStart[idxs]; cnts = self.constsStart[np.asarray(idxs) +1] -starts
+        return np.repeat(starts -np.cumsum(cnts) +cnts, cnts) +np.arange(cnts.sum())
+
+    ########################################
+
+    def getMatrices(self):
+        ### World matrices of all table objects in Blender memory layout (mats[n][column][row])
+        if self.matrixReader == None: self.matrixReader = monitorMatrixReader(self.objs)
+        return self.matrixReader.read()
+
+    def getTransforms(self):
+        ### Locations and rotations as quaternions of all table objects
+        mats = self.getMatrices()
+        return mats[:, 3, :3], monitorQuatsFromMatrices(mats[:, :3, :3])
+
+################################################################################
+
+class monitorDampingRegions():
+
+    ### Damping region state of the monitor
+    # Region objects and damped elements are looked up once on simulation start, per frame all elements are tested
+    # against all region boxes at once and only changed damping values are written back to the rigid bodies
+
+    def __init__(self, regObjs, rbs, objs=None):
+        self.regObjs = regObjs      # Damping region objects
+        self.rbs = rbs              # Rigid body settings of all damped elements
+        # Elements are read in bulk via their world matrices, Fracture Modifier shards (objs = None) via their rigid bodies
+        if objs != None: self.matrixReader = monitorMatrixReader(objs)
+        else: self.matrixReader = None
+        self.dampLinOrig = np.array([rb.linear_damping for rb in rbs], dtype=np.float64)
+        self.dampAngOrig = np.array([rb.angular_damping for rb in rbs], dtype=np.float64)
+        self.dampLinLast = self.dampLinOrig.copy()    # Last written values
+        self.dampAngLast = self.dampAngOrig.copy()
+        self.qFlagged = np.zeros(len(rbs), dtype=np.bool_)
+
+    def __len__(self):
+        return len(self.rbs)
+
+    ########################################
+
+    def getLocations(self):
+        if self.matrixReader != None:
+            return self.matrixReader.read()[:, 3, :3]
+        return np.array([tuple(rb.location) for rb in self.rbs], dtype=np.float64).reshape((-1, 3))
+
+    def update(self, dampLinDef, dampAngDef):
+        if len(self.rbs) == 0 or len(self.regObjs) == 0: return
+        ### Axis-aligned region bounds (location ± scale) and damping values (regions can be animated)
+        regLocs = np.array([tuple(region.location) for region in self.regObjs], dtype=np.float64)
+        regScls = np.array([tuple(region.scale) for region in self.regObjs], dtype=np.float64)
+        regLin = np.empty(len(self.regObjs), dtype=np.float64)
+        regAng = np.empty(len(self.regObjs), dtype=np.float64)
+        for j, region in enumerate(self.regObjs):
+            # Object properties override the global settings
+            try: regLin[j] = region["dampRegLinear"]
+            except: regLin[j] = dampLinDef
+            try: regAng[j] = region["dampRegAngular"]
+            except: regAng[j] = dampAngDef
+        ### Containment of all elements in all regions
+        locs = self.getLocations()
+        qInside = np.all((locs[:, None, :] >= (regLocs -regScls)[None, :, :]) & (locs[:, None, :] <= (regLocs +regScls)[None, :, :]), axis=2)
+        qInAny = qInside.any(axis=1)
+        ### Non-linear combination of all regions containing an element: 1 -(1 -orig) *(1 -r1) *(1 -r2) ...
+        dampLin = 1 -(1 -self.dampLinOrig) *np.where(qInside, 1 -regLin[None, :], 1).prod(axis=1)
+        dampAng = 1 -(1 -self.dampAngOrig) *np.where(qInside, 1 -regAng[None, :], 1).prod(axis=1)
+        ### Elements which left all regions get their original values back, all others outside stay untouched
+        qRestore = self.qFlagged & ~qInAny
+        dampLin[qRestore] = self.dampLinOrig[qRestore]
+        dampAng[qRestore] = self.dampAngOrig[qRestore]
+        self.write(qInAny | qRestore, dampLin, dampAng)
+        self.qFlagged = qInAny
+
+    def write(self, qSet, dampLin, dampAng):
+        ### Write only values which differ from the last written ones
+        rbs = self.rbs
+        qLin = qSet & (dampLin != self.dampLinLast)
+        for i in np.nonzero(qLin)[0].tolist(): rbs[i].linear_damping = dampLin[i]
+        self.dampLinLast[qLin] = dampLin[qLin]
+        qAng = qSet & (dampAng != self.dampAngLast)
+        for i in np.nonzero(qAng)[0].tolist(): rbs[i].angular_damping = dampAng[i]
+        self.dampAngLast[qAng] = dampAng[qAng]
+
+    def restore(self):
+        ### Revert all rigid bodies to their original dampings
+        self.write(np.ones(len(self.rbs), dtype=np.bool_), self.dampLinOrig, self.dampAngOrig)
+        self.qFlagged[:] = 0
@@ -0,0 +1,152 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import bpy
+from bpy.app.handlers import persistent
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+def objResolverInvalidate(*args):
+
+    ### Remove cached name to object maps (to be called whenever object pointers may have become invalid)
+    try: del bpy.app.driver_namespace["bcb_objResolver"]
+    except: pass
+
+########################################
+
+def objResolverKey(scene):
+
+    ### Validity key of cached maps, changes if objects are added to or removed from the database or linked to or unlinked from the scene
+    # (Deleting and adding the same number of objects in between can't be detected, functions removing objects invalidate the maps instead)
+    return (scene.as_pointer(), len(bpy.data.objects), len(scene.objects))
+
+########################################
+
+@persistent
+def objResolverUpdateHandler(scene):
+
+    ### Invalidate cached maps on scene updates if objects have been added or removed (scene_update_post handler)
+    try: resolver = bpy.app.driver_namespace["bcb_objResolver"]
+    except: return
+    if resolver["key"] != objResolverKey(scene): objResolverInvalidate()
+
+########################################
+
+@persistent
+def objResolverReloadHandler(*args):
+
+    ### File loading and undo replace the whole database so all cached object pointers are invalid
+    objResolverInvalidate()
+
+########################################
+
+def objResolverRegister():
+
+    ### Register event handlers for invalidation (called on add-on registration)
+    handlers = bpy.app.handlers
+    if objResolverUpdateHandler not in handlers.scene_update_post: handlers.scene_update_post.append(objResolverUpdateHandler)
+    for handlerList in [handlers.load_pre, handlers.undo_post, handlers.redo_post]:
+        if objResolverReloadHandler not in handlerList: handlerList.append(objResolverReloadHandler)
+
+########################################
+
+def objResolverUnregister():
+
+    ### Remove event handlers and cached data (called on add-on unregistration)
+    handlers = bpy.app.handlers
+    for handlerList in [handlers.scene_update_post, handlers.load_pre, handlers.undo_post, handlers.redo_post]:
+        for handler in [objResolverUpdateHandler, objResolverReloadHandler]:
+            if handler in handlerList: handlerList.remove(handler)
+    objResolverInvalidate()
+
+################################################################################
+
+def objResolverGetMap(scene, objType=None):
+
+    ### Return cached name to object dictionary of a scene for given object type (None = all types)
+    # The maps for all types are created with a single walk over the scene objects
+    try: resolver = bpy.app.driver_namespace["bcb_objResolver"]
+    except: resolver = None
+    key = objResolverKey(scene)
+    if resolver == None or resolver["key"] != key:
+        mapsByType = {None: {}}
+        mapAll = mapsByType[None]
+        for obj in scene.objects:
+            name = obj.name
+            mapAll[name] = obj
+            try: mapsByType[obj.type][name] = obj
+            except: mapsByType[obj.type] = {name: obj}
+        resolver = {"key": key, "maps": mapsByType, "missing": {}}
+        bpy.app.driver_namespace["bcb_objResolver"] = resolver
+    try: return resolver["maps"][objType]
+    except: return {}
+
+########################################
+
+def resolveObjectNames(scene, names, objType=None):
+
+    ### Resolve a list of object names to objects in bulk, empty names and missing objects result in None
+    # Returns the object list and a list of the names which couldn't be found
+    # Renamed objects can make the cached map outdated, in that case it is rebuilt once.
+    # Names still missing after a rebuild are remembered so that later calls don't rebuild the map again for them
+    for qRetry in range(2):
+        resolverLast = bpy.app.driver_namespace.get("bcb_objResolver")
+        scnObjs = objResolverGetMap(scene, objType)
+        resolver = bpy.app.driver_namespace["bcb_objResolver"]
+        scnObjsGet = scnObjs.get
+        objs = []; missingIdxs = []
+        for i, name in enumerate(names):
+            if len(name):
+                obj = scnObjsGet(name)
+                if obj != None:
+                    try: qValid = obj.name == name  # Object could have been renamed or removed
+                    except: qValid = 0
+                    if not qValid: obj = None
+                if obj == None: missingIdxs.append(i)
+                objs.append(obj)
+            else: objs.append(None)
+        if not len(missingIdxs): break
+        try: namesMissing = resolver["missing"][objType]
+        except: namesMissing = resolver["missing"][objType] = set()
+        if qRetry or resolver is not resolverLast:
+            # Map is up to date, so the names are really missing
+            for i in missingIdxs: namesMissing.add(names[i])
+            break
+        for i in missingIdxs:
+            if names[i] not in namesMissing:
+                objResolverInvalidate(); break
+        else: break
+    return objs, [names[i] for i in missingIdxs]
@@ -0,0 +1,158 @@
+##############################
+# Bullet Constraints Builder #
+##############################
+#
+# Written within the scope of Inachus FP7 Project (607522):
+# "Technological and Methodological Solutions for Integrated
+# Wide Area Situation Awareness and Survivor Localisation to
+# Support Search and Rescue (USaR) Teams"
+# Versions 1 & 2 were developed at the Laurea University of Applied Sciences,
+# Finland. Later versions are independently developed.
+# Copyright (C) 2015-2021 Kai Kostack
+#
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+################################################################################
+
+import bpy, sys, os, time, json, tracemalloc, cProfile
+import global_vars
+
+### Import submodules
+from global_vars import *      # Contains global variables
+
+################################################################################
+
+### State of the currently running profiling session (None if disabled)
+profilerSession = None
+
+########################################
+
+def profilerOpCallPatch(session):
+
+    ### Count bpy operator calls by wrapping the operator call function of the bpy.ops module
+    try:
+        opsModule = sys.modules["bpy.ops"]
+        opCall = opsModule.op_call
+    except:
+        print("Warning: Operator calls can't be counted in this Blender version.")
+        return
+    def opCallCounted(*args, **kwargs):
+        session["opCalls"] += 1
+        return opCall(*args, **kwargs)
+    opsModule.op_call = opCallCounted
+    session["opCallOrig"] = opCall
+
+########################################
+
+def profilerOpCallRestore(session):
+
+    if session["opCallOrig"] != None:
+        sys.modules["bpy.ops"].op_call = session["opCallOrig"]
+        session["opCallOrig"] = None
+
+################################################################################
+
+def profilerStart(name):
+
+    ### Start profiling session with stages measured from this point on (only if enabled for developers)
+    global profilerSession
+    if not profileBuild: return
+    if profilerSession != None: profilerStop()
+    
+    session = profilerSession = {}
+    session["name"] = name
+    session["stages"] = []
+    session["opCalls"] = 0
+    session["opCallOrig"] = None
+    profilerOpCallPatch(session)
+    if profileBuildCProfile:
+        session["cProfile"] = cProfile.Profile()
+        session["cProfile"].enable()
+    else: session["cProfile"] = None
+    session["timeStart"] = time.time()
+    profilerMark()
+
+########################################
+
+def profilerMark():
+
+    ### Reset stage counters (tracemalloc has no peak reset before Python 3.9, so tracing is restarted instead)
+    session = profilerSession
+    if tracemalloc.is_tracing(): tracemalloc.stop()
+    tracemalloc.start()
+    session["opCallsMark"] = session["opCalls"]
+    session["timeMark"] = time.time()
+
+########################################
+
+def profilerLap(stage, itemCnt=None):
+
+    ### Record measurements for the stage finished since the last lap
+    session = profilerSession
+    if session == None: return
+
+    time_stage = time.time() -session["timeMark"]
+    memPeak = tracemalloc.get_traced_memory()[1]
+    session["stages"].append({
+        "stage": stage,
+        "time": round(time_stage, 4),
+        "memPeak": memPeak,
+        "opCalls": session["opCalls"] -session["opCallsMark"],
+        "items": itemCnt
+        })
+    if debug: print("Profiler: %s %0.2f s, %d KB, %d ops" %(stage, time_stage, memPeak /1024, session["opCalls"] -session["opCallsMark"]))
+    profilerMark()
+
+########################################
+
+def profilerStop():
+
+    ### Finish profiling session and write report next to the render output path
+    global profilerSession
+    session = profilerSession
+    if session == None: return
+    profilerSession = None
+
+    tracemalloc.stop()
+    profilerOpCallRestore(session)
+    if session["cProfile"] != None: session["cProfile"].disable()
+
+    scene = bpy.context.scene
+    report = {
+        "name": session["name"],
+        "blendFile": bpy.data.filepath,
+        "blenderVersion": bpy.app.version_string,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "time": round(time.time() -session["timeStart"], 4),
+        "opCalls": session["opCalls"],
+        "stages": session["stages"]
+        }
+    outPath = os.path.split(scene.render.filepath)[0]
+    outPath = bpy.path.abspath(outPath)
+    filePath = os.path.join(outPath, "bcb-profile-%s.json" %session["name"])
+    print("Writing profiling report to:", filePath)
+    try:
+        f = open(filePath, "w")
+        json.dump(report, f, indent=2)
+        f.close()
+    except: print('Error: Could not write file:', filePath)
+    if session["cProfile"] != None:
+        filePath = os.path.join(outPath, "bcb-profile-%s.prof" %session["name"])
+        try: session["cProfile"].dump_stats(filePath)
+        except: print('Error: Could not write file:', filePath)
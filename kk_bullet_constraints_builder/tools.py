@@ -826,6 +826,8 @@ def tool_discretize(scene):
         # Delete cutter object from database
         bpy.data.meshes.remove(objC.data, do_unlink=1)
         bpy.data.objects.remove(objC, do_unlink=1)
+        # Object count could be the same as before, so cached name maps need to be invalidated
+        objResolverInvalidate()
 
         # Revert to start selection
         for obj in selection: obj.select = 1
@@ -1987,12 +1989,9 @@ def tool_forcesVisualization_eventHandler(scene):
         ### Official Blender
         if not qFM:
             
-            ### Prepare scene object dictionaries by type to be used for faster item search (optimization)
-            scnObjs = {}
-            scnEmptyObjs = {}
-            for obj in scene.objects:
-                if obj.type == 'MESH':    scnObjs[obj.name] = obj
-                elif obj.type == 'EMPTY': scnEmptyObjs[obj.name] = obj
+            ### Get cached scene object dictionaries by type to be used for faster item search (optimization)
+            scnObjs = objResolverGetMap(scene, 'MESH')
+            scnEmptyObjs = objResolverGetMap(scene, 'EMPTY')
 
         ### Fracture Modifier
         else:
@@ -2030,11 +2029,12 @@ def tool_forcesVisualization_eventHandler(scene):
                 except: emptyObjs.append(None); print("Error: Object %s missing, rebuilding constraints is required." %name)
             else: emptyObjs.append(None)
             
-        try: connectsPair = scene["bcb_connectsPair"]
+        fields = getBinaryBuildDataFromScene(scene)
+        try: connectsPair = fields["connectsPair"]
         except: connectsPair = []; print("Error: bcb_connectsPair property not found, rebuilding constraints is required.")
-        try: connectsGeo = scene["bcb_connectsGeo"]
+        try: connectsGeo = fields["connectsGeo"]
         except: connectsGeo = []; print("Error: bcb_connectsGeo property not found, rebuilding constraints is required.")
-        try: connectsConsts = scene["bcb_connectsConsts"]
+        try: connectsConsts = fields["connectsConsts"]
         except: connectsConsts = []; print("Error: bcb_connectsConsts property not found, rebuilding constraints is required.")
 
         # If range object is defined by user then use this to search for nearby connections for visualization